@@ -17,20 +17,25 @@ DEFAULT_APPS = dict(
 
 DEFAULT_VA = "GoogleAssistant"
 
+# Budget for the flattened response view in test logs (see util/response_render.py); 0 = no limit
+DEFAULT_RESPONSE_LOG = dict(max_lines=200, max_line_chars=500)
+
 apps = dict(DEFAULT_APPS)
 va = DEFAULT_VA
+response_log = dict(DEFAULT_RESPONSE_LOG)
+verdict = None  # verdict provider chain for manual checks (see util/verdict_providers.py); None = interactive
 
 _RUNTIME_LOADED = False
 
 
 def init_runtime_config(path=None):
     """
-    Loads runtime overrides (apps/va) from the runtime config store.
+    Loads runtime overrides (apps/va/verdict/response_log) from the runtime config store.
 
     Call this once from main.py after argument parsing.
     If runtime config is missing or partial, defaults above remain in effect.
     """
-    global apps, va, _RUNTIME_LOADED
+    global apps, va, verdict, _RUNTIME_LOADED
     if _RUNTIME_LOADED:
         return
 
@@ -42,5 +47,10 @@ def init_runtime_config(path=None):
             apps.update(cfg["apps"])
         if cfg.get("va"):
             va = cfg["va"]
+        if cfg.get("verdict"):
+            verdict = str(cfg["verdict"])
+        if isinstance(cfg.get("response_log"), dict):
+            response_log.update({k: int(v) for k, v in cfg["response_log"].items()
+                                 if k in DEFAULT_RESPONSE_LOG and isinstance(v, int) and v >= 0})
 
     _RUNTIME_LOADED = True
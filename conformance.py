@@ -8,6 +8,7 @@ import dab.device_telemetry
 import dab.voice
 import dab.applications
 import dab.system
+import dab.content
 import dab.output
 import dab.version
 import json
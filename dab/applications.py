@@ -2,15 +2,16 @@ from time import sleep
 from schema import dab_response_validator
 from dab_tester import YesNoQuestion, Default_Validations
 from util.enforcement_manager import EnforcementManager
-import jsons
+from util.dab_response import response_json
+from logger import LOGGER
 
 def launch(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(5)
@@ -21,9 +22,9 @@ def launch_with_content(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(5)
@@ -33,9 +34,9 @@ def exit(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_exit_application_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(5)
@@ -45,9 +46,9 @@ def list(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_list_applications_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     for application in response['applications']:
@@ -59,9 +60,9 @@ def get_state(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_get_application_state_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -71,9 +72,9 @@ def install(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_install_application_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -83,9 +84,9 @@ def uninstall(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_uninstall_application_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -95,9 +96,9 @@ def clear_data(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_clear_data_application_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -107,9 +108,9 @@ def install_from_appstore(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_install_from_appstore_application_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
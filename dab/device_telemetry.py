@@ -1,15 +1,16 @@
 from schema import dab_response_validator
 from time import sleep
 from dab_tester import YesNoQuestion, Default_Validations
-import jsons
+from util.dab_response import response_json
+from logger import LOGGER
 
 def start(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_start_device_telemetry_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(1)
@@ -19,9 +20,9 @@ def stop(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_stop_device_telemetry_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(1)
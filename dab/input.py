@@ -3,6 +3,8 @@ from time import sleep
 from dab_tester import YesNoQuestion, Default_Validations
 from util.enforcement_manager import EnforcementManager
 import json
+from util.dab_response import response_json
+from logger import LOGGER
 
 class KeyList:
     key_list = []
@@ -11,10 +13,10 @@ def key_press(test_result, durationInMs=0, expectedLatencyMs=None):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
     request = json.loads(test_result.request)
-    response  = json.loads(test_result.response)
+    response  = response_json(test_result.response)
     # No list available, assuming everything is required.
     if len(KeyList.key_list) <=0:
         if response['status'] != 200:
@@ -38,10 +40,10 @@ def long_key_press(test_result, durationInMs=0, expectedLatencyMs=None):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
     request = json.loads(test_result.request)
-    response  = json.loads(test_result.response)
+    response  = response_json(test_result.response)
     # No list available, assuming everything is required.
     if len(KeyList.key_list) <=0:
         if response['status'] != 200:
@@ -65,9 +67,9 @@ def list(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_key_list_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = json.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     if len(response['keyCodes']) <=0:
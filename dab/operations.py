@@ -1,16 +1,17 @@
 from schema import dab_response_validator
 from time import sleep
 from dab_tester import YesNoQuestion, Default_Validations
-import jsons
 from util.enforcement_manager import EnforcementManager
+from util.dab_response import response_json
+from logger import LOGGER
 
 def list(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_list_supported_operation_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     for operation in response['operations']:
@@ -4,7 +4,8 @@ from time import sleep
 from dab_tester import YesNoQuestion, Default_Validations
 from util.output_image_handler import save_output_image
 from logger import LOGGER  # ← add this import
-import jsons, os
+import os
+from util.dab_response import response_json
 
 def image(test_result, durationInMs=0, expectedLatencyMs=0):
     # 1) Schema validation
@@ -16,7 +17,7 @@ def image(test_result, durationInMs=0, expectedLatencyMs=0):
 
     # 2) Parse response
     try:
-        response = jsons.loads(test_result.response) if isinstance(test_result.response, str) else test_result.response
+        response = response_json(test_result.response)
     except Exception as e:
         LOGGER.warn(f"Schema error: Could not parse JSON: {e}")
         return False
@@ -47,7 +48,12 @@ def image(test_result, durationInMs=0, expectedLatencyMs=0):
 
     # 5) Prompt and run default timing validation
     prompt = f"Verify '{png_path}' exists and shows the screenshot"
-    ok = YesNoQuestion(test_result, prompt) and Default_Validations(test_result, durationInMs, expectedLatencyMs)
+    try:
+        with open(png_path, "rb") as f:
+            png = f.read()
+    except OSError:
+        png = None
+    ok = YesNoQuestion(test_result, prompt, image=png) and Default_Validations(test_result, durationInMs, expectedLatencyMs)
 
     # 6) Always attempt to delete the saved file (even if validations failed) — console-only logs
     try:
@@ -1,19 +1,19 @@
 from time import sleep
 from dab_tester import YesNoQuestion, Default_Validations
-import jsons
 from schema import dab_response_validator
 from util.enforcement_manager import EnforcementManager
 from logger import LOGGER
 from schema import list_system_settings_schema_20, list_system_settings_schema_21
 import dab_tester
+from util.dab_response import response_json
 
 def restart(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     LOGGER.info("system/restart issued. Device will reboot; subsequent preflight health-check will wait for readiness.")
@@ -23,9 +23,9 @@ def settings_get(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_get_system_settings_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response  = jsons.loads(test_result.response)
+    response  = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -35,9 +35,9 @@ def settings_set(test_result, durationInMs=0,expectedLatencyMs=0):
     try:
         dab_response_validator.validate_set_system_settings_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -45,7 +45,7 @@ def settings_set(test_result, durationInMs=0,expectedLatencyMs=0):
 
 def settings_list(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
-        response = jsons.loads(test_result.response)
+        response = response_json(test_result.response)
     except Exception as error:
         LOGGER.warn(f"system/settings/list: JSON parse error: {error}")
         try:
@@ -94,9 +94,9 @@ def start_log_collection(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_start_log_collection_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -106,9 +106,9 @@ def stop_log_collection(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_stop_log_collection_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -118,9 +118,9 @@ def setup_skip(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_dab_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -130,9 +130,9 @@ def power_mode_get(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_power_mode_get_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -142,9 +142,9 @@ def power_mode_set(test_result, durationInMs=0, expectedLatencyMs=0):
     try:
         dab_response_validator.validate_power_mode_set_response_schema(test_result.response)
     except Exception as error:
-        print("Schema error:", error)
+        LOGGER.error(f"Schema error: {error}")
         return False
-    response = jsons.loads(test_result.response)
+    response = response_json(test_result.response)
     if response['status'] != 200:
         return False
     sleep(0.1)
@@ -2,10 +2,12 @@ from dab_client import DabClient
 from schema import dab_response_validator
 from util.enforcement_manager import EnforcementManager
 from util.enforcement_manager import ValidateCode
+from util.request_pipeline import CallableInterceptor
+from util.dab_response import response_json
+from util.settings_index import KIND_BOOL, KIND_RANGE, KIND_OPTIONS, KIND_DICT_OPTIONS, KIND_OBJECT
 from time import sleep
 import json
 import re
-import types
 from logger import LOGGER  # <— use the shared singleton logger
 
 class DabChecker:
@@ -16,24 +18,21 @@ class DabChecker:
         # Keep track of the last payload actually sent for system/settings/set
         self._last_effective_settings_payload = None
 
-        # --- Patch dab_tester.execute_cmd to intercept real sends ---
-        original_execute_cmd = dab_tester.execute_cmd  # bound method
+        # --- Rewrite system/settings/set payloads on the way out ---
+        dab_tester.request_pipeline.register(CallableInterceptor(
+            "settings-payload", self.__intercept_settings_set,
+            topics=("system/settings/set",), priority=50,
+        ))
 
-        def _patched_execute_cmd(_self, device_id, dab_topic, dab_body):
-            # Intercept only system/settings/set
-            try:
-                if dab_topic == "system/settings/set":
-                    adjusted = self.__maybe_adjust_settings_set_payload(dab_body)
-                    # Persist what we are *actually* sending so checker can validate against it
-                    self._last_effective_settings_payload = adjusted if isinstance(adjusted, str) else json.dumps(adjusted)
-                    return original_execute_cmd(device_id, dab_topic, adjusted)
-            except Exception as e:
-                self.logger.warn(f"[SET precheck] execute_cmd patch error: {e}")
-            # For all other topics, just forward
-            return original_execute_cmd(device_id, dab_topic, dab_body)
-
-        # Bind the patched function as a method on this dab_tester instance
-        dab_tester.execute_cmd = types.MethodType(_patched_execute_cmd, dab_tester)
+    def __intercept_settings_set(self, ctx, call_next):
+        try:
+            adjusted = self.__maybe_adjust_settings_set_payload(ctx.body, ctx.device_id)
+            # Persist what we are *actually* sending so checker can validate against it
+            self._last_effective_settings_payload = adjusted if isinstance(adjusted, str) else json.dumps(adjusted)
+            ctx.body = adjusted
+        except Exception as e:
+            self.logger.warn(f"[SET precheck] settings payload interceptor error: {e}")
+        return call_next(ctx)
 
     # -------------------------------------------------------------------------
     # Minimal helpers to align positive system/settings/set payloads to supported
@@ -41,25 +40,6 @@ class DabChecker:
     # Also includes a tiny tolerant JSON fixer for one-key objects with bare strings.
     # -------------------------------------------------------------------------
 
-    def __prefer_language(self, options):
-        try:
-            if "en-US" in options:
-                return "en-US"
-            for o in options:
-                if isinstance(o, str) and (o.startswith("en-") or o == "en"):
-                    return o
-            return options[0] if options else None
-        except Exception:
-            return None
-
-    def __match_subset(self, req_d, opt_d):
-        if not isinstance(req_d, dict) or not isinstance(opt_d, dict):
-            return False
-        for k, v in req_d.items():
-            if opt_d.get(k) != v:
-                return False
-        return True
-
     def __builtin_default_for(self, key: str):
         kl = (key or "").lower()
         if kl == "language":
@@ -78,77 +58,61 @@ class DabChecker:
             return {"width": 1920, "height": 1080, "frequency": 60}
         return None
 
-    def __to_settings_map(self, supported):
-        try:
-            if isinstance(supported, str):
-                supported = json.loads(supported)
-        except Exception:
-            return {}
-        if not isinstance(supported, dict):
-            return {}
-        settings_map = supported.get("settings", supported)
-        if not isinstance(settings_map, dict):
-            return {}
-        # strip common meta
-        for meta in ("status", "statusText", "ts", "error"):
-            settings_map.pop(meta, None)
-        return settings_map
-
-    def __select_supported_value(self, supported_settings, key, preferred=None):
+    def __settings_index(self, device_id):
+        # Compiled once per settings/list response by EnforcementManager
+        return EnforcementManager(device_id).get_settings_index()
+
+    def __select_supported_value(self, index, key, preferred=None):
         """
         Returns (value, note). If unsupported/unknown → (None, reason).
         """
-        settings_map = self.__to_settings_map(supported_settings)
-        if not settings_map:
+        if not index:
             return None, "No settings map (empty or malformed settings/list cache)."
 
-        if key not in settings_map:
-            sample = list(settings_map.keys())[:3]
-            return None, f"'{key}' not advertised in settings/list. Known keys (sample): {sample}"
-
-        desc = settings_map[key]
+        d = index.get(key)
+        if d is None:
+            return None, f"'{key}' not advertised in settings/list. Known keys (sample): {index.sample_keys()}"
 
         # Boolean capability flag
-        if isinstance(desc, bool):
-            if desc is False:
+        if d.kind == KIND_BOOL:
+            if not d.supported:
                 return None, f"'{key}' unsupported (capability=false in settings/list)."
             if isinstance(preferred, bool):
                 return preferred, f"'{key}' supported; using preferred={preferred}."
             return True, f"'{key}' supported; defaulting to True."
 
         # Numeric range {"min": x, "max": y}
-        if isinstance(desc, dict) and {"min", "max"}.issubset(desc.keys()):
-            mn, mx = desc["min"], desc["max"]
-            if isinstance(preferred, (int, float)) and mn <= preferred <= mx:
+        if d.kind == KIND_RANGE:
+            mn, mx = d.minimum, d.maximum
+            if d.in_range(preferred):
                 return preferred, f"'{key}' in range [{mn}, {mx}]; using preferred."
-            mid = (mn + mx) // 2 if isinstance(mn, int) and isinstance(mx, int) else (float(mn) + float(mx)) / 2.0
+            mid = d.midpoint()
             return mid, f"'{key}' in range [{mn}, {mx}]; using midpoint={mid}."
 
         # List of options
-        if isinstance(desc, list):
-            if not desc:
+        if d.kind in (KIND_OPTIONS, KIND_DICT_OPTIONS):
+            if not d.options:
                 return None, f"'{key}' unsupported (no options advertised)."
-            if isinstance(desc[0], dict):
-                if isinstance(preferred, dict):
-                    for opt in desc:
-                        if self.__match_subset(preferred, opt):
-                            return opt, f"'{key}' matched preferred subset {preferred}."
-                return desc[0], f"'{key}' options available; using first={desc[0]}."
+            first = d.options[0]
+            if d.kind == KIND_DICT_OPTIONS:
+                opt = d.match_option(preferred)
+                if opt is not None:
+                    return opt, f"'{key}' matched preferred subset {preferred}."
+                return first, f"'{key}' options available; using first={first}."
             # list of primitives
-            if preferred is None and key.lower() == "language":
-                ch = self.__prefer_language([o for o in desc if isinstance(o, str)])
-                if ch is not None:
-                    return ch, f"'{key}' options; language heuristic selected {ch}."
-            if preferred in desc:
+            if preferred is None and d.preferred_language is not None:
+                ch = d.preferred_language
+                return ch, f"'{key}' options; language heuristic selected {ch}."
+            if d.has_option(preferred):
                 return preferred, f"'{key}' options include preferred={preferred}."
-            return desc[0], f"'{key}' options; preferred not found → using first={desc[0]}."
+            return first, f"'{key}' options; preferred not found → using first={first}."
 
         # Other object-like
-        if isinstance(desc, dict):
-            prev = list(desc.keys())[:6]
+        if d.kind == KIND_OBJECT:
+            prev = list(d.raw.keys())[:6]
             return None, f"'{key}' descriptor is object-like ({prev}); cannot auto-pick."
 
-        return None, f"'{key}' descriptor type {type(desc).__name__} not recognized."
+        return None, f"'{key}' descriptor type {type(d.raw).__name__} not recognized."
 
     def __coerce_single_kv_json(self, raw):
         """
@@ -195,14 +159,13 @@ class DabChecker:
         except Exception:
             return None
 
-    def __settings_set_payload(self, key, preferred=None, default=None):
+    def __settings_set_payload(self, key, preferred=None, default=None, device_id=None):
         """
         Build a JSON string payload for system/settings/set (e.g., '{"language":"en-US"}').
         If supported value cannot be derived, log and fall back to preferred → default → builtin default.
         """
         try:
-            sup = EnforcementManager().get_supported_settings()
-            val, note = self.__select_supported_value(sup, key, preferred)
+            val, note = self.__select_supported_value(self.__settings_index(device_id), key, preferred)
             if val is not None:
                 payload = json.dumps({key: val})
                 self.logger.result(f"[settings_set_payload] {note} → {payload}")
@@ -241,7 +204,7 @@ class DabChecker:
             return True
         return False
     
-    def __maybe_adjust_settings_set_payload(self, dab_body):
+    def __maybe_adjust_settings_set_payload(self, dab_body, device_id=None):
         """
         Positive tests only (best-effort): compare requested {key: value} to settings/list
         and adjust to a supported value. If the payload looks intentionally negative, leave
@@ -279,11 +242,10 @@ class DabChecker:
             (k, v), = body.items()
 
             # Capability/descriptor from settings/list
-            sup_map = self.__to_settings_map(EnforcementManager().get_supported_settings())
-            desc = sup_map.get(k)
+            desc = self.__settings_index(device_id).get(k)
 
             # NEW: boolean descriptor + non-boolean value → treat as negative
-            if isinstance(desc, bool) and not isinstance(v, bool):
+            if desc is not None and desc.kind == KIND_BOOL and not isinstance(v, bool):
                 self.logger.info("[SET precheck] Boolean descriptor but non-boolean value provided; treating as negative test and sending payload as-is.")
                 return dab_body
 
@@ -293,28 +255,27 @@ class DabChecker:
                 return dab_body
 
             # If numeric range and value is out-of-range or non-numeric, treat as negative → as-is
-            if isinstance(desc, dict) and {"min", "max"}.issubset(desc.keys()):
+            if desc.kind == KIND_RANGE:
                 if not isinstance(v, (int, float)):
                     self.logger.info("[SET precheck] Non-numeric value for numeric range; treating as negative.")
                     return dab_body
-                if not (desc["min"] <= v <= desc["max"]):
+                if not desc.in_range(v):
                     self.logger.info("[SET precheck] Out-of-range numeric; treating as negative.")
                     return dab_body
 
             # If list of options and value type is clearly wrong, treat as negative
-            if isinstance(desc, list):
-                if desc and isinstance(desc[0], dict):
-                    if not isinstance(v, dict):
-                        self.logger.info("[SET precheck] Dict options but non-dict value; treating as negative.")
-                        return dab_body
-                else:
-                    # list of primitives
-                    if isinstance(v, (dict, list, bool)) or v is None:
-                        self.logger.info("[SET precheck] Primitive options but non-primitive/boolean value; treating as negative.")
-                        return dab_body
+            if desc.kind == KIND_DICT_OPTIONS:
+                if not isinstance(v, dict):
+                    self.logger.info("[SET precheck] Dict options but non-dict value; treating as negative.")
+                    return dab_body
+            elif desc.kind == KIND_OPTIONS:
+                # list of primitives
+                if isinstance(v, (dict, list, bool)) or v is None:
+                    self.logger.info("[SET precheck] Primitive options but non-primitive/boolean value; treating as negative.")
+                    return dab_body
 
             # Try to produce a supported payload (language etc.). If unchanged or '{}', keep original
-            adjusted = self.__settings_set_payload(k, preferred=v)
+            adjusted = self.__settings_set_payload(k, preferred=v, device_id=device_id)
             if not adjusted or adjusted == "{}":
                 return dab_body
             if isinstance(dab_body, str) and adjusted.strip() == dab_body.strip():
@@ -336,7 +297,7 @@ class DabChecker:
         if code == 0:
             self.logger.ok(f"Received a valid response from '{dab_topic}'.")
             try:
-                response = json.loads(dab_response)
+                response = response_json(dab_response)
             except Exception as e:
                 self.logger.warn(f"Response payload from '{dab_topic}' was not valid JSON: {e}")
                 return None
@@ -349,19 +310,19 @@ class DabChecker:
     def is_operation_supported(self, device_id, operation):
         validate_code = ValidateCode.UNCERTAIN
         prechecker_log = f"\n{operation} is uncertain whether it is supported on this device. Ongoing...\n"
-        if not EnforcementManager().get_supported_operations():
+        if not EnforcementManager(device_id).get_supported_operations():
             dab_precheck_topic = "operations/list"
             dab_precheck_body = "{}"
             self.logger.info("Fetching the list of supported DAB operations from the device.")
             dab_response = self.__execute_cmd(device_id, dab_precheck_topic, dab_precheck_body)
             operations = dab_response['operations'] if dab_response is not None else None
-            EnforcementManager().add_supported_operations(operations)
+            EnforcementManager(device_id).add_supported_operations(operations)
 
-        if not EnforcementManager().get_supported_operations():
+        if not EnforcementManager(device_id).get_supported_operations():
             # rely on caller to emit prechecker_log as a result line
             return validate_code, prechecker_log
 
-        if EnforcementManager().is_operation_supported(operation):
+        if EnforcementManager(device_id).is_operation_supported(operation):
             validate_code = ValidateCode.SUPPORT
             prechecker_log = f"\n{operation} is supported on this device. Ongoing...\n"
         else:
@@ -431,10 +392,10 @@ class DabChecker:
             return ValidateCode.UNCERTAIN, f"\nsettings/set: invalid request body ({e}); UNCERTAIN.\n"
 
         # 2) Ensure settings/list cache exists; if empty/malformed, re-fetch once
-        need_fetch = not EnforcementManager().check_supported_settings()
+        need_fetch = not EnforcementManager(device_id).check_supported_settings()
         if not need_fetch:
             try:
-                cached = EnforcementManager().get_supported_settings()
+                cached = EnforcementManager(device_id).get_supported_settings()
                 if not cached or (isinstance(cached, dict) and len(cached) == 0):
                     self.logger.info("Cache present but empty → will re-fetch settings/list.")
                     need_fetch = True
@@ -448,50 +409,35 @@ class DabChecker:
                 last = self.dab_tester.dab_client.last_error_code()
                 self.logger.warn(f"settings/list failed. Error code: {last}")
                 return ValidateCode.UNSUPPORT, f"\nsystem/settings/list unavailable (error {last}); cannot verify support for '{request_key}'.\n"
-            EnforcementManager().set_supported_settings(resp)
+            EnforcementManager(device_id).set_supported_settings(resp)
             self.logger.info("Cache updated from device.")
         else:
             self.logger.info("Using existing data from cache.")
 
         # 3) Interpret cache and decide support
         try:
-            sup = EnforcementManager().get_supported_settings() or {}
-            sup = sup if isinstance(sup, dict) else json.loads(sup)
-            settings_map = sup.get("settings", sup) if isinstance(sup, dict) else {}
-            if not isinstance(settings_map, dict):
-                raise ValueError("settings cache not a dict")
-
-            # Defensive: ignore obvious meta keys
-            for meta in ("status", "statusText", "ts"):
-                settings_map.pop(meta, None)
+            index = self.__settings_index(device_id)
 
             # ---- MANDATORY KEY VALIDATION ----
-            if request_key not in settings_map:
-                sample = list(settings_map.keys())[:3]
-                hint = f" Known keys: {sample} (showing up to 3 of {len(settings_map)})." if sample else " No known settings advertised."
+            d = index.get(request_key)
+            if d is None:
+                sample = index.sample_keys()
+                hint = f" Known keys: {sample} (showing up to 3 of {len(index)})." if sample else " No known settings advertised."
                 self.logger.info(f"'{request_key}' missing in cache.")
                 return ValidateCode.UNSUPPORT, f"\n'{request_key}' is not supported (missing in settings/list).{hint}\n"
 
-            desc = settings_map[request_key]
+            desc = d.raw
             self.logger.info(f"Descriptor for '{request_key}': {type(desc).__name__}")
 
-            # Helper to preview lists nicely
-            def _preview_list(lst, n=3):
-                if not lst:
-                    return []
-                if isinstance(lst[0], dict):
-                    return [{k: d.get(k) for k in list(d.keys())[:3]} for d in lst[:n]]
-                return lst[:n]
-
             # ----- Numeric range: {"min": x, "max": y}
-            if isinstance(desc, dict) and {"min", "max"}.issubset(desc.keys()):
-                accepted = f"[{desc['min']}, {desc['max']}]"
+            if d.kind == KIND_RANGE:
+                accepted = f"[{d.minimum}, {d.maximum}]"
                 self.logger.info(f"Accepted domain for '{request_key}': numeric range {accepted}. Provided: {request_value}")
                 if not isinstance(request_value, (int, float)):
                     return ValidateCode.UNCERTAIN, (
                         f"\n'{request_key}': accepted numeric range {accepted}; provided value '{request_value}' is not numeric. Marking as UNCERTAIN.\n"
                     )
-                if not (desc["min"] <= request_value <= desc["max"]):
+                if not d.in_range(request_value):
                     return ValidateCode.UNCERTAIN, (
                         f"\n'{request_key}': accepted numeric range {accepted}; provided value {request_value} out of range. Marking as UNCERTAIN.\n"
                     )
@@ -500,7 +446,7 @@ class DabChecker:
                 )
 
             # ----- Boolean capability flag: True/False indicates whether the setting is supported
-            if isinstance(desc, bool):
+            if d.kind == KIND_BOOL:
                 self.logger.info(
                     f"Accepted type for '{request_key}': boolean (True/False); "
                     f"capability advertised={desc}. Provided: {request_value} (type {type(request_value).__name__})"
@@ -518,8 +464,8 @@ class DabChecker:
                 )
 
             # ----- Enumerations / options: list of primitives or dicts
-            if isinstance(desc, list):
-                if not desc:
+            if d.kind in (KIND_OPTIONS, KIND_DICT_OPTIONS):
+                if not d.options:
                     # empty options list → UNSUPPORT
                     self.logger.info(
                         f"Accepted domain for '{request_key}': list of options; none available (0). Provided: {request_value}"
@@ -529,21 +475,19 @@ class DabChecker:
                         f"Provided value: {request_value}.\n"
                     )
 
-                accepted_preview = _preview_list(desc)
+                accepted_preview = d.preview()
                 shown = len(accepted_preview)
-                total = len(desc)
+                total = len(d.options)
                 accepted_info = f"{accepted_preview} (showing {shown} of {total})"
                 self.logger.info(f" Accepted domain for '{request_key}': list of options; examples: {accepted_info}. Provided: {request_value}")
 
                 wants = request_value if isinstance(request_value, list) else [request_value]
 
-                if desc and isinstance(desc[0], dict):
+                if d.kind == KIND_DICT_OPTIONS:
                     # subset-match for dict entries (e.g., {"width":3840,"height":2160})
-                    def _match(req_d, opt_d):
-                        return isinstance(req_d, dict) and all(req_d.get(k) == opt_d.get(k) for k in req_d.keys())
-                    ok = all(any(_match(w, opt) for opt in desc) for w in wants)
+                    ok = all(d.match_option(w) is not None for w in wants)
                 else:
-                    ok = all(w in desc for w in wants)
+                    ok = all(d.has_option(w) for w in wants)
 
                 if not ok:
                     return ValidateCode.UNCERTAIN, (
@@ -554,7 +498,7 @@ class DabChecker:
                 )
 
             # ----- Unknown/complex object: log keys and treat as supported by key presence
-            if isinstance(desc, dict):
+            if d.kind == KIND_OBJECT:
                 keys_preview = list(desc.keys())[:6]
                 self.logger.info(f"Accepted domain for '{request_key}': object-like descriptor; keys (subset): {keys_preview}. Provided: {request_value}")
                 return ValidateCode.SUPPORT, (
@@ -581,17 +525,17 @@ class DabChecker:
         validate_code = ValidateCode.UNCERTAIN
         prechecker_log = f"\nvoice set {request_value['name']} is uncertain whether it is supported on this device. Ongoing...\n"
 
-        if not EnforcementManager().get_supported_voice_assistants():
+        if not EnforcementManager(device_id).get_supported_voice_assistants():
             self.logger.info("Fetching the list of supported voice systems from the device.")
             dab_response = self.__execute_cmd(device_id, dab_precheck_topic, dab_precheck_body)
 
             if not dab_response or 'voiceSystems' not in dab_response:
-                EnforcementManager().set_supported_voice_assistants(None)
+                EnforcementManager(device_id).set_supported_voice_assistants(None)
                 return validate_code, prechecker_log
 
-            EnforcementManager().set_supported_voice_assistants(dab_response['voiceSystems'])
+            EnforcementManager(device_id).set_supported_voice_assistants(dab_response['voiceSystems'])
 
-        voice_assistant = EnforcementManager().get_supported_voice_assistants(request_value['name'])
+        voice_assistant = EnforcementManager(device_id).get_supported_voice_assistants(request_value['name'])
 
         if not voice_assistant:
             prechecker_log = f"\nvoice set {request_key} is NOT supported on this device. Ongoing...\n"
@@ -613,7 +557,7 @@ class DabChecker:
             prechecker_log = f"\nvoice system {request_voice_system} is NOT supported on this device. Ongoing...\n"
             return validate_code, prechecker_log
 
-        voice_assistant = EnforcementManager().get_supported_voice_assistants(request_voice_system)
+        voice_assistant = EnforcementManager(device_id).get_supported_voice_assistants(request_voice_system)
         if voice_assistant["enabled"]:
             prechecker_log = f"\nvoice system {request_voice_system} is enabled on this device. Ongoing...\n"
             return validate_code, prechecker_log
@@ -699,16 +643,16 @@ class DabChecker:
         validate_code = ValidateCode.UNCERTAIN
         prechecker_log = f"\n{key} is uncertain whether it is supported on this device. Ongoing...\n"
 
-        if not EnforcementManager().get_supported_keys():
+        if not EnforcementManager(device_id).get_supported_keys():
             self.logger.info("Fetching the list of supported input keys from the device.")
             dab_response = self.__execute_cmd(device_id, dab_precheck_topic, dab_precheck_body)
             keys = dab_response['keyCodes'] if dab_response else None
-            EnforcementManager().add_supported_keys(keys)
+            EnforcementManager(device_id).add_supported_keys(keys)
 
-        if not EnforcementManager().get_supported_keys():
+        if not EnforcementManager(device_id).get_supported_keys():
             return validate_code, prechecker_log
 
-        if EnforcementManager().is_key_supported(key):
+        if EnforcementManager(device_id).is_key_supported(key):
             validate_code = ValidateCode.SUPPORT
             prechecker_log = f"\n{key} is supported on this device. Ongoing...\n"
         else:
@@ -815,10 +759,9 @@ class DabChecker:
         # If numeric-range and out-of-range was requested, expect device to clamp to nearest boundary.
         expected_value = request_value
         try:
-            sup_map = self.__to_settings_map(EnforcementManager().get_supported_settings())
-            desc = sup_map.get(request_key)
-            if isinstance(desc, dict) and {"min", "max"}.issubset(desc.keys()) and isinstance(request_value, (int, float)):
-                mn, mx = desc["min"], desc["max"]
+            bounds = self.__settings_index(device_id).range_of(request_key)
+            if bounds is not None and isinstance(request_value, (int, float)):
+                mn, mx = bounds
                 if request_value < mn:
                     expected_value = mn
                     self.logger.info(f"[check] '{request_key}' requested {request_value} below min {mn} → expecting clamp to {mn}.")
@@ -855,10 +798,10 @@ class DabChecker:
 
         dab_response = self.__execute_cmd(device_id, dab_check_topic, dab_check_body)
         if not dab_response or 'voiceSystems' not in dab_response:
-            EnforcementManager().set_supported_voice_assistants(None)
+            EnforcementManager(device_id).set_supported_voice_assistants(None)
             return validate_result, checker_log
 
-        EnforcementManager().set_supported_voice_assistants(dab_response['voiceSystems'])
+        EnforcementManager(device_id).set_supported_voice_assistants(dab_response['voiceSystems'])
         for voice_assistant in dab_response['voiceSystems']:
             if voice_assistant['name'] == request_value['name']:
                 actual_value = voice_assistant['enabled']
@@ -4,11 +4,28 @@ from paho.mqtt.properties import Properties
 from paho.mqtt.packettypes import PacketTypes 
 import paho.mqtt.client as mqtt
 import json
+import re
 import uuid
 from logger import LOGGER 
+from util.dab_response import DabResponse
+from util.tracing import TRACER
 
 METRICS_TIMES = 5
 
+# The status code is usually the first key; read it from the head of a large payload instead of parsing it all
+_STATUS = re.compile(rb'"status"\s*:\s*(-?\d+)')
+STATUS_SCAN_BYTES = 4096
+LAZY_PARSE_BYTES = 64 * 1024
+
+
+def _decode(payload):
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        LOGGER.warn(f"Response is not valid JSON ({len(payload)} bytes): {e}")
+        return None
+
+
 class DabClient:
     def __init__(self):
         self.__lock = Lock()
@@ -16,19 +33,52 @@ class DabClient:
         self.__client = mqtt.Client("mqtt5_client",protocol=mqtt.MQTTv5)
         self.__metrics_count = 0
         self.__response_chunks = []
+        self.__payload = None
+        self.__response_dic = None
+        self.__response_obj = None
+        self.__code = -1
+        self.__trace_id = 0
 
     def __on_message(self, client, userdata, message):
-        self.__response_dic = json.loads(message.payload)
-        self.__response_chunks.append(self.__response_dic)
+        # Runs on paho's network thread: keep the raw bytes and signal; parsing happens lazily in the caller
+        if TRACER.enabled:
+            with TRACER.span("mqtt response", "mqtt", topic=message.topic, bytes=len(message.payload), id=self.__trace_id):
+                TRACER.flow(self.__trace_id, start=False)
+                return self.__store(message)
+        self.__store(message)
+
+    def __store(self, message):
+        self.__payload = message.payload
+        self.__response_dic = None
+        self.__response_obj = None
+        self.__code = None
+        self.__response_chunks.append(message.payload)
         if self.__lock.locked():
             self.__lock.release()
-        try:
-            self.__code = self.__response_dic['status']
-        except:
-            self.__code = -1
+
+    def __parsed(self):
+        if self.__response_dic is None and self.__payload is not None:
+            self.__response_dic = _decode(self.__payload)
+        return self.__response_dic
+
+    def __status(self):
+        if self.__code is None:
+            payload = self.__payload
+            code = None
+            if len(payload) > LAZY_PARSE_BYTES:
+                m = _STATUS.search(payload, 0, STATUS_SCAN_BYTES)
+                # only a top-level "status" counts (one '{' open before it)
+                if m and payload.count(b"{", 0, m.start()) - payload.count(b"}", 0, m.start()) == 1:
+                    code = int(m.group(1))
+            if code is None:
+                body = self.__parsed()
+                code = body.get("status", -1) if isinstance(body, dict) else -1
+            self.__code = code
+        return self.__code
 
     def get_response_chunk(self):
-        return self.__response_chunks.pop(0) if self.__response_chunks else None
+        chunk = self.__response_chunks.pop(0) if self.__response_chunks else None
+        return _decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
 
     def __on_message_metrics(self, client, userdata, message):
         if not message.payload:
@@ -59,17 +109,51 @@ class DabClient:
         properties.ResponseTopic=response_topic
         self.__client.on_message = self.__on_message
         self.__client.subscribe(response_topic)
-        self.__client.publish(topic,msg,properties=properties)
-        self.__response_chunks.clear()
-        if not (self.__lock.acquire(timeout = 90)):
-            self.__code = 100
+        with TRACER.span(f"mqtt {operation}", "mqtt", topic=topic) as span:
+            if TRACER.enabled:
+                self.__trace_id = TRACER.next_id()
+                span.set(id=self.__trace_id)
+                TRACER.flow(self.__trace_id, start=True)
+            self.__client.publish(topic,msg,properties=properties)
+            self.__response_chunks.clear()
+            if not (self.__lock.acquire(timeout = 90)):
+                self.__payload = None
+                self.__response_obj = None
+                self.__code = 100
+                span.set(timeout=True)
         
     def response(self):
-        if((self.__code != -1) and (self.__code != 100)):
-            return json.dumps(self.__response_dic, indent=2)
+        # DabResponse (util/dab_response.py): the pretty JSON text, built once per message, with the parsed body
+        code = self.__status()
+        if((code != -1) and (code != 100)):
+            if self.__response_obj is None:
+                self.__response_obj = DabResponse(self.__parsed(), raw=self.__payload, status=code)
+            return self.__response_obj
         else:
             return ""
 
+    def response_payload(self):
+        # Raw bytes of the last response as received (no re-serialization); b"" like response() on error/timeout
+        code = self.__status()
+        if (code == -1) or (code == 100):
+            return b""
+        if self.__payload is None:
+            return json.dumps(self.__response_dic).encode("utf-8")
+        return self.__payload
+
+    def snapshot_response(self):
+        # (status code, parsed response) of the last request, used by the response cache
+        return self.__status(), self.__parsed()
+
+    def replay_response(self, code, response_dic):
+        # Make a cached response look like the reply to the current request
+        self.__response_chunks.clear()
+        self.__response_chunks.append(response_dic)
+        self.__response_dic = response_dic
+        self.__response_obj = None
+        self.__payload = None
+        self.__code = code
+
     def subscribe_metrics(self, device_id, operation):
         self.__metrics_state = False
         self.__metrics_count = 0
@@ -87,19 +171,20 @@ class DabClient:
         return self.__metrics_state
 
     def last_error_code(self):
-        return self.__code
+        return self.__status()
     
     def last_error_msg(self):
         logger = getattr(self, "logger", LOGGER)
-        if (self.__code == -1):
+        code = self.__status()
+        if (code == -1):
             logger.warn("Unknown error")
-        elif (self.__code == 100):
+        elif (code == 100):
             logger.warn("Timeout")
-        elif (self.__code == 400):
+        elif (code == 400):
             logger.warn("Request invalid or malformed")
-        elif (self.__code == 500):
+        elif (code == 500):
             logger.error("Internal error")
-        elif (self.__code == 501):
+        elif (code == 501):
             logger.warn("Not implemented")
 
     # ---- Minimal discovery compatible with callers passing attempts + wait_seconds ----
@@ -14,6 +14,20 @@ from util.enforcement_manager import EnforcementManager
 from util.enforcement_manager import ValidateCode
 from util.config_loader import resolve_body_or_raise, PayloadConfigError
 from util.output_image_handler import handle_output_image_response
+from util.request_pipeline import RequestPipeline
+from util.response_cache import ResponseCacheInterceptor
+from util.session_fixtures import FixtureManager
+from util.reboot_batch import RebootBatch, collect_batchable
+from util.results_journal import ResultsJournal, journal_path_for
+from util.sharding import DurationStore
+from util.phase_timer import PhaseTimer, format_table, summarize as summarize_phases
+from util.tracing import TRACER
+from util.profiling import PROFILER
+from util.test_case import compile_case, compile_suite
+from util.ui_state import UiStateTracker
+from util.verdict_providers import ask_yes_no, questions_asked
+from util.dab_response import response_json
+from util.response_render import FALLBACK_CHARS, clip, expand_response_views, log_response
 from sys import exit as sys_exit
 import re
 import time
@@ -29,7 +43,25 @@ class DabTester:
     def __init__(self, broker, override_dab_version=None):
         self.dab_client = DabClient()
         self.dab_client.connect(broker, 1883)
+        # Every execute_cmd goes through this chain; the checker registers its interceptors on it
+        self.request_pipeline = RequestPipeline(self._dispatch_cmd)
+        self.response_cache = self.request_pipeline.register(ResponseCacheInterceptor(self.dab_client))
+        self.ui_state = self.request_pipeline.register(UiStateTracker())
         self.dab_checker = DabChecker(self)
+        # Preconditions shared by consecutive functional tests (see util/session_fixtures.py)
+        self.fixtures = FixtureManager(self)
+        # Share one restart between the reboot persistence checks (see util/reboot_batch.py)
+        self.batch_reboots = False
+        # Completed results are journaled as they finish (see util/results_journal.py)
+        self.resume = False
+        self.run_id = None
+        self.results_journal = None
+        # Test case being executed (evidence for deferred manual checks is tagged with it)
+        self.current_case = None
+        # Per-test wall time history used to balance --shard splits
+        self.durations = DurationStore()
+        # Phase timings of the test being executed (see util/phase_timer.py)
+        self.phase_timer = PhaseTimer()
         self.verbose = False
         self.dab_version = None  # Will be set by auto-detect logic
         self.override_dab_version = override_dab_version
@@ -45,7 +77,11 @@ class DabTester:
     # -----------------------------
     # Core send/request wrapper
     # -----------------------------
-    def execute_cmd(self,device_id,dab_request_topic,dab_request_body="{}"):
+    def execute_cmd(self,device_id,dab_request_topic,dab_request_body="{}", fresh=False):
+        # fresh=True bypasses the response cache (the device is always asked)
+        return self.request_pipeline.send(device_id, dab_request_topic, dab_request_body, fresh=fresh)
+
+    def _dispatch_cmd(self, device_id, dab_request_topic, dab_request_body):
         self.dab_client.request(device_id,dab_request_topic,dab_request_body)
         if self.dab_client.last_error_code() == 200:
             return 0
@@ -57,17 +93,8 @@ class DabTester:
     # -----------------------------
     def _skipped_result_for_invalid_case(self, device_id, test_case, reason: str):
         """Return a SKIPPED TestResult for invalid test_case so it's counted."""
-        topic = "invalid/test"
-        title = "InvalidTestCase"
-        try:
-            if isinstance(test_case, tuple) and len(test_case) >= 1 and isinstance(test_case[0], str) and test_case[0].strip():
-                topic = test_case[0].strip()
-            if isinstance(test_case, tuple) and len(test_case) >= 5 and isinstance(test_case[4], str) and test_case[4].strip():
-                title = test_case[4].strip()
-        except Exception:
-            pass
-
-        test_id = to_test_id(f"{topic}/{title}")
+        case = compile_case(test_case, self.valid_dab_topics)
+        test_id, topic, title = case.test_id, case.topic, case.title
         tr = TestResult(test_id, device_id, topic, "{}", "SKIPPED", "", [])
         tr.test_result = "SKIPPED"  # <-- ensure writer sees it
         log(tr, f"[TEST] {title} (test_id={test_id}, device={device_id})")
@@ -75,14 +102,14 @@ class DabTester:
         log(tr, f"[REASON] {reason}")
         return tr
 
-    def _resolve_body_or_skip(self, device_id: str, topic: str, title: str, body_spec):
+    def _resolve_body_or_skip(self, device_id: str, topic: str, title: str, body_spec, test_id=None):
         """
         Build the request body. If it fails, return a SKIPPED or OPTIONAL_FAILED TestResult.
         - For DAB 2.0, app install failures become OPTIONAL_FAILED.
         - For all other cases, failures become SKIPPED.
         Returns: (ok: bool, body_str: Optional[str], tr_if_skipped: Optional[TestResult])
         """
-        test_id = to_test_id(f"{topic}/{title}")
+        test_id = test_id or to_test_id(f"{topic}/{title}")
         try:
             body_str = resolve_body_or_raise(body_spec)
             return True, body_str, None
@@ -306,7 +333,7 @@ class DabTester:
                 message = ""
                 if resp_text:
                     try:
-                        j = json.loads(resp_text)
+                        j = response_json(resp_text)
                         healthy = bool(j.get("healthy", False))
                         message = j.get("message", "")
                     except Exception:
@@ -358,7 +385,7 @@ class DabTester:
                     message = ""
                     if resp_text:
                         try:
-                            j = json.loads(resp_text)
+                            j = response_json(resp_text)
                             healthy = bool(j.get("healthy", False))
                             message = j.get("message", "")
                         except Exception:
@@ -396,10 +423,12 @@ class DabTester:
         Raises PreflightTermination if we should stop the run.
         """
         # 1) Discovery (hard gate; no prompt)
-        self._preflight_discovery_or_raise(device_id)
+        with self.phase_timer.phase("preflight_discovery"):
+            self._preflight_discovery_or_raise(device_id)
 
         # 2) Health-check (prompt allowed)
-        ok = self.pretest_health_check(device_id, retries=3, delay_sec=10, interactive=True, fatal=False)
+        with self.phase_timer.phase("health_check"):
+            ok = self.pretest_health_check(device_id, retries=3, delay_sec=10, interactive=True, fatal=False)
         if not ok:
             raise PreflightTermination("Health-check failed; user chose to terminate.")
 
@@ -407,17 +436,37 @@ class DabTester:
     # Main Execute for a single test
     # -----------------------------
     def Execute(self, device_id, test_case):
-        # Unpack first (do not open a section yet)
-        (dab_request_topic, body_spec, validate_output_function, expected_response, test_title, is_negative, test_version) = self.unpack_test_case(test_case)
-
-        if dab_request_topic is None:
-            # Unpack failed → return a SKIPPED result so it's counted
-            return self._skipped_result_for_invalid_case(device_id, test_case, "Unpack failed")
-
-        test_id = to_test_id(f"{dab_request_topic}/{test_title}")
+        # Every result carries phase_timings_ms, completed once return-to-home is done
+        timer = self.phase_timer = PhaseTimer()
+        with TRACER.span("test", "test") as span, PROFILER.test(getattr(test_case, "test_id", "") or "test"):
+            test_result = self._execute_case(device_id, test_case, timer)
+            if test_result is not None:
+                span.set(name=test_result.test_id, outcome=getattr(test_result, "test_result", test_result.outcome))
+        timer.attach(test_result)
+        timer.finish()
+        return test_result
+
+    def _execute_case(self, device_id, test_case, timer):
+        # Capabilities cached by validators/checker are scoped to this device
+        EnforcementManager.bind_device(device_id)
+        asked_before = questions_asked()
+
+        # Compiled once per suite by the runners; bare tuples are compiled here (do not open a section yet)
+        with timer.phase("unpack"):
+            case = compile_case(test_case, self.valid_dab_topics)
+        if not case.valid:
+            # Invalid declaration → return a SKIPPED result so it's counted
+            self.logger.warn(f"Invalid test case: {case.error}. This case will be skipped. Case: {case.source}")
+            return self._skipped_result_for_invalid_case(device_id, case, case.error)
+
+        dab_request_topic, test_title, test_id = case.topic, case.title, case.test_id
+        self.current_case = case
+        validate_output_function, expected_response = case.func, case.expected
+        is_negative, test_version = case.is_negative, case.version
 
         # Try to build/resolve payload. If it fails, return a SKIPPED TestResult (no test_start)
-        ok, dab_request_body, skipped_tr = self._resolve_body_or_skip(device_id, dab_request_topic, test_title, body_spec)
+        with timer.phase("payload"):
+            ok, dab_request_body, skipped_tr = self._resolve_body_or_skip(device_id, dab_request_topic, test_title, case.body, test_id)
         if not ok:
             return skipped_tr
 
@@ -442,7 +491,8 @@ class DabTester:
             self._preflight_before_each_test_or_raise(device_id)
 
             # Initialize result object for logging and reporting
-            test_result = TestResult(to_test_id(f"{dab_request_topic}/{test_title}"), device_id, dab_request_topic, dab_request_body, "UNKNOWN", "", [])
+            test_result = TestResult(test_id, device_id, dab_request_topic, dab_request_body, "UNKNOWN", "", [])
+            timer.attach(test_result)
             # ------------------------------------------------------------------------
             # DAB Version Compatibility Check
             # If the test is meant for DAB 2.1 but the dav version is on DAB 2.0,
@@ -453,7 +503,9 @@ class DabTester:
 
             # MODIFIED: Use packaging.version for robust comparison
             try:
-                if Version(dab_version) < Version(test_version):
+                with timer.phase("version_gate"):
+                    too_old = Version(dab_version) < Version(test_version)
+                if too_old:
                     test_result.test_result = "OPTIONAL_FAILED"
                     log(test_result, f"\033[1;33m[ OPTIONAL_FAILED - Requires DAB Version {test_version}, but device version is {dab_version} ]\033[0m")
                     # close section before returning
@@ -471,7 +523,8 @@ class DabTester:
             # ------------------------------------------------------------------------
             try:
                 if dab_request_topic in {"system/settings/set"}:
-                    vc, cap_log = self.dab_checker.precheck(device_id, dab_request_topic, dab_request_body)
+                    with timer.phase("capability_precheck"):
+                        vc, cap_log = self.dab_checker.precheck(device_id, dab_request_topic, dab_request_body)
                     if vc == ValidateCode.UNSUPPORT:
                         test_result.test_result = "OPTIONAL_FAILED"
                         if cap_log:
@@ -486,7 +539,8 @@ class DabTester:
 
             # Check operation support via operations/list (prechecker)
             if dab_request_topic != 'operations/list':
-                validate_code, prechecker_log = self.dab_checker.is_operation_supported(device_id, dab_request_topic)
+                with timer.phase("capability_precheck"):
+                    validate_code, prechecker_log = self.dab_checker.is_operation_supported(device_id, dab_request_topic)
 
                 if validate_code == ValidateCode.UNSUPPORT:
                     test_result.test_result = "OPTIONAL_FAILED"
@@ -502,7 +556,8 @@ class DabTester:
             # Optional precheck for non-negative tests
             # ------------------------------------------------------------------------
             if not is_negative:
-                validate_code, prechecker_log = self.dab_checker.precheck(device_id, dab_request_topic, dab_request_body)
+                with timer.phase("capability_precheck"):
+                    validate_code, prechecker_log = self.dab_checker.precheck(device_id, dab_request_topic, dab_request_body)
                 if validate_code == ValidateCode.UNSUPPORT:
                     test_result.test_result = "OPTIONAL_FAILED"
                     log(test_result, prechecker_log)
@@ -517,12 +572,17 @@ class DabTester:
             try:
                 # Send DAB request via broker
                 try:
-                    code = self.execute_cmd(device_id, dab_request_topic, dab_request_body)
-                    resp_text = self.dab_client.response() or ""
-                    status_code = self.dab_client.last_error_code()
-                    test_result.response = resp_text
                     # Topics whose responses are big/noisy (don’t store full response in JSON)
                     HEAVY_TOPICS = {"system/logs/stop-collection", "output/image"}
+                    with timer.phase("request"):
+                        code = self.execute_cmd(device_id, dab_request_topic, dab_request_body, fresh=True)
+                        if dab_request_topic in HEAVY_TOPICS:
+                            # Keep the payload as received instead of re-serializing megabytes with indent=2
+                            resp_text = self.dab_client.response_payload().decode("utf-8", "replace")
+                        else:
+                            resp_text = self.dab_client.response() or ""
+                    status_code = self.dab_client.last_error_code()
+                    test_result.response = resp_text
                     if dab_request_topic in HEAVY_TOPICS:
                         outcome = "SUCCESS" if status_code == 200 else f"ERROR {status_code}"
                         log(test_result, f"[INFO] Response summary for '{dab_request_topic}': HTTP {status_code} ({outcome})")
@@ -543,13 +603,16 @@ class DabTester:
                     durationInMs = int((end - start).total_seconds() * 1000)
 
                     try:
-                        validate_result = validate_output_function(test_result, durationInMs, expected_response)
+                        with timer.phase("validator"):
+                            validate_result = validate_output_function(test_result, durationInMs, expected_response)
                         if validate_result == True:
-                            validate_result, checker_log = self.dab_checker.check(device_id, dab_request_topic, dab_request_body)
+                            with timer.phase("checker"):
+                                validate_result, checker_log = self.dab_checker.check(device_id, dab_request_topic, dab_request_body)
                             if checker_log:
                                 log(test_result, checker_log)
                         else:
-                            self.dab_checker.end_precheck(device_id, dab_request_topic, dab_request_body)
+                            with timer.phase("checker"):
+                                self.dab_checker.end_precheck(device_id, dab_request_topic, dab_request_body)
                     except Exception as e:
                         # If this is a negative test case and validation fails (e.g., 200 response with incorrect behavior),
                         # treat it as PASS because failure was the expected outcome in this scenario.
@@ -619,70 +682,12 @@ class DabTester:
                 test_result.test_result = "SKIPPED"
                 log(test_result, f"\033[1;34m[ SKIPPED - Internal Error ]\033[0m {str(e)}")
             if dab_request_topic not in {"system/logs/stop-collection", "output/image"} and resp_text:
-                try:
-                    text = str(resp_text)  # no trimming
-
-                    # If response looks like "['{', 'status: 200', ...]" try to merge it to JSON text
-                    if text.startswith('[') and text.endswith(']'):
-                        import ast
-                        try:
-                            chunks = ast.literal_eval(text)
-                            if isinstance(chunks, list):
-                                text = " ".join(str(x) for x in chunks if str(x))
-                        except Exception:
-                            pass
-
-                    obj = json.loads(text)
-
-                    if isinstance(obj, dict):
-                        for key, value in obj.items():
-                            if isinstance(value, list):
-                                # No index for sub-items; print one line per value
-                                for item in value:
-                                    log(test_result, f"{key}: {item}")
-                            elif isinstance(value, dict):
-                                # Flatten one level without indices
-                                for sub_key, sub_val in value.items():
-                                    log(test_result, f"{key}.{sub_key}: {sub_val}")
-                            else:
-                                log(test_result, f"{key}: {value}")
-
-                    elif isinstance(obj, list):
-                        # Index only for the MAIN (top-level) list items
-                        for i, item in enumerate(obj):
-                            if isinstance(item, dict):
-                                for key, value in item.items():
-                                    if isinstance(value, list):
-                                        for sub_item in value:
-                                            log(test_result, f"item[{i}].{key}: {sub_item}")  # no sub-index
-                                    elif isinstance(value, dict):
-                                        for sub_key, sub_val in value.items():
-                                            log(test_result, f"item[{i}].{key}.{sub_key}: {sub_val}")  # no sub-index
-                                    else:
-                                        log(test_result, f"item[{i}].{key}: {value}")
-                            elif isinstance(item, list):
-                                # Nested list: repeat the same main index for each inner value (no sub-index)
-                                for sub_item in item:
-                                    log(test_result, f"item[{i}]: {sub_item}")
-                            else:
-                                log(test_result, f"item[{i}]: {item}")
-
-                    else:
-                        # Primitive (str/number/bool/null)
-                        log(test_result, str(obj))
-
-                except Exception:
-                    # Fallbacks: if we had chunk tokens, print each as a separate line; else raw text
+                # Flattened view, bounded by config.response_log; the full response stays in test_result.response
+                with timer.phase("render"):
                     try:
-                        if 'chunks' in locals() and isinstance(chunks, list):
-                            for chunk in chunks:
-                                log(test_result, str(chunk))
-                        else:
-                            log(test_result, resp_text)
+                        log_response(test_result, resp_text)
                     except Exception:
-                        log(test_result, resp_text)
-
-
+                        log(test_result, clip(resp_text, FALLBACK_CHARS))
 
             # ---------- close the test section ----------
             total_ms = int((time.time() - section_wall_start) * 1000)
@@ -693,11 +698,13 @@ class DabTester:
 
         finally:
             # Always try to go back Home after the test, regardless of outcome/early return/exception.
-            try:
-                self.return_to_home_after_test(device_id)
-            except Exception:
-                # best-effort cleanup; never let this affect runner flow
-                pass
+            with timer.phase("return_to_home"):
+                try:
+                    # an operator may have navigated while answering a manual check
+                    self.return_to_home_after_test(device_id, force=questions_asked() != asked_before)
+                except Exception:
+                    # best-effort cleanup; never let this affect runner flow
+                    pass
 
     def Execute_Functional_Tests(self, device_id, functional_tests, test_result_output_path=""):
         """
@@ -705,29 +712,35 @@ class DabTester:
         - For EACH test: run DAB version check, then discovery + health-check.
         - If preflight fails once, mark current + remaining as SKIPPED and stop.
         """
+        EnforcementManager.bind_device(device_id)
+        functional_tests = self.compile_cases(functional_tests, "functional")
         result_list = []
         terminated_run = False
         total_count = len(functional_tests)
         suite_wall_start = time.time()
         dab_version = self.dab_version  # Get the device's DAB version once
+        if not test_result_output_path:
+            test_result_output_path = "./test_result/functional_result.json"
+        self._open_journal("functional", test_result_output_path)
+        reboot_batch = None
+        if self.batch_reboots:
+            batched = [(i, case) for i, case in collect_batchable(functional_tests, dab_version)
+                       if not self._already_recorded(case.test_id)]
+            if len(batched) > 1:
+                reboot_batch = RebootBatch(self, device_id, batched)
+                self.logger.info(f"Reboot batch: {len(batched)} persistence checks will share one restart.")
 
         for idx, test_case in enumerate(functional_tests, 1):
-            try:
-                # Updated tuple unpacking to include the test_version
-                dab_topic, test_category, test_func, test_name, test_version, *_ = test_case
-            except ValueError:
-                # Handle older test case definitions without a version
-                dab_topic, test_category, test_func, test_name = test_case[:4]
-                test_version = "2.0"  # Default to a version that will always pass
-            except Exception:
-                dab_topic, test_category, test_func, test_name, test_version = ("unknown/topic", "functional", None, "Unknown", "2.0")
+            dab_topic, test_func, test_version = test_case.topic, test_case.func, test_case.version
+            self.current_case = test_case
+            pretty_name, test_id = test_case.title, test_case.test_id
 
             # progress line (like conformance)
-            pretty_name = test_name if isinstance(test_name, str) and test_name.strip() else f"{dab_topic}/{test_category}"
             self.logger.result(f"functional progress {idx}/{total_count}: {pretty_name} on topic '{dab_topic}'.")
 
             # --- open a test section (mirrors conformance) ---
-            test_id = to_test_id(f"{dab_topic}/{pretty_name}")
+            if self._already_recorded(test_id):
+                continue
             self.logger.test_start(
                 name=pretty_name,
                 test_id=test_id,
@@ -738,11 +751,16 @@ class DabTester:
             )
             section_wall_start = time.time()
             outcome_for_end = "SKIPPED"  # default if we bail early
+            timer = self.phase_timer = PhaseTimer()
+            results_before = len(result_list)
+            trace_start = TRACER.now_us()
             # --------------------------------------------------
 
             # MODIFIED: Use packaging.version for robust comparison
             try:
-                if Version(dab_version) < Version(test_version):
+                with timer.phase("version_gate"):
+                    too_old = Version(dab_version) < Version(test_version)
+                if too_old:
                     outcome_for_end = "OPTIONAL_FAILED"
                     log_msg = f"[OPTIONAL_FAILED] Requires DAB Version {test_version}, but device version is {dab_version}. Skipping test."
                     self.logger.warn(log_msg)
@@ -751,6 +769,9 @@ class DabTester:
                         [log_msg]
                     )
                     result_list.append(tr)
+                    timer.attach(tr)
+                    timer.finish()
+                    self._journal_result(tr)
                     total_ms = int((time.time() - section_wall_start) * 1000)
                     self.logger.test_end(outcome=outcome_for_end, duration_ms=total_ms)
                     continue  # Skip to the next test in the loop
@@ -768,20 +789,17 @@ class DabTester:
                     ["Preflight failed (discovery/health). Skipping this and remaining functional tests."]
                 )
                 result_list.append(tr)
+                timer.attach(tr)
+                timer.finish()
                 outcome_for_end = "SKIPPED"
                 total_ms = int((time.time() - section_wall_start) * 1000)
                 self.logger.test_end(outcome=outcome_for_end, duration_ms=total_ms)
 
                 # Mark REMAINING tests as skipped too (no start/end sections for them)
                 for remaining in functional_tests[idx:]:
-                    try:
-                        r_topic, r_category, *_ = remaining
-                    except Exception:
-                        r_topic, r_category = ("unknown/topic", "functional")
-                    r_test_id = to_test_id(f"{r_topic}/{r_category}")
                     result_list.append(
                         TestResult(
-                            r_test_id, device_id, r_topic, "{}", "SKIPPED", "",
+                            remaining.test_id, device_id, remaining.topic, "{}", "SKIPPED", "",
                             ["Run terminated during preflight. Remaining functional tests skipped."]
                         )
                     )
@@ -789,11 +807,16 @@ class DabTester:
                 break
 
             # Preflight OK → run the functional test
+            if reboot_batch is not None and reboot_batch.covers(idx - 1):
+                # The first batched test runs the whole batch; later ones pick up their stored result
+                test_func = lambda *_args, _i=idx - 1: reboot_batch.result(_i)
+
             try:
                 if callable(test_func):
                     result = None
                     try:
-                        result = test_func(dab_topic, pretty_name, self, device_id)
+                        with timer.phase("test"), PROFILER.test(test_id):
+                            result = test_func(dab_topic, pretty_name, self, device_id)
                         # Ensure we always append a TestResult-like object
                         if result is None:
                             result = TestResult(
@@ -804,17 +827,22 @@ class DabTester:
                         # derive outcome for the end marker
                         outcome_for_end = getattr(result, "test_result", None) or getattr(result, "outcome", "UNKNOWN")
                     finally:
-                        # Always return to Home after each test
-                        try:
-                            self.return_to_home_after_test(device_id)
-                        except Exception:
-                            pass
+                        # Return to Home after each test, unless the next test needs the same app in foreground
+                        next_func = functional_tests[idx].func if idx < total_count else None
+                        keep_app = self.fixtures.keep_foreground_for_next(test_func, next_func)
+                        if keep_app:
+                            self.logger.info(f"Next test also needs '{keep_app}' in foreground; skipping the Home reset.")
+                        else:
+                            with timer.phase("return_to_home"):
+                                try:
+                                    self.return_to_home_after_test(device_id, force=True)
+                                except Exception:
+                                    pass
                 else:
-                    # Not callable — record as SKIPPED but keep going
-                    bad_id = to_test_id(f"{dab_topic}/{test_category}")
+                    # Not a valid functional declaration — record as SKIPPED but keep going
                     bad_result = TestResult(
-                        bad_id, device_id, dab_topic, "{}", "SKIPPED", "",
-                        ["Invalid functional test function: not callable."]
+                        test_id, device_id, dab_topic, "{}", "SKIPPED", "",
+                        [f"Invalid functional test: {test_case.error or 'function is not callable'}."]
                     )
                     result_list.append(bad_result)
                     outcome_for_end = "SKIPPED"
@@ -828,7 +856,7 @@ class DabTester:
                 self.logger.error(f"Functional test execution failed: {e}")
                 # Even on runner-level exceptions, still try returning Home
                 try:
-                    self.return_to_home_after_test(device_id)
+                    self.return_to_home_after_test(device_id, force=True)
                 except Exception:
                     pass
                 tr = TestResult(
@@ -839,12 +867,19 @@ class DabTester:
                 outcome_for_end = "SKIPPED"
 
             # --- close the test section (mirrors conformance) ---
+            timer.finish()
+            if len(result_list) > results_before:
+                # journaled once the timings are complete
+                self._journal_result(timer.attach(result_list[results_before]))
+            TRACER.complete(test_id, "test", trace_start, outcome=outcome_for_end)
             total_ms = int((time.time() - section_wall_start) * 1000)
             self.logger.test_end(outcome=outcome_for_end, duration_ms=total_ms)
+            self.durations.observe(test_id, total_ms)
             # -----------------------------------------------------
 
-        if not test_result_output_path:
-            test_result_output_path = "./test_result/functional_result.json"
+        self.logger.info(f"Session {self.fixtures.summary()}.")
+        self.durations.save()
+        result_list = self._assemble_results(result_list)
 
         device_info = self.get_device_info(device_id)
         total_wall_ms = int((time.time() - suite_wall_start) * 1000)
@@ -864,31 +899,37 @@ class DabTester:
             self.Execute_Functional_Tests(device_id, Test_Set, test_result_output_path)
             return
         
+        Test_Set = self.compile_cases(Test_Set, suite_name)
         # show total tests once (always as RESULT)
         total_tests = len(Test_Set)
         self.logger.result(f"Starting {suite_name} suite with {total_tests} tests.")
         suite_wall_start = time.time()
         result_list = TestSuite([], suite_name)
+        if (len(test_result_output_path) == 0):
+            test_result_output_path = f"./test_result/{suite_name}.json"
+        self._open_journal(suite_name, test_result_output_path)
         try:
             # enumerate to print progress before each test
             for idx, test in enumerate(Test_Set, start=1):
-                try:
-                    topic, _body, _func, _expected, title, _is_negative, _ver = self.unpack_test_case(test)
-                    if topic and title:
-                        self.logger.result(f"{suite_name} progress {idx}/{total_tests}: {title} on topic '{topic}'.")
-                    else:
-                        self.logger.result(f"{suite_name} progress {idx}/{total_tests}: (test case not resolved).")
-                except Exception:
+                if test.valid and self._already_recorded(test.test_id):
+                    continue
+                if test.valid:
+                    self.logger.result(f"{suite_name} progress {idx}/{total_tests}: {test.title} on topic '{test.topic}'.")
+                else:
                     self.logger.result(f"{suite_name} progress {idx}/{total_tests}: (test case not resolved).")
 
+                test_wall_start = time.time()
                 r = self.Execute(device_id, test)
                 if r:
                     result_list.test_result_list.append(r)
+                    self._journal_result(r)
+                    self.durations.observe(r.test_id, int((time.time() - test_wall_start) * 1000))
         except PreflightTermination:
             self.logger.warn("The run was terminated during the preflight stage. Writing partial results and stopping.")
 
-        if (len(test_result_output_path) == 0):
-            test_result_output_path = f"./test_result/{suite_name}.json"
+        self.durations.save()
+
+        result_list.test_result_list = self._assemble_results(result_list.test_result_list)
         device_info = self.get_device_info(device_id)
         total_wall_ms = int((time.time() - suite_wall_start) * 1000)
         self.write_test_result_json(suite_name, result_list.test_result_list, test_result_output_path, device_info = device_info, total_wall_ms=total_wall_ms)
@@ -905,25 +946,71 @@ class DabTester:
             return
         suite_wall_start = time.time()
         result_list = TestSuite([], suite_name)
+        if len(test_result_output_path) == 0:
+            test_result_output_path = f"./test_result/{suite_name}_single.json"
+        self._open_journal(suite_name, test_result_output_path)
+        cases = test_case_or_cases if isinstance(test_case_or_cases, list) else [test_case_or_cases]
+        cases = self.compile_cases(cases, suite_name)
         try:
-            if isinstance(test_case_or_cases, list):
-                for test_case in test_case_or_cases:
-                    result = self.Execute(device_id, test_case)
-                    if result:
-                        result_list.test_result_list.append(result)
-            else:
-                result = self.Execute(device_id, test_case_or_cases)
+            for test_case in cases:
+                if test_case.valid and self._already_recorded(test_case.test_id):
+                    continue
+                test_wall_start = time.time()
+                result = self.Execute(device_id, test_case)
                 if result:
                     result_list.test_result_list.append(result)
+                    self._journal_result(result)
+                    self.durations.observe(result.test_id, int((time.time() - test_wall_start) * 1000))
         except PreflightTermination:
             self.logger.warn("The run was terminated during the preflight stage. Writing partial results and stopping.")
 
-        if len(test_result_output_path) == 0:
-            test_result_output_path = f"./test_result/{suite_name}_single.json"
+        self.durations.save()
+
+        result_list.test_result_list = self._assemble_results(result_list.test_result_list)
         device_info = self.get_device_info(device_id)
         total_wall_ms = int((time.time() - suite_wall_start) * 1000)
         self.write_test_result_json(suite_name, result_list.test_result_list, test_result_output_path, device_info = device_info, total_wall_ms=total_wall_ms)
 
+    # -----------------------------
+    # Results journal (crash-safe, resumable)
+    # -----------------------------
+    def _open_journal(self, suite_name, output_path):
+        self._close_journal()
+        try:
+            self.results_journal = ResultsJournal(journal_path_for(output_path), suite_name,
+                                                  run_id=self.run_id, resume=self.resume, results_path=output_path)
+            self.logger.info(f"Journaling results of run '{self.results_journal.run_id}' to {self.results_journal.path}.")
+        except OSError as e:
+            self.results_journal = None
+            self.logger.warn(f"Could not open the results journal for '{output_path}'. Results are kept in memory only. Reason: {e}")
+
+    def _close_journal(self):
+        if self.results_journal is not None:
+            self.results_journal.close()
+            self.results_journal = None
+
+    def _journal_result(self, result):
+        if self.results_journal is not None:
+            self.results_journal.append(result)
+
+    def _already_recorded(self, test_id):
+        if self.results_journal is not None and self.results_journal.is_completed(test_id):
+            self.logger.info(f"Skipping '{test_id}': already recorded for run '{self.results_journal.run_id}'.")
+            return True
+        return False
+
+    def _assemble_results(self, session_results):
+        """Final result list for the JSON writer: the journal for this run plus unjournaled session results."""
+        if self.results_journal is None:
+            return session_results
+        try:
+            return self.results_journal.assemble(session_results)
+        except Exception as e:
+            self.logger.warn(f"Could not assemble results from the journal; writing this session's results only. Reason: {e}")
+            return session_results
+        finally:
+            self._close_journal()
+
     # -----------------------------
     # JSON writer & utilities
     # -----------------------------
@@ -938,6 +1025,7 @@ class DabTester:
             This function computes a result summary, validates the result content,
             and writes a detailed structured JSON with summary and test details.
         """
+        LOGGER.flush()
         if not output_path:
             output_path = f"./test_result/{suite_name}.json"
         os.environ["DAB_RESULTS_JSON"] = os.path.abspath(output_path)
@@ -945,6 +1033,9 @@ class DabTester:
         def _outcome_of(r):
             return getattr(r, "test_result", None) or getattr(r, "outcome", None) or ""
 
+        # Response views of non-verbose runs are rendered now, from the stored responses
+        expand_response_views(result_list)
+
         # Keep only well-formed TestResult objects
         valid_results = []
         for r in result_list:
@@ -1029,7 +1120,9 @@ class DabTester:
 
         # Counts must match what we write
         total = len(valid_results)
-        passed = sum(1 for t in valid_results if _outcome_of(t) == "PASS")
+        # PASS with deferred questions still unanswered is provisional (see util/review_queue.py)
+        pending = sum(1 for t in valid_results if _outcome_of(t) == "PASS" and getattr(t, "review_pending", None))
+        passed = sum(1 for t in valid_results if _outcome_of(t) == "PASS") - pending
         failed = sum(1 for t in valid_results if _outcome_of(t) == "FAILED")
         optional_failed = sum(1 for t in valid_results if _outcome_of(t) == "OPTIONAL_FAILED")
         skipped = sum(1 for t in valid_results if _outcome_of(t) == "SKIPPED")
@@ -1044,11 +1137,16 @@ class DabTester:
                 "tests_failed": failed,
                 "tests_optional_failed": optional_failed,
                 "tests_skipped": skipped,
-                "overall_passed": (failed == 0 and skipped == 0)
+                "tests_pending_review": pending,
+                "overall_passed": (failed == 0 and skipped == 0 and pending == 0)
             },
+            "phase_summary_ms": summarize_phases(valid_results),
             "test_result_list": valid_results
         }
-        overall_ok = (failed == 0 and skipped == 0)
+        if self.durations.sharded:
+            # durations.json is only updated by --merge-shards, so every shard splits from the same numbers
+            result_data["shard_durations_ms"] = self.durations.observed({getattr(r, "test_id", None) for r in valid_results})
+        overall_ok = (failed == 0 and skipped == 0 and pending == 0)
         self.logger.result("══════════════════════════════════════════════════════════════════════════════")
         if total_wall_ms is not None:
             try:
@@ -1064,7 +1162,14 @@ class DabTester:
         self.logger.result(f"  FAIL          : {failed}")
         self.logger.result(f"  OPTIONAL_FAIL : {optional_failed}")
         self.logger.result(f"  SKIPPED       : {skipped}")
+        if pending:
+            self.logger.result(f"  PENDING REVIEW: {pending} (provisional PASS; answer with --review)")
         self.logger.result(f"Overall Passed  : {'YES' if overall_ok else 'NO'}")
+        phase_lines = format_table(result_data["phase_summary_ms"])
+        if phase_lines:
+            self.logger.result("Phase Breakdown (all tests)")
+            for line in phase_lines:
+                self.logger.result(line)
         self.logger.result("══════════════════════════════════════════════════════════════════════════════")
         try:
             with open(output_path, "w", encoding="utf-8") as f:
@@ -1078,66 +1183,18 @@ class DabTester:
             self.logger.error(f"Could not write the results JSON to '{output_path}'. Reason: {e}")
             return ""
 
+    def compile_cases(self, test_cases, suite_name=""):
+        """Compile suite tuples into TestCase objects (already compiled cases are reused as they are)."""
+        return compile_suite(test_cases, self.valid_dab_topics, suite_name)
+
     def unpack_test_case(self, test_case):
-        def fail(reason):
-            self.logger.warn(f"Invalid test case: {reason}. This case will be skipped. Case: {test_case}")
+        """Legacy 7-tuple view of a test case: (topic, body, func, expected, title, is_negative, version)."""
+        case = compile_case(test_case, self.valid_dab_topics)
+        if not case.valid:
+            self.logger.warn(f"Invalid test case: {case.error}. This case will be skipped. Case: {case.source}")
             return (None,) * 7  # Expected structure length
-
-        if isinstance(test_case, tuple) and len(test_case) >= 3:
-            if test_case[1] == "functional" and callable(test_case[2]):
-                # Functional test detected
-                topic = test_case[0]
-                body_str = "{}"  # No fixed payload required
-                func = test_case[2]
-                title = test_case[3] if len(test_case) > 3 else "FunctionalTest"
-                test_version = str(test_case[4]) if len(test_case) > 4 else "2.0"
-                is_negative = bool(test_case[5]) if len(test_case) > 5 else False
-                expected = 0  # Expected not used but kept for tuple shape
-
-                return topic, body_str, func, expected, title, is_negative, test_version
-
-        # Validate input type
-        if not isinstance(test_case, tuple):
-            return fail("Test case is not a tuple")
-
-        if len(test_case) not in (5, 6, 7):
-            return fail(f"Expected 5, 6, or 7 elements, got {len(test_case)}")
-
-        try:
-            # Unpack mandatory components
-            topic, body_str, func, expected, title = test_case[:5]
-
-            # Defaults
-            test_version = "2.0"
-            is_negative = False
-
-            # logic: test_version is always the 6th, is_negative is 7th
-            if len(test_case) >= 6:
-                test_version = str(test_case[5])
-            if len(test_case) == 7:
-                is_negative = bool(test_case[6])
-
-            # NOTE: Do NOT evaluate lambdas here — keep body_str as-is (callable allowed)
-            if body_str is not None and not (isinstance(body_str, (str, dict, list)) or callable(body_str)):
-                return fail("Body must be a string, dict/list, callable, or None")
-            if not isinstance(topic, str) or not topic.strip():
-                return fail("Invalid or empty topic")
-            if topic not in self.valid_dab_topics:
-                return fail(f"Unknown or unsupported DAB topic: {topic}")
-            # Validate function
-            if not callable(func):
-                return fail("Validator function is not callable")
-            # Validate expected response
-            if not ((isinstance(expected, int) and expected >= 0) or (isinstance(expected, str) and expected.strip())):
-                return fail("Expected must be a non-negative int or non-empty string")
-            # Validate test title
-            if not isinstance(title, str) or not title.strip():
-                return fail("Invalid or empty title")
-
-            return topic, body_str, func, expected, title, is_negative, test_version
-
-        except Exception as e:
-            return fail(f"Unexpected error: {str(e)}")
+        body = "{}" if case.functional else case.body
+        return case.topic, body, case.func, case.expected, case.title, case.is_negative, case.version
 
     def detect_dab_version(self, device_id):
         """
@@ -1152,11 +1209,11 @@ class DabTester:
             self.logger.info(f"Using the forced DAB version override: {self.dab_version}.")
             return
         try:
-            self.dab_client.request(device_id, "version", "{}")
+            self.execute_cmd(device_id, "version", "{}")
             response = self.dab_client.response()
 
             if response:
-                resp_json = json.loads(response)
+                resp_json = response_json(response)
                 self.dab_version = resp_json.get("DAB Version", "2.0")
                 DAB_VERSION = self.dab_version
                 self.logger.info(f"DAB version detected: {self.dab_version}.")
@@ -1170,10 +1227,10 @@ class DabTester:
 
     def get_device_info(self, device_id):
         try:
-            self.dab_client.request(device_id, "device/info", "{}")
+            self.execute_cmd(device_id, "device/info", "{}")
             response = self.dab_client.response()
             if response:
-                device_info = json.loads(response)
+                device_info = response_json(response)
 
                 # Extract only the required fields
                 filtered_info = {
@@ -1267,21 +1324,60 @@ class DabTester:
             sys_exit(4)
         return False
     
-    def return_to_home_after_test(self, device_id, logs=None, delay=0.5):
+    def return_to_home_after_test(self, device_id, logs=None, delay=0.5, confirm_timeout=3.0, force=False):
         """
         Best-effort: send KEY_HOME once so the next test starts from Home.
+        Skipped when the UI state tracker saw no request that could leave Home, unless `force`
+        (functional tests and manual checks can change the screen without a request the tracker sees).
+        After KEY_HOME, apps launched since the last reset are polled with
+        applications/get-state until none is FOREGROUND (fixed `delay` sleep as fallback).
         Swallows errors; adds a short log line if provided.
         """
+        tracker = self.ui_state if self.ui_state.enabled else None
         try:
+            if tracker is not None and not force and not tracker.is_dirty(device_id):
+                if logs is not None:
+                    logs.append("[INFO] Post-test: UI untouched since last Home; reset skipped.")
+                return
+            launched = tracker.launched_apps(device_id) if tracker is not None else []
+
             self.execute_cmd(device_id, "input/key-press", json.dumps({"keyCode": "KEY_HOME"}))
             _ = self.dab_client.response()  # drain response if any
-            time.sleep(delay)
             if logs is not None:
                 logs.append("[INFO] Post-test: sent KEY_HOME.")
+
+            if not launched or not EnforcementManager(device_id).is_operation_supported("applications/get-state"):
+                time.sleep(delay)
+                return
+            if not self._wait_apps_left_foreground(device_id, launched, confirm_timeout):
+                self.logger.warn(f"Post-test: {launched} still reported FOREGROUND {confirm_timeout}s after KEY_HOME.")
+                if tracker is not None:
+                    tracker.mark_dirty(device_id)
         except Exception:
             if logs is not None:
                 logs.append("[WARN] Post-test KEY_HOME failed (ignored).")
 
+    def _wait_apps_left_foreground(self, device_id, app_ids, timeout, interval=0.25):
+        """Poll applications/get-state until none of `app_ids` is FOREGROUND; False on timeout."""
+        pending = list(app_ids)
+        deadline = time.monotonic() + timeout
+        while True:
+            still = []
+            for app_id in pending:
+                self.execute_cmd(device_id, "applications/get-state", json.dumps({"appId": app_id}), fresh=True)
+                try:
+                    state = str(response_json(self.dab_client.response() or "{}").get("state", "")).upper()
+                except Exception:
+                    state = ""
+                if state == "FOREGROUND":
+                    still.append(app_id)
+            if not still:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            pending = still
+            time.sleep(interval)
+
     def Close(self):
         self.dab_client.disconnect()
 
@@ -1300,21 +1396,23 @@ def get_test_tool_version():
     except FileNotFoundError:
         return "dev.000000"
 
+# Timestamp + optional [LEVEL] tag at the start of the line
+_LOG_TS_RE = re.compile(
+    r'^\s*'                                   # leading spaces
+    r'(?:\d{4}-\d{2}-\d{2}[ T]'               # date + space or T
+    r'\d{2}:\d{2}:\d{2}(?:\.\d+)?\s*)?'       # time(.ms) (optional)
+    r'(?:\[[A-Z]+\]\s*)?'                     # optional [LEVEL] tag
+)
+# ANSI escape sequences (e.g., \x1b[36m) — shown as \u001b in JSON
+_LOG_ANSI_RE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+
 def log(test_result, str_print):
     """
     Print to console (with color), but store a cleaned line in result.logs:
     - Strip any leading timestamp and [LEVEL] tag
     - Remove ANSI escape sequences (so no \\u001b... in JSON)
+    The console line is only queued (LOGGER writes it from its own thread); result.logs is updated right away.
     """
-    # Timestamp + optional [LEVEL] tag at the start of the line
-    ts_re = re.compile(
-        r'^\s*'                                   # leading spaces
-        r'(?:\d{4}-\d{2}-\d{2}[ T]'               # date + space or T
-        r'\d{2}:\d{2}:\d{2}(?:\.\d+)?\s*)?'       # time(.ms) (optional)
-        r'(?:\[[A-Z]+\]\s*)?'                     # optional [LEVEL] tag
-    )
-    # ANSI escape sequences (e.g., \x1b[36m) — shown as \u001b in JSON
-    ansi_re = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
     s = str(str_print).replace("\r\n", "\n")
     for raw in s.split("\n"):
         line = raw.strip()
@@ -1324,14 +1422,21 @@ def log(test_result, str_print):
         LOGGER.result(line)
         # JSON: strip timestamp/level + ANSI codes
         try:
-            clean = ts_re.sub("", line)
-            clean = ansi_re.sub("", clean)
+            clean = _LOG_TS_RE.sub("", line)
+            if "\x1b" in clean:
+                clean = _LOG_ANSI_RE.sub("", clean)
             clean = clean.strip()
         except Exception:
             clean = line
         test_result.logs.append(clean)
 
-def YesNoQuestion(test_result, question=""):
+def YesNoQuestion(test_result, question="", image=None):
+    # Answered by the configured verdict providers (util/verdict_providers.py); the console prompt is one of them.
+    # `image` is PNG bytes the question is about, so the screenshot provider does not capture another one.
+    return ask_yes_no(question, test_result, emit=lambda line: log(test_result, line),
+                      console=lambda: _console_yes_no(test_result, question), image=image)
+
+def _console_yes_no(test_result, question=""):
     positive = ['yes', 'y']
     negative = ['no', 'n']
 
@@ -1347,6 +1452,7 @@ def YesNoQuestion(test_result, question=""):
         colored_prompt = f"{CYAN}{question}{RESET} ({GREEN}Y{RESET}/{RED}N{RESET})"
         # ensure prompt appears on a new line even if the previous print used end=''
         log(test_result, colored_prompt)
+        LOGGER.flush()
         user_input = readchar()
         lower = user_input.lower()
         if lower in positive:
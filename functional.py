@@ -4,7 +4,6 @@ import config
 import json
 import time
 import sys
-from readchar import readchar
 from util.enforcement_manager import EnforcementManager
 from util.config_loader import ensure_app_available_anyext
 from util.config_loader import ensure_app_available
@@ -13,7 +12,11 @@ from paho.mqtt.properties import Properties
 from paho.mqtt.packettypes import PacketTypes
 from dab_checker import DabChecker
 from util.enforcement_manager import ValidateCode
+from util.session_fixtures import fixtures, APP_FOREGROUND
+from util.reboot_batch import reboot_phases, restart_and_wait_healthy, run_reboot_check
+from functionals.functional_helpers import yes_or_no, select_input, wait_for_yes
 from logger import LOGGER
+from util.dab_response import response_json
 import functionals.brightness
 import functionals.contrast
 import functionals.content_recommendations
@@ -179,12 +182,9 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
     Returns:
         (status_code: int, resp_json: str)
     """
-    em = EnforcementManager()
-    supported_ops_raw = em.get_supported_operations() or []
-    supported_ops = {op.get("operation") if isinstance(op, dict) else op
-                     for op in supported_ops_raw}
+    em = EnforcementManager(device_id)
 
-    if topic not in supported_ops and topic != "operations/list":
+    if not em.has_operation(topic) and topic != "operations/list":
         line = f"[OPTIONAL_FAILED] Operation '{topic}' is not supported by the device (checked from cache)."
         LOGGER.warn(line)
         if logs is not None: logs.append(line)
@@ -201,7 +201,7 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
             pass
 
     LOGGER.info(f"Executing {topic} with payload {payload}")
-    rc = tester.execute_cmd(device_id, topic, payload)
+    rc = tester.execute_cmd(device_id, topic, payload, fresh=True)
     resp = tester.dab_client.response()  # may be str, dict, list, None
 
     # Normalize response to JSON string
@@ -233,7 +233,7 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
 def dab_status_from(resp, rc):
     try:
         if isinstance(resp, str):    # JSON string
-            return json.loads(resp).get("status", rc)
+            return response_json(resp).get("status", rc)
         if isinstance(resp, dict):   # dict
             return resp.get("status", rc)
     except Exception:
@@ -243,7 +243,7 @@ def dab_status_from(resp, rc):
 def print_response(response, topic_for_color=None, indent=10):
     if isinstance(response, str):
         try:
-            response = json.loads(response)
+            response = response_json(response)
         except json.JSONDecodeError:
             LOGGER.error("Invalid JSON string")
             return
@@ -255,60 +255,9 @@ def print_response(response, topic_for_color=None, indent=10):
         LOGGER.info(f"{' ' * indent}{key}: {value}")
 
 
-def yes_or_no(result, logs, question=""):
-    positive = ['YES', 'Y']
-    negative = ['NO', 'N']
-    while True:
-        prompt = f"{question}(Y/N)"
-        LOGGER.prompt(prompt)
-        if logs is not None:
-            logs.append(prompt)
-        ch = readchar().upper()
-        echo = f"[{ch}]"
-        LOGGER.result(echo)
-        if logs is not None:
-            logs.append(echo)
-        if ch in positive:
-            return True
-        if ch in negative:
-            return False
-
-
-def select_input(result, logs, arr):
-    # Show options
-    line0 = "*0: There is no option that meet the requirement."
-    LOGGER.info(line0)
-    if logs is not None: logs.append(line0)
-
-    for idx, value in enumerate(arr, start=1):
-        line = f"*{idx}: {value}"
-        LOGGER.info(line)
-        if logs is not None: logs.append(line)
-
-    # Prompt loop
-    max_idx = len(arr)
-    while True:
-        prompt = f"Please input number (0–{max_idx}):"
-        LOGGER.prompt(prompt)
-        if logs is not None: logs.append(prompt)
-
-        ch = readchar()
-        echo = f"[{ch}]"
-        LOGGER.result(echo)
-        if logs is not None: logs.append(echo)
-
-        if ch.isdigit():
-            choice = int(ch)
-            if 0 <= choice <= max_idx:
-                return choice
-
-        warn = f"[WARN] Invalid choice '{ch}'. Enter 0–{max_idx}."
-        LOGGER.warn(warn)
-        if logs is not None: logs.append(warn)
- 
-
 def countdown(title, count):
     LOGGER.info(f"{title} — starting {count}s")
+    LOGGER.flush()  # the \r countdown below writes to stdout directly
     try:
         while count:
             mins, secs = divmod(count, 60)
@@ -323,11 +272,7 @@ def countdown(title, count):
 
 
 def waiting_for_screensaver(result, logs, screenSaverTimeout, tips):
-    while True:
-        if yes_or_no(result, logs, tips):
-            break
-        else:
-            continue
+    wait_for_yes(result, logs, tips)
     countdown(f"Waiting for {screenSaverTimeout} seconds in idle state.", screenSaverTimeout)
 
 def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs):
@@ -341,7 +286,7 @@ def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs
         return False, result
 
     try:
-        response = json.loads(dab_response)
+        response = response_json(dab_response)
     except Exception:
         line = f"[FAIL] Request {dab_topic} '{dab_payload}' returned invalid JSON."
         LOGGER.error(line)
@@ -371,7 +316,7 @@ def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs
 
 def verify_system_setting(tester, payload, response, result, logs):
     (key, value), = json.loads(payload).items()
-    settings = json.loads(response)
+    settings = response_json(response)
     if key in settings:
         actual_value = settings.get(key)
         line = f"System settings get '{key}', Expected: {value}, Actual: {actual_value}"
@@ -404,7 +349,7 @@ def get_supported_setting(tester, device_id, key, result, logs):
         return None, result
 
     # At this point, the setting is confirmed to be supported. Retrieve from cache.
-    em = EnforcementManager()
+    em = EnforcementManager(device_id)
     settings = em.get_supported_settings()
     settings_map = settings.get("settings", settings) if isinstance(settings, dict) else {}
 
@@ -503,6 +448,23 @@ def fire_and_forget_restart(dab_client, device_id):
     dab_client._DabClient__client.publish(topic, "{}", qos=0, properties=props)
     LOGGER.info(f"Sent restart command to {topic} (fire-and-forget)")
 
+
+def restart_and_confirm(ctx):
+    """Restart phase of a reboot check: system/restart, then wait for the operator to confirm the device is back."""
+    ctx.log("[STEP] Rebooting the device now.")
+    execute_cmd_and_log(ctx.tester, ctx.device_id, "system/restart", "{}", ctx.logs, ctx.result)
+    ctx.log("[STEP] Waiting for manual confirmation that the device has restarted.")
+    wait_for_yes(ctx.result, ctx.logs, "Has the device finished rebooting and is now idle?", retry_delay=5)
+    return True
+
+
+def restart_until_healthy(ctx):
+    """Restart phase of a reboot check: system/restart, then poll health-check/get until the device is healthy."""
+    if restart_and_wait_healthy(ctx.tester, ctx.device_id, ctx.logs, timeout=DEVICE_REBOOT_WAIT):
+        return True
+    ctx.finish("FAILED", f"Device did not become healthy within {DEVICE_REBOOT_WAIT}s after reboot.")
+    return False
+
 # Priority non-English locales (TV-heavy markets) for voice/send-audio multi-language test
 VOICE_PRIORITY_LOCALES = [
     "es-419",  # Latin American Spanish
@@ -593,7 +555,7 @@ def run_app_foreground_check(dab_topic, test_name, tester, device_id):
 
         # Parse and evaluate
         try:
-            state = (json.loads(response).get("state", "") if response else "").upper()
+            state = (response_json(response).get("state", "") if response else "").upper()
             line = f"[INFO] Parsed app state='{state}'."
             LOGGER.info(line); logs.append(line)
         except Exception:
@@ -632,6 +594,7 @@ def run_app_foreground_check(dab_topic, test_name, tester, device_id):
         return result
 
 # === Test 2: App in BACKGROUND Validate app moves to BACKGROUND after pressing Home ===
+@fixtures((APP_FOREGROUND, "youtube"))
 def run_app_background_check(dab_topic, test_name, tester, device_id):
     """
     Checks if an app correctly moves to the background after the Home key is pressed.
@@ -659,20 +622,11 @@ def run_app_background_check(dab_topic, test_name, tester, device_id):
         if not require_capabilities(tester, device_id, required_ops, result, logs):
             return result # 'require_capabilities' function already set the result and logged
 
-        # Step 1 — Launch the application
-        payload_launch = json.dumps({"appId": app_id})
-        line = f"[STEP] Launching app via applications/launch with payload: {payload_launch}"
+        # Step 1 — Bring the application to the foreground (reused if already there)
+        line = f"[STEP] Ensuring '{app_id}' is in FOREGROUND (launch only if needed)."
         LOGGER.result(line)
         logs.append(line)
-        execute_cmd_and_log(
-            tester, device_id, "applications/launch", payload_launch, logs, result
-        )
-
-        # Wait for the application to stabilize in the foreground
-        line = f"[WAIT] Allowing {APP_LAUNCH_WAIT}s for the app to launch and settle."
-        LOGGER.info(line)
-        logs.append(line)
-        time.sleep(APP_LAUNCH_WAIT)
+        tester.fixtures.ensure_app_foreground(device_id, app_id, logs, wait=APP_LAUNCH_WAIT)
 
         # Step 2 — Press the HOME key to send the app to the background
         payload_home = json.dumps({"keyCode": "KEY_HOME"})
@@ -707,7 +661,7 @@ def run_app_background_check(dab_topic, test_name, tester, device_id):
 
         # Parse the state from the response and validate the result
         try:
-            state = (json.loads(response).get("state", "") if response else "").upper()
+            state = (response_json(response).get("state", "") if response else "").upper()
             line = f"[INFO] Parsed app state='{state}'."
             LOGGER.info(line)
             logs.append(line)
@@ -749,6 +703,7 @@ def run_app_background_check(dab_topic, test_name, tester, device_id):
     return result
 
 # === Test 3: App STOPPED Validate app state is STOPPED after exit. ===
+@fixtures((APP_FOREGROUND, "youtube"))
 def run_app_stopped_check(dab_topic, test_name, tester, device_id):
     """
     Checks if an app correctly moves to the STOPPED state after being exited.
@@ -776,20 +731,11 @@ def run_app_stopped_check(dab_topic, test_name, tester, device_id):
         if not require_capabilities(tester, device_id, required_ops, result, logs):
             return result  # 'require_capabilities' function already set the result and logged
 
-        # Step 1 — Launch the application
-        payload_launch = json.dumps({"appId": app_id})
-        line = f"[STEP] Launching app via applications/launch with payload: {payload_launch}"
+        # Step 1 — Bring the application to the foreground (reused if already there)
+        line = f"[STEP] Ensuring '{app_id}' is in FOREGROUND (launch only if needed)."
         LOGGER.result(line)
         logs.append(line)
-        execute_cmd_and_log(
-            tester, device_id, "applications/launch", payload_launch, logs, result
-        )
-
-        # Wait for the application to stabilize
-        line = f"[WAIT] Allowing {APP_LAUNCH_WAIT}s for the app to launch and settle."
-        LOGGER.info(line)
-        logs.append(line)
-        time.sleep(APP_LAUNCH_WAIT)
+        tester.fixtures.ensure_app_foreground(device_id, app_id, logs, wait=APP_LAUNCH_WAIT)
 
         # Step 2 — Exit the application
         payload_exit = json.dumps({"appId": app_id})
@@ -822,7 +768,7 @@ def run_app_stopped_check(dab_topic, test_name, tester, device_id):
 
         # Parse the state from the response and validate the result
         try:
-            state = (json.loads(response).get("state", "") if response else "").upper()
+            state = (response_json(response).get("state", "") if response else "").upper()
             line = f"[INFO] Parsed app state='{state}'."
             LOGGER.info(line)
             logs.append(line)
@@ -1005,7 +951,7 @@ def run_exit_after_video_check(dab_topic, test_name, tester, device_id):
         
         # Parse and validate the final state
         try:
-            state = (json.loads(response).get("state", "") if response else "UNKNOWN").upper()
+            state = (response_json(response).get("state", "") if response else "UNKNOWN").upper()
             line = f"[INFO] Parsed app state='{state}'."
             LOGGER.info(line)
             logs.append(line)
@@ -1198,7 +1144,7 @@ def run_screensaver_enable_check(dab_topic, test_name, tester, device_id):
         _, response = execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
 
         try:
-            settings = json.loads(response) if response else {}
+            settings = response_json(response) if response else {}
             final_state = settings.get("screenSaver")
             line = f"[INFO] Verified screensaver state is: {final_state}"
             LOGGER.info(line)
@@ -1301,7 +1247,7 @@ def run_screensaver_disable_check(dab_topic, test_name, tester, device_id):
         _, response = execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
 
         try:
-            settings = json.loads(response) if response else {}
+            settings = response_json(response) if response else {}
             final_state = settings.get("screenSaver")
             line = f"[INFO] Verified screensaver state is: {final_state}"
             LOGGER.info(line)
@@ -1790,9 +1736,7 @@ def run_screensaver_inactive_after_reboot_check(dab_topic, test_name, tester, de
         line = "[STEP] Waiting for manual confirmation that the device has restarted."
         LOGGER.result(line)
         logs.append(line)
-        while not yes_or_no(result, logs, "Has the device finished rebooting and is now idle?"):
-            logs.append("Waiting for 'Y' confirmation.")
-            time.sleep(5) # Add a small delay between prompts
+        wait_for_yes(result, logs, "Has the device finished rebooting and is now idle?", retry_delay=5)
 
         # Step 5: Wait for the idle timeout to pass
         line = f"[STEP] Do not interact with the device. Waiting {SCREENSAVER_TIMEOUT_WAIT} seconds."
@@ -1924,138 +1868,79 @@ def run_screensavertimeout_300_check(dab_topic, test_name, tester, device_id):
     return result
 
 # === Test 15: Screensaver Timeout Reboot Check ===
-def run_screensavertimeout_reboot_check(dab_topic, test_name, tester, device_id):
-    """
-    Validates that the screensaver timeout setting persists after a device reboot. This is a manual test.
-    """
-    test_id = to_test_id(f"{dab_topic}/{test_name}")
-    logs = []
-    result = TestResult(test_id, device_id, "system/settings/set", "{}", "UNKNOWN", "", logs)
-    setting_persisted = "N/A"
-    user_validated_active = "N/A"
-
-    try:
-        # Header and description
-        for line in (
-            f"[TEST] Screensaver Timeout Reboot Check (Manual) — {test_name} (test_id={test_id}, device={device_id})",
-            "[DESC] Goal: Set a screensaver timeout, reboot, verify the setting persists, and then confirm it activates.",
-            "[DESC] Required operations: system/settings/set, system/settings/get, system/restart.",
-            "[DESC] Pass criteria: The setting must persist after reboot, and the user must confirm the screensaver activates.",
-        ):
-            LOGGER.result(line)
-            logs.append(line)
 
-        # Capability gate
-        if not require_capabilities(tester, device_id,
-                    "ops: system/settings/set, system/settings/get, system/restart | settings: screenSaver, screenSaverTimeout, screenSaverMinTimeout",
-                    result, logs):
-            return result
-        
-        # Check if min timeout is acceptable for manual testing
-        if not check_min_screensaver_timeout(tester, device_id, result, logs):
-            return result
-
-        # Step 1: Set the screensaver timeout before rebooting
-        payload_timeout = json.dumps({"screenSaverTimeout": SCREENSAVER_TIMEOUT_WAIT})
-        line = f"[STEP] Setting screensaver timeout to {SCREENSAVER_TIMEOUT_WAIT}s with payload: {payload_timeout}"
-        LOGGER.result(line)
-        logs.append(line)
-        rc, response = execute_cmd_and_log(tester, device_id, "system/settings/set", payload_timeout, logs, result)
-        if dab_status_from(response, rc) != 200:
-            result.test_result = "FAILED"
-            line = "[RESULT] FAILED — Could not set the screensaver timeout as a precondition."
-            LOGGER.result(line)
-            logs.append(line)
-            return result
+def _screensavertimeout_before(ctx):
+    for line in (
+        f"[TEST] Screensaver Timeout Reboot Check (Manual) — {ctx.test_name} (test_id={ctx.test_id}, device={ctx.device_id})",
+        "[DESC] Goal: Set a screensaver timeout, reboot, verify the setting persists, and then confirm it activates.",
+        "[DESC] Required operations: system/settings/set, system/settings/get, system/restart.",
+        "[DESC] Pass criteria: The setting must persist after reboot, and the user must confirm the screensaver activates.",
+    ):
+        ctx.log(line)
+    ctx.summary.update(setting_persisted="N/A", user_saw_screensaver="N/A")
 
-        # Step 2: Reboot the device
-        line = "[STEP] Rebooting the device now."
-        LOGGER.result(line)
-        logs.append(line)
-        execute_cmd_and_log(tester, device_id, "system/restart", "{}", logs, result)
+    # Capability gate
+    if not require_capabilities(ctx.tester, ctx.device_id,
+                "ops: system/settings/set, system/settings/get, system/restart | settings: screenSaver, screenSaverTimeout, screenSaverMinTimeout",
+                ctx.result, ctx.logs):
+        return False
 
-        # Step 3: Manually confirm reboot completion
-        line = "[STEP] Waiting for manual confirmation that the device has restarted."
-        LOGGER.result(line)
-        logs.append(line)
-        while not yes_or_no(result, logs, "Has the device finished rebooting and is now idle?"):
-            logs.append("Waiting for 'Y' confirmation.")
-            time.sleep(5)
+    # Check if min timeout is acceptable for manual testing
+    if not check_min_screensaver_timeout(ctx.tester, ctx.device_id, ctx.result, ctx.logs):
+        return False
 
-        # Step 4: Verify the setting persisted across the reboot
-        line = "[STEP] Verifying the screensaver timeout setting persisted after reboot."
-        LOGGER.result(line)
-        logs.append(line)
-        _, response = execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
-        try:
-            settings = json.loads(response) if response else {}
-            persisted_timeout = settings.get("screenSaverTimeout")
-            setting_persisted = (persisted_timeout == SCREENSAVER_TIMEOUT_WAIT)
-            if not setting_persisted:
-                 result.test_result = "FAILED"
-                 line = f"[RESULT] FAILED — Setting did not persist. Expected {SCREENSAVER_TIMEOUT_WAIT}, but got {persisted_timeout}."
-                 LOGGER.result(line)
-                 logs.append(line)
-                 return result
-            line = f"[INFO] Setting successfully persisted. Value is {persisted_timeout}."
-            LOGGER.info(line)
-            logs.append(line)
-        except Exception as e:
-            result.test_result = "FAILED"
-            line = f"[RESULT] FAILED — Could not parse settings after reboot: {e}"
-            LOGGER.result(line)
-            logs.append(line)
-            return result
+    # Set the screensaver timeout before rebooting
+    payload_timeout = json.dumps({"screenSaverTimeout": SCREENSAVER_TIMEOUT_WAIT})
+    ctx.log(f"[STEP] Setting screensaver timeout to {SCREENSAVER_TIMEOUT_WAIT}s with payload: {payload_timeout}")
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/set", payload_timeout, ctx.logs, ctx.result)
+    if dab_status_from(response, rc) != 200:
+        ctx.finish("FAILED", "Could not set the screensaver timeout as a precondition.")
+        return False
+    return True
 
-        # Step 5: Enable the screensaver to test the persisted timeout
-        line = "[STEP] Enabling screensaver to test the timeout."
-        LOGGER.result(line)
-        logs.append(line)
-        rc, response = execute_cmd_and_log(tester, device_id, "system/settings/set", json.dumps({"screenSaver": True}), logs, result)
-        if dab_status_from(response, rc) != 200:
-            result.test_result = "FAILED"
-            line = "[RESULT] FAILED — Could not enable the screensaver."
-            LOGGER.result(line)
-            logs.append(line)
-            return result
 
-        # Step 6: Wait and manually verify activation
-        line = f"[STEP] Waiting {SCREENSAVER_TIMEOUT_WAIT} seconds for screensaver to activate."
-        LOGGER.result(line)
-        logs.append(line)
-        waiting_for_screensaver(result, logs, SCREENSAVER_TIMEOUT_WAIT, "Ready to begin the idle wait?")
+def _screensavertimeout_after(ctx):
+    # Verify the setting persisted across the reboot
+    ctx.log("[STEP] Verifying the screensaver timeout setting persisted after reboot.")
+    _, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/get", "{}", ctx.logs, ctx.result)
+    try:
+        settings = response_json(response) if response else {}
+        persisted_timeout = settings.get("screenSaverTimeout")
+    except Exception as e:
+        ctx.finish("FAILED", f"Could not parse settings after reboot: {e}")
+        return
+    ctx.summary["setting_persisted"] = (persisted_timeout == SCREENSAVER_TIMEOUT_WAIT)
+    if persisted_timeout != SCREENSAVER_TIMEOUT_WAIT:
+        ctx.finish("FAILED", f"Setting did not persist. Expected {SCREENSAVER_TIMEOUT_WAIT}, but got {persisted_timeout}.")
+        return
+    ctx.log(f"[INFO] Setting successfully persisted. Value is {persisted_timeout}.", "info")
 
-        user_validated_active = yes_or_no(result, logs, "Did the screensaver activate?")
-        if user_validated_active:
-            result.test_result = "PASS"
-            line = "[RESULT] PASS — User confirmed the screensaver activated using the persisted timeout."
-        else:
-            result.test_result = "FAILED"
-            line = "[RESULT] FAILED — User reported the screensaver did not activate."
+    # Enable the screensaver to test the persisted timeout
+    ctx.log("[STEP] Enabling screensaver to test the timeout.")
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/set", json.dumps({"screenSaver": True}), ctx.logs, ctx.result)
+    if dab_status_from(response, rc) != 200:
+        ctx.finish("FAILED", "Could not enable the screensaver.")
+        return
 
-        LOGGER.result(line)
-        logs.append(line)
+    # Wait and manually verify activation
+    ctx.log(f"[STEP] Waiting {SCREENSAVER_TIMEOUT_WAIT} seconds for screensaver to activate.")
+    waiting_for_screensaver(ctx.result, ctx.logs, SCREENSAVER_TIMEOUT_WAIT, "Ready to begin the idle wait?")
 
-    except UnsupportedOperationError as e:
-        result.test_result = "OPTIONAL_FAILED"
-        line = f"[RESULT] OPTIONAL_FAILED — Operation '{e.topic}' is not supported."
-        LOGGER.result(line)
-        logs.append(line)
+    user_validated_active = yes_or_no(ctx.result, ctx.logs, "Did the screensaver activate?")
+    ctx.summary["user_saw_screensaver"] = user_validated_active
+    if user_validated_active:
+        ctx.finish("PASS", "User confirmed the screensaver activated using the persisted timeout.")
+    else:
+        ctx.finish("FAILED", "User reported the screensaver did not activate.")
 
-    except Exception as e:
-        result.test_result = "SKIPPED"
-        line = f"[RESULT] SKIPPED — An unexpected error occurred: {e}"
-        LOGGER.result(line)
-        logs.append(line)
 
-    finally:
-        # Final summary log
-        line = (f"[SUMMARY] outcome={result.test_result}, setting_persisted={setting_persisted}, "
-                f"user_saw_screensaver={user_validated_active}, test_id={test_id}, device={device_id}")
-        LOGGER.result(line)
-        logs.append(line)
+@reboot_phases(_screensavertimeout_before, _screensavertimeout_after, restart_and_confirm, operation="system/settings/set")
+def run_screensavertimeout_reboot_check(dab_topic, test_name, tester, device_id):
+    """
+    Validates that the screensaver timeout setting persists after a device reboot. This is a manual test.
+    """
+    return run_reboot_check(run_screensavertimeout_reboot_check, dab_topic, test_name, tester, device_id)
 
-    return result
 
 # === Test 16: ScreenSaver Timeout Guest Mode Check ===
 def run_screensavertimeout_guest_mode_check(dab_topic, test_name, tester, device_id):
@@ -2278,100 +2163,61 @@ def run_screensavertimeout_minimum_check(dab_topic, test_name, tester, device_id
     return result
 
 # === Test 18: ScreenSaver Min Timeout Reboot Check ===
-def run_screensavermintimeout_reboot_check(dab_topic, test_name, tester, device_id):
-    """
-    Verifies that the minimum screensaver timeout value is not altered after a device restart.
-    """
-    test_id = to_test_id(f"{dab_topic}/{test_name}")
-    logs = []
-    result = TestResult(test_id, device_id, "system/settings/list", "{}", "UNKNOWN", "", logs)
-    min_timeout_before = "N/A"
-    min_timeout_after = "N/A"
-
-    try:
-        # Header and description
-        for line in (
-            f"[TEST] Screensaver Min Timeout After Reboot Check — {test_name} (test_id={test_id}, device={device_id})",
-            "[DESC] Goal: Get the minimum timeout, reboot, get it again, and verify the value is unchanged.",
-            "[DESC] Required operations: system/settings/list, system/restart.",
-            "[DESC] Pass criteria: The timeout value must be the same before and after the reboot.",
-        ):
-            LOGGER.result(line)
-            logs.append(line)
 
-        # Capability gate
-        if not require_capabilities(tester, device_id,
-                    "ops: system/settings/list, system/restart | settings: screenSaverMinTimeout",
-                    result, logs):
-            return result
-
-        # Step 1: Get the initial minimum timeout value
-        line = "[STEP] Getting the minimum screensaver timeout before reboot."
-        LOGGER.result(line)
-        logs.append(line)
-        min_timeout_before, result = get_supported_setting(tester, device_id, "screenSaverMinTimeout", result, logs)
-        if not min_timeout_before:
-            return result
-        line = f"[INFO] Value before reboot: {min_timeout_before}"
-        LOGGER.info(line)
-        logs.append(line)
-
-        # Step 2: Reboot the device
-        line = "[STEP] Rebooting the device now."
-        LOGGER.result(line)
-        logs.append(line)
-        execute_cmd_and_log(tester, device_id, "system/restart", "{}", logs)
+def _screensavermintimeout_before(ctx):
+    for line in (
+        f"[TEST] Screensaver Min Timeout After Reboot Check — {ctx.test_name} (test_id={ctx.test_id}, device={ctx.device_id})",
+        "[DESC] Goal: Get the minimum timeout, reboot, get it again, and verify the value is unchanged.",
+        "[DESC] Required operations: system/settings/list, system/restart.",
+        "[DESC] Pass criteria: The timeout value must be the same before and after the reboot.",
+    ):
+        ctx.log(line)
+    ctx.summary.update(timeout_before="N/A", timeout_after="N/A")
 
-        # Step 3: Manually confirm reboot completion
-        line = "[STEP] Waiting for manual confirmation that the device has restarted."
-        LOGGER.result(line)
-        logs.append(line)
-        while not yes_or_no(result, logs, "Has the device finished rebooting and is now idle?"):
-            logs.append("Waiting for 'Y' confirmation.")
-            time.sleep(5)
+    # Capability gate
+    if not require_capabilities(ctx.tester, ctx.device_id,
+                "ops: system/settings/list, system/restart | settings: screenSaverMinTimeout",
+                ctx.result, ctx.logs):
+        return False
 
-        # Step 4: Get the minimum timeout again after reboot
-        line = "[STEP] Getting the minimum screensaver timeout after reboot."
-        LOGGER.result(line)
-        logs.append(line)
-        min_timeout_after, result = get_supported_setting(tester, device_id, "screenSaverMinTimeout", result, logs)
-        if not min_timeout_after:
-            return result
-        line = f"[INFO] Value after reboot: {min_timeout_after}"
-        LOGGER.info(line)
-        logs.append(line)
+    # Get the initial minimum timeout value
+    ctx.log("[STEP] Getting the minimum screensaver timeout before reboot.")
+    min_timeout_before, _ = get_supported_setting(ctx.tester, ctx.device_id, "screenSaverMinTimeout", ctx.result, ctx.logs)
+    if not min_timeout_before:
+        return False
+    ctx.summary["timeout_before"] = min_timeout_before
+    ctx.log(f"[INFO] Value before reboot: {min_timeout_before}", "info")
+    return True
 
-        # Step 5: Compare the values
-        if min_timeout_before == min_timeout_after:
-            result.test_result = "PASS"
-            line = "[RESULT] PASS — The minimum timeout value was unchanged after reboot."
-        else:
-            result.test_result = "FAILED"
-            line = "[RESULT] FAILED — The minimum timeout value changed after reboot."
 
-        LOGGER.result(line)
-        logs.append(line)
+def _screensavermintimeout_after(ctx):
+    # The cached settings list is the one read before the reboot: read it again from the device
+    ctx.log("[STEP] Getting the minimum screensaver timeout after reboot.")
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/list", "{}", ctx.logs, ctx.result)
+    if dab_status_from(response, rc) != 200:
+        ctx.finish("FAILED", "system/settings/list failed after reboot.")
+        return
+    EnforcementManager(ctx.device_id).set_supported_settings(response_json(response))
+    min_timeout_after, _ = get_supported_setting(ctx.tester, ctx.device_id, "screenSaverMinTimeout", ctx.result, ctx.logs)
+    if not min_timeout_after:
+        return
+    ctx.summary["timeout_after"] = min_timeout_after
+    ctx.log(f"[INFO] Value after reboot: {min_timeout_after}", "info")
 
-    except UnsupportedOperationError as e:
-        result.test_result = "OPTIONAL_FAILED"
-        line = f"[RESULT] OPTIONAL_FAILED — Operation '{e.topic}' is not supported."
-        LOGGER.result(line)
-        logs.append(line)
+    # Compare the values
+    if ctx.summary["timeout_before"] == min_timeout_after:
+        ctx.finish("PASS", "The minimum timeout value was unchanged after reboot.")
+    else:
+        ctx.finish("FAILED", "The minimum timeout value changed after reboot.")
 
-    except Exception as e:
-        result.test_result = "SKIPPED"
-        line = f"[RESULT] SKIPPED — An unexpected error occurred: {e}"
-        LOGGER.result(line)
-        logs.append(line)
 
-    finally:
-        # Final summary log
-        line = (f"[SUMMARY] outcome={result.test_result}, timeout_before={min_timeout_before}, "
-                f"timeout_after={min_timeout_after}, test_id={test_id}, device={device_id}")
-        LOGGER.result(line)
-        logs.append(line)
+@reboot_phases(_screensavermintimeout_before, _screensavermintimeout_after, restart_and_confirm, operation="system/settings/list")
+def run_screensavermintimeout_reboot_check(dab_topic, test_name, tester, device_id):
+    """
+    Verifies that the minimum screensaver timeout value is not altered after a device restart.
+    """
+    return run_reboot_check(run_screensavermintimeout_reboot_check, dab_topic, test_name, tester, device_id)
 
-    return result
 
 # === Test 18: High Contrast Text Check Text Over Images ===
 def run_highContrastText_text_over_images_check(dab_topic, test_name, tester, device_id):
@@ -2825,7 +2671,7 @@ def run_stop_app_telemetry_without_active_session_check(dab_topic, test_name, te
         message = ""
         try:
             if response:
-                message = str(json.loads(response).get("error", "")).lower()
+                message = str(response_json(response).get("error", "")).lower()
         except Exception:
             pass # Ignore if response is not valid JSON
 
@@ -3005,7 +2851,7 @@ def run_voice_list_with_no_voice_assistant(dab_topic, test_name, tester, device_
         assistants = []
         try:
             if response:
-                assistants = json.loads(response).get("voiceAssistants", [])
+                assistants = response_json(response).get("voiceAssistants", [])
                 assistant_count = len(assistants)
         except Exception:
             logs.append(f"[INFO] Could not parse voice/list response: {response}")
@@ -3236,7 +3082,7 @@ def run_launch_app_while_restarting_check(dab_topic, test_name, tester, device_i
         # The response may be empty or an error, so dab_status_from is not always reliable here.
         # The key is whether the launch *succeeded* (status 200).
         try:
-            launch_status = json.loads(response).get("status") if response else "NO_RESPONSE"
+            launch_status = response_json(response).get("status") if response else "NO_RESPONSE"
         except Exception:
             launch_status = "INVALID_RESPONSE"
 
@@ -3504,117 +3350,57 @@ def run_personalized_ads_response_check(dab_topic, test_name, tester, device_id)
 
     return result
 
-def run_personalized_ads_persistence_check(dab_topic, test_name, tester, device_id):
-    """
-    Verifies that the 'personalizedAds' setting persists after a device restart.
-    """
-    test_id = to_test_id(f"{dab_topic}/{test_name}")
-    logs = []
-    result = TestResult(test_id, device_id, "system/settings/set", "{}", "UNKNOWN", "", logs)
-    persisted_value = "N/A"
-    device_recovered = False
-
-    try:
-        # Header and description
-        for line in (
-            f"[TEST] Personalized Ads Persistence Check — {test_name} (test_id={test_id}, device={device_id})",
-            "[DESC] Goal: Enable personalized ads, reboot, and verify the setting is still enabled.",
-            "[DESC] Required ops: system/settings/set, system/settings/get, system/restart, health-check/get.",
-            "[DESC] Required settings: personalizedAds",
-            "[DESC] Pass criteria: The 'personalizedAds' value must be true after reboot.",
-        ):
-            LOGGER.result(line)
-            logs.append(line)
-
-        # Capability gate: Check for both required operations AND the specific setting
-        spec = "ops: system/settings/set, system/settings/get, system/restart, health-check/get | settings: personalizedAds"
-        if not require_capabilities(tester, device_id, spec, result, logs):
-            return result # The 'require_capabilities' function already logged the reason and set the result
 
-        # Step 1: Enable personalized ads
-        line = "[STEP] Enabling 'personalizedAds' setting."
-        LOGGER.result(line)
-        logs.append(line)
-        payload = json.dumps({"personalizedAds": True})
-        rc, response = execute_cmd_and_log(tester, device_id, "system/settings/set", payload, logs, result)
-        if dab_status_from(response, rc) != 200:
-            # This could be a 501 if the setting is read-only, which is a valid failure for a 'set' test.
-            result.test_result = "FAILED"
-            line = f"[RESULT] FAILED — Could not enable 'personalizedAds' as a precondition. Status: {dab_status_from(response, rc)}"
-            LOGGER.result(line)
-            logs.append(line)
-            return result
-
-        # Step 2: Reboot the device
-        line = "[STEP] Rebooting the device."
-        LOGGER.result(line)
-        logs.append(line)
-        execute_cmd_and_log(tester, device_id, "system/restart", "{}", logs, result)
-
-        # Step 3: Wait for the device to become healthy by polling
-        line = f"[WAIT] Polling for device health for up to {DEVICE_REBOOT_WAIT}s..."
-        LOGGER.info(line)
-        logs.append(line)
-        start_time = time.time()
-        while time.time() - start_time < DEVICE_REBOOT_WAIT:
-            try:
-                rc_health, resp_health = execute_cmd_and_log(tester, device_id, "health-check/get", "{}", logs, result)
-                if dab_status_from(resp_health, rc_health) == 200 and json.loads(resp_health).get("healthy"):
-                    device_recovered = True
-                    LOGGER.ok("[INFO] Device is healthy after reboot.")
-                    logs.append("[INFO] Device is healthy after reboot.")
-                    break
-            except Exception:
-                # Ignore errors while device is rebooting
-                pass
-            time.sleep(HEALTH_CHECK_INTERVAL)
-
-        if not device_recovered:
-            result.test_result = "FAILED"
-            line = f"[RESULT] FAILED — Device did not become healthy within {DEVICE_REBOOT_WAIT}s after reboot."
-            LOGGER.error(line)
-            logs.append(line)
-            return result
-
-        # Step 4: Verify the setting after reboot
-        line = "[STEP] Verifying 'personalizedAds' setting after reboot."
-        LOGGER.result(line)
-        logs.append(line)
-        _, response = execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
-        try:
-            settings = json.loads(response) if response else {}
-            persisted_value = settings.get("personalizedAds")
-        except Exception:
-            persisted_value = "ERROR_PARSING"
-
-        if persisted_value is True:
-            result.test_result = "PASS"
-            line = "[RESULT] PASS — 'personalizedAds' setting correctly persisted as true."
-        else:
-            result.test_result = "FAILED"
-            line = f"[RESULT] FAILED — Setting did not persist. Expected true, got '{persisted_value}'."
+def _personalized_ads_before(ctx):
+    for line in (
+        f"[TEST] Personalized Ads Persistence Check — {ctx.test_name} (test_id={ctx.test_id}, device={ctx.device_id})",
+        "[DESC] Goal: Enable personalized ads, reboot, and verify the setting is still enabled.",
+        "[DESC] Required ops: system/settings/set, system/settings/get, system/restart, health-check/get.",
+        "[DESC] Required settings: personalizedAds",
+        "[DESC] Pass criteria: The 'personalizedAds' value must be true after reboot.",
+    ):
+        ctx.log(line)
+    ctx.summary["persisted_value"] = "N/A"
+
+    # Capability gate: Check for both required operations AND the specific setting
+    spec = "ops: system/settings/set, system/settings/get, system/restart, health-check/get | settings: personalizedAds"
+    if not require_capabilities(ctx.tester, ctx.device_id, spec, ctx.result, ctx.logs):
+        return False  # The 'require_capabilities' function already logged the reason and set the result
+
+    # Enable personalized ads
+    ctx.log("[STEP] Enabling 'personalizedAds' setting.")
+    payload = json.dumps({"personalizedAds": True})
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/set", payload, ctx.logs, ctx.result)
+    if dab_status_from(response, rc) != 200:
+        # This could be a 501 if the setting is read-only, which is a valid failure for a 'set' test.
+        ctx.finish("FAILED", f"Could not enable 'personalizedAds' as a precondition. Status: {dab_status_from(response, rc)}")
+        return False
+    return True
 
-        LOGGER.result(line)
-        logs.append(line)
 
-    except UnsupportedOperationError as e:
-        result.test_result = "OPTIONAL_FAILED"
-        line = f"[RESULT] OPTIONAL_FAILED — Operation '{e.topic}' is not supported."
-        LOGGER.result(line)
-        logs.append(line)
+def _personalized_ads_after(ctx):
+    # Verify the setting after reboot
+    ctx.log("[STEP] Verifying 'personalizedAds' setting after reboot.")
+    _, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/get", "{}", ctx.logs, ctx.result)
+    try:
+        settings = response_json(response) if response else {}
+        persisted_value = settings.get("personalizedAds")
+    except Exception:
+        persisted_value = "ERROR_PARSING"
+    ctx.summary["persisted_value"] = persisted_value
 
-    except Exception as e:
-        result.test_result = "SKIPPED"
-        line = f"[RESULT] SKIPPED — An unexpected error occurred: {e}"
-        LOGGER.result(line)
-        logs.append(line)
+    if persisted_value is True:
+        ctx.finish("PASS", "'personalizedAds' setting correctly persisted as true.")
+    else:
+        ctx.finish("FAILED", f"Setting did not persist. Expected true, got '{persisted_value}'.")
 
-    finally:
-        line = f"[SUMMARY] outcome={result.test_result}, persisted_value={persisted_value}, test_id={test_id}, device={device_id}"
-        LOGGER.result(line)
-        logs.append(line)
 
-    return result
+@reboot_phases(_personalized_ads_before, _personalized_ads_after, restart_until_healthy, operation="system/settings/set")
+def run_personalized_ads_persistence_check(dab_topic, test_name, tester, device_id):
+    """
+    Verifies that the 'personalizedAds' setting persists after a device restart.
+    """
+    return run_reboot_check(run_personalized_ads_persistence_check, dab_topic, test_name, tester, device_id)
 
 
 def run_personalized_ads_manual_check(dab_topic, test_name, tester, device_id):
@@ -3754,7 +3540,7 @@ def run_uninstall_foreground_app_check(dab_topic, test_name, tester, device_id):
         LOGGER.result(line)
         logs.append(line)
         _, response = execute_cmd_and_log(tester, device_id, "applications/get-state", json.dumps({"appId": app_id}), logs, result)
-        state = json.loads(response).get("state", "").upper() if response else "UNKNOWN"
+        state = response_json(response).get("state", "").upper() if response else "UNKNOWN"
         LOGGER.info(f"Current application state: {state}.")
 
         if state != "FOREGROUND":
@@ -3877,6 +3663,7 @@ def run_uninstall_system_app_check(dab_topic, test_name, tester, device_id):
     return result
 
 # === Test 36: Clear Data For An Application Currently Running Foreground Check ===
+@fixtures((APP_FOREGROUND, "youtube"))
 def run_clear_data_foreground_app_check(dab_topic, test_name, tester, device_id):
     """
     Validates that data for a foreground app can be cleared successfully.
@@ -3902,13 +3689,11 @@ def run_clear_data_foreground_app_check(dab_topic, test_name, tester, device_id)
         if not require_capabilities(tester, device_id, "ops: applications/launch, applications/clear-data", result, logs):
             return result
 
-        # Step 1: Launch the app
-        line = f"[STEP] Launching '{appId}' to bring it to the foreground."
+        # Step 1: Bring the app to the foreground (reused if already there)
+        line = f"[STEP] Ensuring '{appId}' is in the foreground."
         LOGGER.result(line)
         logs.append(line)
-        execute_cmd_and_log(tester, device_id, "applications/launch", json.dumps({"appId": appId}), logs, result)
-        print(f"Waiting {APP_LAUNCH_WAIT} seconds for application to launch and stabilize.")
-        time.sleep(APP_LAUNCH_WAIT)
+        tester.fixtures.ensure_app_foreground(device_id, appId, logs, wait=APP_LAUNCH_WAIT)
 
         # Step 2: Clear the app's data
         line = f"[STEP] Clearing data for '{appId}'."
@@ -3972,7 +3757,7 @@ def run_clear_data_system_app_check(dab_topic, test_name, tester, device_id):
         LOGGER.result(line)
         logs.append(line)
         _, response = execute_cmd_and_log(tester, device_id, "applications/list", "{}", logs, result)
-        apps = json.loads(response).get("applications", [])
+        apps = response_json(response).get("applications", [])
         app_id_list = [app.get("appId") for app in apps]
 
         line = "Please select one SYSTEM application from the list to clear its data:"
@@ -5046,124 +4831,94 @@ def run_install_from_url_while_heavy_app_running(dab_topic, test_name, tester, d
         LOGGER.result(msg); logs.append(msg)
         return result
 
-def run_install_after_reboot_then_launch(dab_topic, test_name, tester, device_id):
-    """
-    Positive: After device restart, install Sample_App from local artifact (any extension) and launch it.
-    Flow: restart -> wait -> applications/install(local path) -> wait -> applications/launch
-    PASS if install == 200 and launch == 200.
-    """
 
-    test_id = to_test_id(f"{dab_topic}/{test_name}")
-    app_id = config.apps.get("sample_app", "Sample_App")
-
-    logs = []
-    result = TestResult(test_id, device_id, "applications/install", "{}", "UNKNOWN", "", logs)
+INSTALL_RESTART_WAIT = 60
+INSTALL_STABLE_WAIT = 15
+INSTALL_POST_INSTALL_WAIT = 10
 
-    RESTART_WAIT = 60
-    STABLE_WAIT  = 15
-    POST_INSTALL_WAIT = 10
 
-    install_status = "N/A"
-    launch_status  = "N/A"
+def _install_after_reboot_before(ctx):
+    app_id = config.apps.get("sample_app", "Sample_App")
+    ctx.data["app_id"] = app_id
+    ctx.summary.update(install_status="N/A", launch_status="N/A", appId=app_id)
+    for line in (
+        f"[TEST] Install After Restart → Launch — {ctx.test_name} (test_id={ctx.test_id}, device={ctx.device_id}, appId={app_id})",
+        "[DESC] Using local artifact from config/apps/<appId>.<anyext> (no URL).",
+    ):
+        ctx.log(line)
 
+    # Resolve local artifact (any extension). If missing → SKIPPED with guidance.
     try:
-        # Header
-        for line in (
-            f"[TEST] Install After Restart → Launch — {test_name} (test_id={test_id}, device={device_id}, appId={app_id})",
-            "[DESC] Using local artifact from config/apps/<appId>.<anyext> (no URL).",
-        ):
-            LOGGER.result(line); logs.append(line)
-
-        # Resolve local artifact (any extension). If missing → SKIPPED with guidance.
-        try:
-            payload_install_dict = ensure_app_available(app_id=app_id)  # {"appId","url","format","timeout"}
-        except Exception as e:
-            result.test_result = "SKIPPED"
-            msg = (f"[RESULT] SKIPPED — local artifact for '{app_id}' not found. "
-                   f"Place a file named '{app_id}.*' in config/apps or run --init. ({e})")
-            LOGGER.result(msg); logs.append(msg)
-            LOGGER.result(f"[SUMMARY] outcome=SKIPPED, install_status=N/A, launch_status=N/A, "
-                          f"test_id={test_id}, device={device_id}, appId={app_id}")
-            return result
+        payload_install_dict = ensure_app_available(app_id=app_id)  # {"appId","url","format","timeout"}
+    except Exception as e:
+        ctx.finish("SKIPPED", f"local artifact for '{app_id}' not found. "
+                              f"Place a file named '{app_id}.*' in config/apps or run --init. ({e})")
+        return False
+    ctx.result.request = json.dumps(payload_install_dict)  # keep small; no raw responses below
+    return True
 
-        payload_install = json.dumps(payload_install_dict)
-        payload_launch  = json.dumps({"appId": app_id})
-        result.request  = payload_install  # keep small; no raw responses below
 
-        # Restart (fire-and-forget best-effort)
-        LOGGER.result("[STEP] system/restart (fire-and-forget)"); logs.append("[STEP] system/restart (fire-and-forget)")
+def _restart_and_wait_fixed(ctx):
+    """Fire-and-forget system/restart, then a fixed reboot + stabilize wait."""
+    ctx.log("[STEP] system/restart (fire-and-forget)")
+    try:
+        fire_and_forget_restart(ctx.tester.dab_client, ctx.device_id)
+    except Exception:
         try:
-            fire_and_forget_restart(tester.dab_client, device_id)  # preferred helper if available
+            execute_cmd_and_log(ctx.tester, ctx.device_id, "system/restart", "{}", ctx.logs, ctx.result)
         except Exception:
-            try:
-                execute_cmd_and_log(tester, device_id, "system/restart", "{}", logs, result)
-            except Exception:
-                LOGGER.warn("[WARN] Restart command fallback failed; proceeding after wait."); logs.append("[WARN] Restart fallback failed; proceeding.")
-
-        LOGGER.info(f"[WAIT] {RESTART_WAIT}s for reboot + {STABLE_WAIT}s stabilize"); logs.append(
-            f"[WAIT] {RESTART_WAIT}s + {STABLE_WAIT}s")
-        time.sleep(RESTART_WAIT + STABLE_WAIT)
-
-        # Capability gate
-        if not require_capabilities(tester, device_id, "ops: applications/install, applications/launch", result, logs):
-            result.response = "['capability gate failed']"
-            return result
-
-        LOGGER.info("[INFO] Capability gate passed."); logs.append("[INFO] Capability gate passed.")
+            ctx.log("[WARN] Restart command fallback failed; proceeding after wait.", "warn")
+    ctx.log(f"[WAIT] {INSTALL_RESTART_WAIT}s for reboot + {INSTALL_STABLE_WAIT}s stabilize", "info")
+    time.sleep(INSTALL_RESTART_WAIT + INSTALL_STABLE_WAIT)
+    return True
 
-        # Install from local path
-        LOGGER.result(f"[STEP] applications/install {payload_install}"); logs.append(
-            f"[STEP] applications/install {payload_install}")
-        rc_i, resp_i = execute_cmd_and_log(tester, device_id, "applications/install",
-                                           payload_install, logs, result)
-        install_status = dab_status_from(resp_i, rc_i)
-        LOGGER.info(f"[INFO] install rc={rc_i}, status={install_status}"); logs.append(
-            f"[INFO] install rc={rc_i}, status={install_status}")
 
-        if install_status != 200:
-            result.test_result = "FAILED"
-            LOGGER.result(f"[RESULT] FAILED — install returned {install_status} (expected 200)"); logs.append(
-                f"[RESULT] FAILED — install returned {install_status}")
-            result.response = f"['install={install_status}, launch=N/A']"
-            LOGGER.result(f"[SUMMARY] outcome=FAILED, install_status={install_status}, launch_status=N/A, "
-                          f"test_id={test_id}, device={device_id}, appId={app_id}")
-            return result
+def _install_after_reboot_after(ctx):
+    app_id = ctx.data["app_id"]
+    payload_install = ctx.result.request
+    payload_launch = json.dumps({"appId": app_id})
 
-        LOGGER.info(f"[WAIT] {POST_INSTALL_WAIT}s post-install"); logs.append(f"[WAIT] {POST_INSTALL_WAIT}s post-install")
-        time.sleep(POST_INSTALL_WAIT)
+    # Capability gate
+    if not require_capabilities(ctx.tester, ctx.device_id, "ops: applications/install, applications/launch", ctx.result, ctx.logs):
+        ctx.result.response = "['capability gate failed']"
+        return
+    ctx.log("[INFO] Capability gate passed.", "info")
+
+    # Install from local path
+    ctx.log(f"[STEP] applications/install {payload_install}")
+    rc_i, resp_i = execute_cmd_and_log(ctx.tester, ctx.device_id, "applications/install", payload_install, ctx.logs, ctx.result)
+    install_status = ctx.summary["install_status"] = dab_status_from(resp_i, rc_i)
+    ctx.log(f"[INFO] install rc={rc_i}, status={install_status}", "info")
+    if install_status != 200:
+        ctx.result.response = f"['install={install_status}, launch=N/A']"
+        ctx.finish("FAILED", f"install returned {install_status} (expected 200)")
+        return
 
-        # Launch to verify
-        LOGGER.result(f"[STEP] applications/launch {payload_launch}"); logs.append(
-            f"[STEP] applications/launch {payload_launch}")
-        rc_l, resp_l = execute_cmd_and_log(tester, device_id, "applications/launch",
-                                           payload_launch, logs, result)
-        launch_status = dab_status_from(resp_l, rc_l)
-        LOGGER.info(f"[INFO] launch rc={rc_l}, status={launch_status}"); logs.append(
-            f"[INFO] launch rc={rc_l}, status={launch_status}")
+    ctx.log(f"[WAIT] {INSTALL_POST_INSTALL_WAIT}s post-install", "info")
+    time.sleep(INSTALL_POST_INSTALL_WAIT)
 
-        if launch_status == 200:
-            result.test_result = "PASS"
-            LOGGER.result("[RESULT] PASS — install 200 and launch 200"); logs.append("[RESULT] PASS — install 200 and launch 200")
-        else:
-            result.test_result = "FAILED"
-            LOGGER.result(f"[RESULT] FAILED — launch returned {launch_status} (expected 200)"); logs.append(
-                f"[RESULT] FAILED — launch returned {launch_status}")
+    # Launch to verify
+    ctx.log(f"[STEP] applications/launch {payload_launch}")
+    rc_l, resp_l = execute_cmd_and_log(ctx.tester, ctx.device_id, "applications/launch", payload_launch, ctx.logs, ctx.result)
+    launch_status = ctx.summary["launch_status"] = dab_status_from(resp_l, rc_l)
+    ctx.log(f"[INFO] launch rc={rc_l}, status={launch_status}", "info")
 
-        # Keep results.json lean
-        result.response = f"['install={install_status}, launch={launch_status}']"
+    # Keep results.json lean
+    ctx.result.response = f"['install={install_status}, launch={launch_status}']"
+    if launch_status == 200:
+        ctx.finish("PASS", "install 200 and launch 200")
+    else:
+        ctx.finish("FAILED", f"launch returned {launch_status} (expected 200)")
 
-        LOGGER.result(f"[SUMMARY] outcome={result.test_result}, install_status={install_status}, "
-                      f"launch_status={launch_status}, test_id={test_id}, device={device_id}, appId={app_id}")
-        return result
 
-    except Exception as e:
-        result.test_result = "SKIPPED"
-        result.response = "['internal error']"
-        LOGGER.result(f"[RESULT] SKIPPED — internal error: {e} (test_id={test_id}, device={device_id}, appId={app_id})"); logs.append(
-            f"[RESULT] SKIPPED — internal error: {e}")
-        LOGGER.result(f"[SUMMARY] outcome=SKIPPED, install_status=N/A, launch_status=N/A, "
-                      f"test_id={test_id}, device={device_id}, appId={app_id}")
-        return result
+@reboot_phases(_install_after_reboot_before, _install_after_reboot_after, _restart_and_wait_fixed, operation="applications/install")
+def run_install_after_reboot_then_launch(dab_topic, test_name, tester, device_id):
+    """
+    Positive: After device restart, install Sample_App from local artifact (any extension) and launch it.
+    Flow: restart -> wait -> applications/install(local path) -> wait -> applications/launch
+    PASS if install == 200 and launch == 200.
+    """
+    return run_reboot_check(run_install_after_reboot_then_launch, dab_topic, test_name, tester, device_id)
 
 
 def run_sequential_installs_then_launch(dab_topic, test_name, tester, device_id):
@@ -5557,7 +5312,7 @@ def run_voice_log_collection_check(dab_topic, test_name, tester, device_id):
             logs.append(line)
             return result
 
-        voiceSystems = json.loads(response).get("voiceSystems")
+        voiceSystems = response_json(response).get("voiceSystems")
         if not voiceSystems:
             result.test_result = "OPTIONAL_FAILED"
             line = "[RESULT] OPTIONAL_FAILED — Test skipped because there are no voice systems in the list."
@@ -5572,13 +5327,13 @@ def run_voice_log_collection_check(dab_topic, test_name, tester, device_id):
             voiceSystem_list.append(name)
 
         logs.append(f"Please select one supported voice system in the list.")
-        print(f"Please select one supported voice system in the list.")
+        LOGGER.prompt(f"Please select one supported voice system in the list.")
         index = select_input(result, logs, voiceSystem_list)
         if index == 0:
-            print(f"There are no supported voice system in the list.")
+            LOGGER.warn(f"There are no supported voice system in the list.")
             logs.append(f"[OPTIONAL_FAILED] There are no supported voice system in the list.")
             result.test_result = "OPTIONAL_FAILED"
-            print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+            LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
             return result
 
         voiceSystem = voiceSystem_list[index - 1]
@@ -5586,7 +5341,7 @@ def run_voice_log_collection_check(dab_topic, test_name, tester, device_id):
         logs.append(line)
         LOGGER.info(line)
 
-        print(voiceSystems[index-1])
+        LOGGER.info(str(voiceSystems[index-1]))
         enabled = voiceSystems[index-1].get("enabled")
         if enabled == False:
             line = f"Voice system {voiceSystem} is disabled, try to enable it."
@@ -5658,7 +5413,7 @@ def run_voice_log_collection_check(dab_topic, test_name, tester, device_id):
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 7: Manual verification of logs
@@ -5767,7 +5522,7 @@ def run_idle_log_collection_check(dab_topic, test_name, tester, device_id):
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 5: Manual verification of logs
@@ -5877,7 +5632,7 @@ def run_channel_switch_log_check(dab_topic, test_name, tester, device_id):
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 5: Manual verification of logs
@@ -6010,7 +5765,7 @@ def run_app_switch_log_check(dab_topic, test_name, tester, device_id):
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 7: Manual verification of logs
@@ -6083,7 +5838,7 @@ def run_clear_data_preinstalled_app_check(dab_topic, test_name, tester, device_i
         LOGGER.result(line)
         logs.append(line)
         _, response = execute_cmd_and_log(tester, device_id, "applications/list", "{}", logs, result)
-        apps = json.loads(response).get("applications", [])
+        apps = response_json(response).get("applications", [])
         app_id_list = [app.get("appId") for app in apps]
         
         line = "Please select one NON-REMovable, PRE-INSTALLED app from the list:"
@@ -6453,7 +6208,7 @@ def run_logs_collection_check(dab_topic, test_name, tester, device_id):
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"[PASS] The logs structure follows DAB requirement.")
             result.test_result = "PASS"
 
@@ -6468,7 +6223,7 @@ def run_logs_collection_check(dab_topic, test_name, tester, device_id):
     finally:
         EnforcementManager().delete_logs_collection_files()
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
@@ -6515,11 +6270,9 @@ def run_logs_collection_for_major_system_services_check(dab_topic, test_name, te
         line = f"[STEP] Trigger activity of major system services."
         LOGGER.result(line)
         logs.append(line)
-        print(f"1. [AV Decoder] Please play a video for a while.\n2. [Power Manager] Please toggle power state.\n3. [Networking Module] Please disable and enable network.")
+        LOGGER.prompt(f"1. [AV Decoder] Please play a video for a while.\n2. [Power Manager] Please toggle power state.\n3. [Networking Module] Please disable and enable network.")
 
-        validate_state = False
-        while(validate_state == False):
-            validate_state = yes_or_no(result, logs, f"Complete the above operations?")
+        wait_for_yes(result, logs, "Complete the above operations?")
 
         # Step 3: Waiting for 10 seconds to collect logs.
         line = f"[STEP] Waiting for {LOGS_COLLECTION_WAIT} seconds to collect logs."
@@ -6551,21 +6304,21 @@ def run_logs_collection_for_major_system_services_check(dab_topic, test_name, te
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 6: Verify logs details.
         line = f"[STEP] Verify logs details."
         LOGGER.result(line)
         logs.append(line)
-        print(f"Please enter logs folder and verify logs about major system services.")
+        LOGGER.prompt(f"Please enter logs folder and verify logs about major system services.")
         validate_state = yes_or_no(result, logs, f"Logs collaction includes AV Decoder, Power Manager, and Networking Module?")
         if validate_state == True:
-            print(f"Logs collection includes major system services.")
+            LOGGER.result(f"Logs collection includes major system services.")
             logs.append(f"[PASS] Logs collection includes major system services.")
             result.test_result = "PASS"
         else:
-            print(f"Logs collection doesn't include major system services.")
+            LOGGER.warn(f"Logs collection doesn't include major system services.")
             logs.append(f"[FAILED] Logs collection doesn't include major system services.")
             result.test_result = "FAILED"
 
@@ -6580,11 +6333,12 @@ def run_logs_collection_for_major_system_services_check(dab_topic, test_name, te
     finally:
         EnforcementManager().delete_logs_collection_files()
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
 # === Test 40: Log Collection While App Pause Check ===
+@fixtures((APP_FOREGROUND, "youtube"))
 def run_logs_collection_app_pause_check(dab_topic, test_name, tester, device_id):
     """
     Validates that logs can be collected successfully while an app pause.
@@ -6624,25 +6378,23 @@ def run_logs_collection_app_pause_check(dab_topic, test_name, tester, device_id)
             logs.append(line)
             return result
 
-        # Step 2: Launch an application.
-        line = f"[STEP] Launch application '{appId}'."
+        # Step 2: Bring the application to the foreground (reused if already there).
+        line = f"[STEP] Ensure application '{appId}' is in the foreground."
         LOGGER.result(line)
         logs.append(line)
-        execute_cmd_and_log(tester, device_id, "applications/launch", json.dumps({"appId": appId}), logs, result)
-        print(f"Waiting {APP_LAUNCH_WAIT} seconds for application to launch.")
-        time.sleep(APP_LAUNCH_WAIT)
+        tester.fixtures.ensure_app_foreground(device_id, appId, logs, wait=APP_LAUNCH_WAIT)
 
         # Step 3: Pause the application and confirm the state.
         line = f"[STEP] Pause application '{appId}' and confirm its state is BACKGROUND."
         LOGGER.result(line)
         logs.append(line)
         execute_cmd_and_log(tester, device_id, "applications/exit", json.dumps({"appId": appId, "background": True}), logs, result)
-        print(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
+        LOGGER.result(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
         time.sleep(APP_STATE_CHECK_WAIT)
         _, response = execute_cmd_and_log(tester, device_id, "applications/get-state", json.dumps({"appId": appId}), logs, result)
-        state = json.loads(response).get("state", "").upper() if response else "UNKNOWN"
+        state = response_json(response).get("state", "").upper() if response else "UNKNOWN"
         if state != "BACKGROUND":
-            print(f"Pause application {appId} Fail.")
+            LOGGER.warn(f"Pause application {appId} Fail.")
             logs.append(f"[FAILED] Pause application {appId} Fail.")
             result.test_result = "FAILED"
             return result
@@ -6677,21 +6429,21 @@ def run_logs_collection_app_pause_check(dab_topic, test_name, tester, device_id)
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 7: Verify logs details.
         line = f"[STEP] Verify logs details."
         LOGGER.result(line)
         logs.append(line)
-        print(f"Please enter logs folder and verify logs about application '{appId}'.")
+        LOGGER.prompt(f"Please enter logs folder and verify logs about application '{appId}'.")
         validate_state = yes_or_no(result, logs, f"Logs collaction includes pausing application '{appId}'?")
         if validate_state == True:
-            print(f"Logs collection includes pausing application '{appId}'.")
+            LOGGER.result(f"Logs collection includes pausing application '{appId}'.")
             logs.append(f"[PASS] Logs collection includes pausing application '{appId}'.")
             result.test_result = "PASS"
         else:
-            print(f"Logs collection doesn't include pausing application '{appId}'.")
+            LOGGER.warn(f"Logs collection doesn't include pausing application '{appId}'.")
             logs.append(f"[FAILED] Logs collection doesn't incclue pausing application '{appId}'.")
             result.test_result = "FAILED"
 
@@ -6706,11 +6458,12 @@ def run_logs_collection_app_pause_check(dab_topic, test_name, tester, device_id)
     finally:
         EnforcementManager().delete_logs_collection_files()
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
 # === Test 41: Log Collection While Background App Is Force-Stopped Check ===
+@fixtures((APP_FOREGROUND, "youtube"))
 def run_logs_collection_app_force_stop_check(dab_topic, test_name, tester, device_id):
     """
     Validates that logs can be collected successfully while While Background App Is Force-Stopped.
@@ -6750,25 +6503,23 @@ def run_logs_collection_app_force_stop_check(dab_topic, test_name, tester, devic
             logs.append(line)
             return result
 
-        # Step 2: Launch an application.
-        line = f"[STEP] Launch application '{appId}'."
+        # Step 2: Bring the application to the foreground (reused if already there).
+        line = f"[STEP] Ensure application '{appId}' is in the foreground."
         LOGGER.result(line)
         logs.append(line)
-        rc, response = execute_cmd_and_log(tester, device_id, "applications/launch", json.dumps({"appId": appId}), logs, result)
-        print(f"Waiting {APP_LAUNCH_WAIT} seconds for application to launch.")
-        time.sleep(APP_LAUNCH_WAIT)
+        tester.fixtures.ensure_app_foreground(device_id, appId, logs, wait=APP_LAUNCH_WAIT)
 
         # Step 3: Exit the application to background, and confirm the state.
         line = f"[STEP] Pause application '{appId}' and confirm its state is BACKGROUND."
         LOGGER.result(line)
         logs.append(line)
         execute_cmd_and_log(tester, device_id, "applications/exit", json.dumps({"appId": appId, "background": True}), logs, result)
-        print(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
+        LOGGER.result(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
         time.sleep(APP_STATE_CHECK_WAIT)
         _, response = execute_cmd_and_log(tester, device_id, "applications/get-state", json.dumps({"appId": appId}), logs, result)
-        state = json.loads(response).get("state", "").upper() if response else "UNKNOWN"
+        state = response_json(response).get("state", "").upper() if response else "UNKNOWN"
         if state != "BACKGROUND":
-            print(f"Exit application {appId} to background fail.")
+            LOGGER.warn(f"Exit application {appId} to background fail.")
             logs.append(f"[FAILED] Exit application {appId} to background fail.")
             result.test_result = "FAILED"
             return result
@@ -6778,12 +6529,12 @@ def run_logs_collection_app_force_stop_check(dab_topic, test_name, tester, devic
         LOGGER.result(line)
         logs.append(line)
         execute_cmd_and_log(tester, device_id, "applications/exit", json.dumps({"appId": appId}), logs, result)
-        print(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
+        LOGGER.result(f"Waiting {APP_STATE_CHECK_WAIT} seconds after exit.")
         time.sleep(APP_STATE_CHECK_WAIT)
         _, response = execute_cmd_and_log(tester, device_id, "applications/get-state", json.dumps({"appId": appId}), logs, result)
-        state = json.loads(response).get("state", "").upper() if response else "UNKNOWN"
+        state = response_json(response).get("state", "").upper() if response else "UNKNOWN"
         if state != "STOPPED":
-            print(f"Force stop application {appId} fail.")
+            LOGGER.warn(f"Force stop application {appId} fail.")
             logs.append(f"[FAILED] Force stop application {appId} fail.")
             result.test_result = "FAILED"
             return result
@@ -6818,21 +6569,21 @@ def run_logs_collection_app_force_stop_check(dab_topic, test_name, tester, devic
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 8: Verify logs details.
         line = f"[STEP] Verify logs details."
         LOGGER.result(line)
         logs.append(line)
-        print(f"Please enter logs folder and verify logs about application '{appId}'.")
+        LOGGER.prompt(f"Please enter logs folder and verify logs about application '{appId}'.")
         validate_state = yes_or_no(result, logs, f"Logs collaction includes force stop application '{appId}'?")
         if validate_state == True:
-            print(f"Logs collection includes force stop application '{appId}'.")
+            LOGGER.result(f"Logs collection includes force stop application '{appId}'.")
             logs.append(f"[PASS] Logs collection includes force stop application '{appId}'.")
             result.test_result = "PASS"
         else:
-            print(f"Logs collection doesn't include force stop application '{appId}'.")
+            LOGGER.warn(f"Logs collection doesn't include force stop application '{appId}'.")
             logs.append(f"[FAILED] Logs collection doesn't incclue force stop application '{appId}'.")
             result.test_result = "FAILED"
 
@@ -6847,7 +6598,7 @@ def run_logs_collection_app_force_stop_check(dab_topic, test_name, tester, devic
     finally:
         EnforcementManager().delete_logs_collection_files()
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
@@ -6916,7 +6667,7 @@ def run_logs_collection_app_uninstall_check(dab_topic, test_name, tester, device
         LOGGER.result(line)
         logs.append(line)
         rc, response = execute_cmd_and_log(tester, device_id, "applications/uninstall", json.dumps({"appId": appId}), logs, result)
-        print(f"Waiting {APP_UNINSTALL_WAIT} seconds for application uninstallation.")
+        LOGGER.result(f"Waiting {APP_UNINSTALL_WAIT} seconds for application uninstallation.")
         time.sleep(APP_UNINSTALL_WAIT)
 
         # Step 3: Waiting for logs collections.
@@ -6949,21 +6700,21 @@ def run_logs_collection_app_uninstall_check(dab_topic, test_name, tester, device
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 6: Verify logs details.
         line = f"[STEP] Verify logs details."
         LOGGER.result(line)
         logs.append(line)
-        print(f"Please enter logs folder and verify logs about application '{appId}'.")
+        LOGGER.prompt(f"Please enter logs folder and verify logs about application '{appId}'.")
         validate_state = yes_or_no(result, logs, f"Logs collection includes application '{appId}' uninstallation log?")
         if validate_state == True:
-            print(f"Logs collection includes application '{appId}' uninstallation log.")
+            LOGGER.result(f"Logs collection includes application '{appId}' uninstallation log.")
             logs.append(f"[PASS] Logs collection includes application '{appId}' uninstallation log.")
             result.test_result = "PASS"
         else:
-            print(f"Logs collection doesn't include application '{appId}' uninstallation log.")
+            LOGGER.warn(f"Logs collection doesn't include application '{appId}' uninstallation log.")
             logs.append(f"[FAILED] Logs collection doesn't include application '{appId}' uninstallation log.")
             result.test_result = "FAILED"
 
@@ -6989,7 +6740,7 @@ def run_logs_collection_app_uninstall_check(dab_topic, test_name, tester, device
             LOGGER.warn(line); logs.append(line)
             
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
@@ -7108,21 +6859,21 @@ def run_logs_collection_app_install_and_launch_check(dab_topic, test_name, teste
             result.test_result = "FAILED"
             return result
         else:
-            print(f"The logs structure follows DAB requirement.")
+            LOGGER.result(f"The logs structure follows DAB requirement.")
             logs.append(f"The logs structure follows DAB requirement.")
 
         # Step 7: Verify logs details.
         line = f"[STEP] Verify logs details."
         LOGGER.result(line)
         logs.append(line)
-        print(f"Please enter logs folder and verify logs about application '{appId}'.")
+        LOGGER.prompt(f"Please enter logs folder and verify logs about application '{appId}'.")
         validate_state = yes_or_no(result, logs, f"Logs collaction includes application '{appId}' install and launch log?")
         if validate_state == True:
-            print(f"Logs collection includes application '{appId}' install and launch log.")
+            LOGGER.result(f"Logs collection includes application '{appId}' install and launch log.")
             logs.append(f"[PASS] Logs collection includes application '{appId}' install and launch log.")
             result.test_result = "PASS"
         else:
-            print(f"Logs collection doesn't include application '{appId}' install and launch log.")
+            LOGGER.warn(f"Logs collection doesn't include application '{appId}' install and launch log.")
             logs.append(f"[FAILED] Logs collection doesn't incclue application '{appId}' install and launch log.")
             result.test_result = "FAILED"
 
@@ -7137,7 +6888,7 @@ def run_logs_collection_app_install_and_launch_check(dab_topic, test_name, teste
     finally:
         EnforcementManager().delete_logs_collection_files()
         # Print concise final test result status
-        print(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
+        LOGGER.result(f"[Result] Test Id: {result.test_id} \n Test Outcome: {result.test_result}\n({'-' * 100})")
 
     return result
 
@@ -8029,7 +7780,7 @@ def run_power_mode_transition_standby_to_active(dab_topic, test_name, tester, de
             return result
 
         try:
-            body = json.loads(resp) if resp else {}
+            body = response_json(resp) if resp else {}
         except Exception:
             body = {}
         current_mode = str(body.get("mode", "UNKNOWN"))
@@ -8060,7 +7811,7 @@ def run_power_mode_transition_standby_to_active(dab_topic, test_name, tester, de
                 return result
 
             try:
-                body = json.loads(resp) if resp else {}
+                body = response_json(resp) if resp else {}
             except Exception:
                 body = {}
             pre_mode = str(body.get("mode", "UNKNOWN"))
@@ -8114,7 +7865,7 @@ def run_power_mode_transition_standby_to_active(dab_topic, test_name, tester, de
             result.response = f"Final GET failed: status={rc}, resp={resp}"
         else:
             try:
-                body = json.loads(resp) if resp else {}
+                body = response_json(resp) if resp else {}
             except Exception:
                 body = {}
             final_mode = str(body.get("mode", "UNKNOWN"))
@@ -8200,7 +7951,7 @@ def run_screensaver_timeout_invalid_value_check(dab_topic, test_name, tester, de
         LOGGER.result(line); logs.append(line)
         rc, response = execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
         if dab_status_from(response, rc) == 200:
-            initial_timeout = json.loads(response).get("screenSaverTimeout", "N/A")
+            initial_timeout = response_json(response).get("screenSaverTimeout", "N/A")
             logs.append(f"[INFO] Initial screenSaverTimeout is: {initial_timeout}")
         else:
             result.test_result = "FAILED"
@@ -8237,7 +7988,7 @@ def run_screensaver_timeout_invalid_value_check(dab_topic, test_name, tester, de
         )
         final_timeout = "N/A"
         if dab_status_from(response, rc) == 200:
-            final_timeout = json.loads(response).get("screenSaverTimeout", "N/A")
+            final_timeout = response_json(response).get("screenSaverTimeout", "N/A")
             logs.append(f"[INFO] Final screenSaverTimeout is: {final_timeout}")
 
         if initial_timeout == final_timeout:
@@ -10524,164 +10275,97 @@ def run_network_reset_multi_interface_manual_check(dab_topic, test_name, tester,
         return result
 
 
-def run_identifier_for_advertising_persistence_across_restart_check(dab_topic, test_name, tester, device_id):
-    """
-    DAB 2.1 – identifierForAdvertising persistence across restart (positive, semi-manual)
 
-    Goal:
-      - Read identifierForAdvertising via system/settings/get.
-      - Restart the device via system/restart.
-      - After the device is fully restarted and DAB is reachable again, read identifierForAdvertising again.
-      - Verify that the identifier is non-empty and the value is identical before and after restart.
-    """
-    test_id = to_test_id(f"{dab_topic}/{test_name}")
-    logs = []
-    result = TestResult(test_id, device_id, dab_topic, "{}", "UNKNOWN", "", logs)
-
-    LOGGER.result("[TEST] IdentifierForAdvertising persistence across restart")
-    LOGGER.result("[DESC] Verify that identifierForAdvertising is non-empty and stable across a system restart.")
-
-    # --- Step 1: Capability check (settings + restart support) ---
+def _read_identifier_for_advertising(ctx, when):
+    """identifierForAdvertising from system/settings/get, or None after marking the test FAILED."""
+    ctx.log(f"[STEP] Reading identifierForAdvertising {when} via system/settings/get.")
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/settings/get", "{}", ctx.logs, ctx.result)
+    status = dab_status_from(response, rc)
+    if status != 200:
+        ctx.finish("FAILED", f"system/settings/get for identifierForAdvertising {when} failed with status {status}.")
+        return None
+    settings = response_json(response) if response else {}
+    value = settings.get("identifierForAdvertising") if isinstance(settings, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        ctx.finish("FAILED", f"identifierForAdvertising is empty or invalid {when}: {value!r}.")
+        return None
+    ctx.log(f"[INFO] identifierForAdvertising {when}: {value!r}")
+    return value
+
+
+def _identifier_for_advertising_before(ctx):
+    ctx.log("[TEST] IdentifierForAdvertising persistence across restart")
+    ctx.log("[DESC] Verify that identifierForAdvertising is non-empty and stable across a system restart.")
+
+    # Capability check (settings + restart support)
     cap_spec = "ops: system/settings/get, system/restart | settings: identifierForAdvertising"
-    if not require_capabilities(tester, device_id, cap_spec, result, logs):
-        summary_line = f"[SUMMARY] {test_name} — final result: {result.test_result}, test_id={test_id}, device={device_id}"
-        LOGGER.result(summary_line)
-        logs.append(summary_line)
-        return result  # OPTIONAL_FAILED already set
-
-    try:
-        # --- Step 2: Read current identifierForAdvertising ---
-        LOGGER.result("[STEP] Reading current identifierForAdvertising via system/settings/get.")
-        before_resp = execute_cmd_and_log(tester, device_id, "system/settings/get", {"id": "identifierForAdvertising"}, logs, result)
-        status_before = before_resp.get("status")
-        if status_before != 200:
-            summary = f"system/settings/get for identifierForAdvertising failed with status {status_before}."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+    if not require_capabilities(ctx.tester, ctx.device_id, cap_spec, ctx.result, ctx.logs):
+        return False  # OPTIONAL_FAILED already set
 
-        id_before = before_resp.get("identifierForAdvertising")
-        if not isinstance(id_before, str) or not id_before.strip():
-            summary = f"identifierForAdvertising is empty or invalid before restart: {id_before!r}."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+    value = _read_identifier_for_advertising(ctx, "before restart")
+    if value is None:
+        return False
+    ctx.data["before"] = value
+    return True
 
-        LOGGER.result(f"[INFO] identifierForAdvertising before restart: {id_before!r}")
 
-        # --- Step 3: Confirm destructive restart action ---
-        LOGGER.result("[STEP] Confirm that you want to restart the device via system/restart.")
-        restart_prompt = (
-            "This test will restart the device using system/restart. "
-            "Make sure it is safe to reboot now (no critical foreground activity). Continue?"
-        )
-        if not yes_or_no(restart_prompt, default="n"):
-            summary = "Tester chose not to restart the device; aborting identifierForAdvertising persistence test."
-            LOGGER.result(f"[RESULT] OPTIONAL_FAILED – {summary}")
-            result.test_result = "OPTIONAL_FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: OPTIONAL_FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+def _restart_with_operator(ctx):
+    """Operator-approved system/restart, a 60s wait, then the operator confirms DAB is reachable again."""
+    ctx.log("[STEP] Confirm that you want to restart the device via system/restart.")
+    restart_prompt = (
+        "This test will restart the device using system/restart. "
+        "Make sure it is safe to reboot now (no critical foreground activity). Continue?"
+    )
+    if not yes_or_no(ctx.result, ctx.logs, restart_prompt):
+        ctx.finish("OPTIONAL_FAILED", "Tester chose not to restart the device; aborting identifierForAdvertising persistence test.")
+        return False
 
-        # --- Step 4: Trigger system/restart via DAB ---
-        LOGGER.result("[STEP] Triggering system/restart via DAB.")
-        restart_resp = execute_cmd_and_log(tester, device_id, "system/restart", {}, logs, result)
-        status_restart = restart_resp.get("status")
-        if status_restart != 200:
-            summary = f"system/restart returned unexpected status {status_restart}; expected 200."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+    ctx.log("[STEP] Triggering system/restart via DAB.")
+    rc, response = execute_cmd_and_log(ctx.tester, ctx.device_id, "system/restart", "{}", ctx.logs, ctx.result)
+    status_restart = dab_status_from(response, rc)
+    if status_restart != 200:
+        ctx.finish("FAILED", f"system/restart returned unexpected status {status_restart}; expected 200.")
+        return False
 
-        LOGGER.result("[WAIT] Waiting 60 seconds for the device to restart and DAB to become available again.")
-        countdown(60, LOGGER)
+    ctx.log("[WAIT] Waiting 60 seconds for the device to restart and DAB to become available again.")
+    countdown("Waiting for the device to restart", 60)
 
-        # --- Step 5: Manual confirmation that device is back and ready ---
-        LOGGER.result("[STEP] Confirm that the device has fully restarted and is reachable via DAB.")
-        ready_prompt = (
-            "Has the device fully restarted, reached the home screen, and is DAB reachable again "
-            "(e.g., other simple DAB operations work)?"
-        )
-        if not yes_or_no(ready_prompt, default="y"):
-            summary = "Device/DAB not confirmed ready after restart; cannot safely verify identifierForAdvertising."
-            LOGGER.result(f"[RESULT] OPTIONAL_FAILED – {summary}")
-            result.test_result = "OPTIONAL_FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: OPTIONAL_FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+    ctx.log("[STEP] Confirm that the device has fully restarted and is reachable via DAB.")
+    ready_prompt = (
+        "Has the device fully restarted, reached the home screen, and is DAB reachable again "
+        "(e.g., other simple DAB operations work)?"
+    )
+    if not yes_or_no(ctx.result, ctx.logs, ready_prompt):
+        ctx.finish("OPTIONAL_FAILED", "Device/DAB not confirmed ready after restart; cannot safely verify identifierForAdvertising.")
+        return False
+    return True
 
-        # --- Step 6: Read identifierForAdvertising again ---
-        LOGGER.result("[STEP] Reading identifierForAdvertising again after restart.")
-        after_resp = execute_cmd_and_log(tester, device_id, "system/settings/get", {"id": "identifierForAdvertising"}, logs, result)
-        status_after = after_resp.get("status")
-        if status_after != 200:
-            summary = f"system/settings/get for identifierForAdvertising after restart failed with status {status_after}."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
 
-        id_after = after_resp.get("identifierForAdvertising")
-        if not isinstance(id_after, str) or not id_after.strip():
-            summary = f"identifierForAdvertising is empty or invalid after restart: {id_after!r}."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+def _identifier_for_advertising_after(ctx):
+    value = _read_identifier_for_advertising(ctx, "after restart")
+    if value is None:
+        return
+    before = ctx.data.get("before")
+    if value != before:
+        ctx.finish("FAILED", f"identifierForAdvertising changed across restart: before={before!r}, after={value!r}.")
+    else:
+        ctx.finish("PASS", "identifierForAdvertising is non-empty and stable across system restart.")
 
-        LOGGER.result(f"[INFO] identifierForAdvertising after restart: {id_after!r}")
 
-        # --- Step 7: Compare before/after values ---
-        if id_before != id_after:
-            summary = f"identifierForAdvertising changed across restart: before={id_before!r}, after={id_after!r}."
-            LOGGER.result(f"[RESULT] FAILED – {summary}")
-            result.test_result = "FAILED"
-            logs.append(summary_line)
-            summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-            LOGGER.result(summary_line)
-            logs.append(summary_line)
-            return result
+@reboot_phases(_identifier_for_advertising_before, _identifier_for_advertising_after, _restart_with_operator)
+def run_identifier_for_advertising_persistence_across_restart_check(dab_topic, test_name, tester, device_id):
+    """
+    DAB 2.1 – identifierForAdvertising persistence across restart (positive, semi-manual)
 
-        summary = "identifierForAdvertising is non-empty and stable across system restart."
-        LOGGER.result(f"[SUMMARY] PASS – {summary}")
-        result.test_result = "PASS"
-        logs.append(summary_line)
-        summary_line = f"[SUMMARY] {test_name} — final result: PASS, test_id={test_id}, device={device_id}"
-        LOGGER.result(summary_line)
-        logs.append(summary_line)
-        return result
+    Goal:
+      - Read identifierForAdvertising via system/settings/get.
+      - Restart the device via system/restart.
+      - After the device is fully restarted and DAB is reachable again, read identifierForAdvertising again.
+      - Verify that the identifier is non-empty and the value is identical before and after restart.
+    """
+    return run_reboot_check(run_identifier_for_advertising_persistence_across_restart_check,
+                            dab_topic, test_name, tester, device_id)
 
-    except Exception as e:
-        summary = f"Unexpected error during identifierForAdvertising persistence test: {e}"
-        LOGGER.result(f"[RESULT] FAILED – {summary}")
-        result.test_result = "FAILED"
-        logs.append(summary_line)
-        summary_line = f"[SUMMARY] {test_name} — final result: FAILED, test_id={test_id}, device={device_id}"
-        LOGGER.result(summary_line)
-        logs.append(summary_line)
-        return result
 
 def run_identifier_for_advertising_unsupported_device_ui_absence_check(dab_topic, test_name, tester, device_id):
     """
@@ -2,12 +2,17 @@ from functionals import functional_helpers as helpers
 from dab_tester import to_test_id
 from result_json import TestResult
 from logger import LOGGER
+from util.visual_latency import measure_transition
+from util.dab_response import response_json
 import json
 import config
 import time
 import sys
 
 SMALL_WAIT_TIME = 1
+VISUAL_BURST_TIMEOUT_S = 3
+MAX_VISUAL_RESPONSE_MS = 1000
+MIN_SAMPLES_PER_LIMIT = 2  # capture interval must fit this many times into the limit to judge it
 
 def run_brightness_min_decrement_guard_check(dab_topic, test_name, tester, device_id):
     """
@@ -642,7 +647,7 @@ def run_brightness_max_increment_guard_check(dab_topic, test_name, tester, devic
             return result
 
         try:
-            body_get1 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get1 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"system/settings/get invalid JSON: {e}")
             return result
@@ -670,7 +675,7 @@ def run_brightness_max_increment_guard_check(dab_topic, test_name, tester, devic
             return result
 
         try:
-            body_get_max = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get_max = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"confirm get invalid JSON: {e}")
             return result
@@ -706,7 +711,7 @@ def run_brightness_max_increment_guard_check(dab_topic, test_name, tester, devic
             return result
 
         try:
-            body_get2 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get2 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             if helpers.outcome_of(result) == "UNKNOWN":
                 helpers.set_outcome(result, "FAILED")
@@ -805,7 +810,7 @@ def run_brightness_rapid_change_responsiveness_check(dab_topic, test_name, teste
             return result
 
         try:
-            body_get1 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get1 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"system/settings/get invalid JSON: {e}")
             return result
@@ -814,12 +819,25 @@ def run_brightness_rapid_change_responsiveness_check(dab_topic, test_name, teste
         helpers.log_line(logs, "INFO", f"original brightness={original_brightness!r}")
 
         helpers.log_line(logs, "STEP", "Watch the screen during changes.")
+        burst = helpers.EnforcementManager(device_id).has_operation("output/image")
+        timings = []
 
         for label, value in (("20%", value_20), ("80%", value_80), ("40%", value_40)):
             payload = json.dumps({"brightness": value})
             helpers.log_line(logs, "STEP", f"Set brightness to {label} ({value}).")
 
-            rc, response = helpers.execute_cmd_and_log(tester, device_id, "system/settings/set", payload, logs, result)
+            sent = []
+            send = lambda payload=payload: sent.append(
+                helpers.execute_cmd_and_log(tester, device_id, "system/settings/set", payload, logs, result))
+            if burst:
+                # Screenshot burst around the change: time to first visible change / to a stable screen
+                timing = measure_transition(tester, device_id, send, label=f"brightness {label}",
+                                            timeout_s=VISUAL_BURST_TIMEOUT_S)
+                timings.append(timing)
+                helpers.log_line(logs, "INFO", f"visual latency {timing.summary()}")
+            if not sent:
+                send()
+            rc, response = sent[0]
             status = helpers.dab_status_from(response, rc)
 
             if status == 501:
@@ -829,7 +847,10 @@ def run_brightness_rapid_change_responsiveness_check(dab_topic, test_name, teste
                 helpers.finish(result, logs, "FAILED", f"system/settings/set failed at {label} with {status}.")
                 return result
 
-            time.sleep(SMALL_WAIT_TIME)
+            if not burst:
+                time.sleep(SMALL_WAIT_TIME)
+        if timings:
+            result.visual_latency = [t.as_dict() for t in timings]
 
         helpers.log_line(logs, "STEP", "Confirm final value via system/settings/get.")
         rc, response = helpers.execute_cmd_and_log(tester, device_id, "system/settings/get", "{}", logs, result)
@@ -839,7 +860,7 @@ def run_brightness_rapid_change_responsiveness_check(dab_topic, test_name, teste
             return result
 
         try:
-            body_get2 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get2 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"confirm get invalid JSON: {e}")
             return result
@@ -856,6 +877,24 @@ def run_brightness_rapid_change_responsiveness_check(dab_topic, test_name, teste
                 helpers.finish(result, logs, "FAILED", f"final value mismatch: got {final_brightness!r}, expected {value_40!r}.")
                 return result
 
+        if timings and all(t.changed for t in timings):
+            slowest = max(timings, key=lambda t: t.time_to_first_change_ms)
+            coarsest = max(t.capture_interval_ms or 0 for t in timings)
+            # A screenshot round trip bounds the resolution; only judge the limit when frames are well inside it
+            if coarsest and coarsest * MIN_SAMPLES_PER_LIMIT < MAX_VISUAL_RESPONSE_MS:
+                if slowest.time_to_first_change_ms <= MAX_VISUAL_RESPONSE_MS:
+                    helpers.finish(result, logs, "PASS", f"Screen updated within {slowest.time_to_first_change_ms:.0f} ms "
+                                                         f"(limit {MAX_VISUAL_RESPONSE_MS} ms) after each change.")
+                else:
+                    helpers.finish(result, logs, "FAILED", f"Screen took {slowest.time_to_first_change_ms:.0f} ms to update "
+                                                           f"at {slowest.label} (limit {MAX_VISUAL_RESPONSE_MS} ms).")
+                return result
+            helpers.log_line(logs, "INFO", f"Screenshots ~{coarsest:.0f} ms apart are too coarse to judge the "
+                                           f"{MAX_VISUAL_RESPONSE_MS} ms limit (slowest step {slowest.time_to_first_change_ms:.0f} ms); asking instead.")
+        elif timings:
+            # Brightness is often applied to the backlight only and never shows in output/image
+            helpers.log_line(logs, "INFO", "No visible change in the screenshots for every step; asking instead.")
+
         user_validated = helpers.yes_or_no(result, logs, "Did the screen update quickly after each change?")
         if user_validated:
             helpers.finish(result, logs, "PASS", "User confirmed responsiveness.")
@@ -918,7 +957,7 @@ def run_brightness_min_value_screen_check(dab_topic, test_name, tester, device_i
             return result
 
         try:
-            body_get1 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get1 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"system/settings/get invalid JSON: {e}")
             return result
@@ -946,7 +985,7 @@ def run_brightness_min_value_screen_check(dab_topic, test_name, tester, device_i
             return result
 
         try:
-            body_get2 = json.loads(response) if isinstance(response, str) else (response or {})
+            body_get2 = response_json(response) if isinstance(response, str) else (response or {})
         except Exception as e:
             helpers.finish(result, logs, "FAILED", f"confirm get invalid JSON: {e}")
             return result
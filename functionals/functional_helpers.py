@@ -6,6 +6,8 @@ import time
 import sys
 from readchar import readchar
 from util.enforcement_manager import EnforcementManager
+from util.dab_response import response_json, response_status
+from util.response_render import clip_response
 from util.config_loader import ensure_app_available_anyext
 from util.config_loader import ensure_app_available
 from util.config_loader import ensure_apps_available as _ensure_many
@@ -14,6 +16,7 @@ from paho.mqtt.packettypes import PacketTypes
 from dab_checker import DabChecker
 from util.enforcement_manager import ValidateCode
 from logger import LOGGER
+from util.verdict_providers import VerdictUnavailableError, active as verdict_chain, ask_yes_no, ask_choice
 
 
 class UnsupportedOperationError(Exception):
@@ -150,12 +153,9 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
     Returns:
         (status_code: int, resp_json: str)
     """
-    em = EnforcementManager()
-    supported_ops_raw = em.get_supported_operations() or []
-    supported_ops = {op.get("operation") if isinstance(op, dict) else op
-                     for op in supported_ops_raw}
+    em = EnforcementManager(device_id)
 
-    if topic not in supported_ops and topic != "operations/list":
+    if not em.has_operation(topic) and topic != "operations/list":
         line = f"[OPTIONAL_FAILED] Operation '{topic}' is not supported by the device (checked from cache)."
         LOGGER.warn(line)
         if logs is not None: logs.append(line)
@@ -172,7 +172,7 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
             pass
 
     LOGGER.info(f"Executing {topic} with payload {payload}")
-    rc = tester.execute_cmd(device_id, topic, payload)
+    rc = tester.execute_cmd(device_id, topic, payload, fresh=True)
     resp = tester.dab_client.response()  # may be str, dict, list, None
 
     # Normalize response to JSON string
@@ -184,7 +184,7 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
         resp_json = json.dumps({"status": rc, "raw": None if resp is None else str(resp)})
 
     # Log
-    resp_line = f"[{topic}] Response: {resp_json}"
+    resp_line = f"[{topic}] Response: {clip_response(resp_json)}"
     LOGGER.info(resp_line)
     if logs is not None: logs.append(resp_line)
 
@@ -202,19 +202,15 @@ def execute_cmd_and_log(tester, device_id, topic, payload, logs=None, result=Non
     return status_code, resp_json
 
 def dab_status_from(resp, rc):
-    try:
-        if isinstance(resp, str):    # JSON string
-            return json.loads(resp).get("status", rc)
-        if isinstance(resp, dict):   # dict
-            return resp.get("status", rc)
-    except Exception:
-        pass
+    # DabResponse carries its status; JSON strings and dicts are read as before
+    if isinstance(resp, (str, dict)):
+        return response_status(resp, rc)
     return rc
 
 def print_response(response, topic_for_color=None, indent=10):
     if isinstance(response, str):
         try:
-            response = json.loads(response)
+            response = response_json(response)
         except json.JSONDecodeError:
             LOGGER.error("Invalid JSON string")
             return
@@ -226,7 +222,39 @@ def print_response(response, topic_for_color=None, indent=10):
         LOGGER.info(f"{' ' * indent}{key}: {value}")
 
 
+def _emitter(logs):
+    def emit(line):
+        LOGGER.result(line)
+        if logs is not None:
+            logs.append(line)
+    return emit
+
+
 def yes_or_no(result, logs, question=""):
+    """Manual Y/N check, answered by the configured verdict providers (util/verdict_providers.py)."""
+    return ask_yes_no(question, result, emit=_emitter(logs), console=lambda: _console_yes_no(result, logs, question))
+
+
+def wait_for_yes(result, logs, question, retry_delay=0):
+    """
+    Repeat a readiness question ("Has the device finished rebooting?") until it is answered Y.
+    Only an operator at the console can answer differently on the next try: an N from any other verdict
+    provider raises VerdictUnavailableError instead of asking again.
+    """
+    while not yes_or_no(result, logs, question):
+        if not verdict_chain().last_answer_interactive:
+            raise VerdictUnavailableError(question)
+        logs.append("Waiting for 'Y' confirmation.")
+        if retry_delay:
+            time.sleep(retry_delay)
+
+
+def select_input(result, logs, arr):
+    """Manual pick among `arr` (0 = none fits), answered by the configured verdict providers."""
+    return ask_choice("select", arr, result, emit=_emitter(logs), console=lambda: _console_select(result, logs, arr))
+
+
+def _console_yes_no(result, logs, question=""):
     positive = ['YES', 'Y']
     negative = ['NO', 'N']
     while True:
@@ -245,7 +273,7 @@ def yes_or_no(result, logs, question=""):
             return False
 
 
-def select_input(result, logs, arr):
+def _console_select(result, logs, arr):
     # Show options
     line0 = "*0: There is no option that meet the requirement."
     LOGGER.info(line0)
@@ -280,6 +308,7 @@ def select_input(result, logs, arr):
 
 def countdown(title, count):
     LOGGER.info(f"{title} — starting {count}s")
+    LOGGER.flush()  # the \r countdown below writes to stdout directly
     try:
         while count:
             mins, secs = divmod(count, 60)
@@ -294,11 +323,7 @@ def countdown(title, count):
 
 
 def waiting_for_screensaver(result, logs, screenSaverTimeout, tips):
-    while True:
-        if yes_or_no(result, logs, tips):
-            break
-        else:
-            continue
+    wait_for_yes(result, logs, tips)
     countdown(f"Waiting for {screenSaverTimeout} seconds in idle state.", screenSaverTimeout)
 
 def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs):
@@ -312,7 +337,7 @@ def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs
         return False, result
 
     try:
-        response = json.loads(dab_response)
+        response = response_json(dab_response)
     except Exception:
         line = f"[FAIL] Request {dab_topic} '{dab_payload}' returned invalid JSON."
         LOGGER.error(line)
@@ -342,7 +367,7 @@ def validate_response(tester, dab_topic, dab_payload, dab_response, result, logs
 
 def verify_system_setting(tester, payload, response, result, logs):
     (key, value), = json.loads(payload).items()
-    settings = json.loads(response)
+    settings = response_json(response)
     if key in settings:
         actual_value = settings.get(key)
         line = f"System settings get '{key}', Expected: {value}, Actual: {actual_value}"
@@ -375,7 +400,7 @@ def get_supported_setting(tester, device_id, key, result, logs):
         return None, result
 
     # At this point, the setting is confirmed to be supported. Retrieve from cache.
-    em = EnforcementManager()
+    em = EnforcementManager(device_id)
     settings = em.get_supported_settings()
     settings_map = settings.get("settings", settings) if isinstance(settings, dict) else {}
 
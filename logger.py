@@ -1,7 +1,7 @@
 # logger.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-import os, sys
+import atexit, collections, json, os, re, sys, threading, time
 
 # ---------- ANSI ----------
 RESET = "\x1b[0m"
@@ -19,9 +19,14 @@ FG_WHITE   = "\x1b[37m"
 FG_GRAY    = "\x1b[90m"  # light gray
 FG_BWHITE  = "\x1b[97m"  # bright white
 
+_ANSI = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+
 def _now_ms() -> str:
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
 
+def _fmt_ts(t: float) -> str:
+    return datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
 def _supports_color() -> bool:
     if os.environ.get("NO_COLOR"):
         return False
@@ -37,19 +42,34 @@ class RunLogger:
     - [WARN]/[ERROR]/[RESULT]/[FATAL]/[PROMPT] always (bold/bright)
     - Brighter light-gray timestamp with ms on every line
     - Skips blank lines so you won’t see: “[INFO]  ”
+    - Callers only append (time, level, msg, always, test id) records after the level check; a background writer
+      thread formats them and fans them out to the console and, with set_jsonl(), to a JSONL file.
+      flush() waits until everything queued so far is written: prompts, errors and fatals flush themselves, and
+      each test flushes at test_end so its block is on screen before the next test starts.
     """
     verbose: bool = False
     enable_color: bool = True
+    _pending: "collections.deque" = field(default_factory=collections.deque, init=False, repr=False)
+    _wake: "threading.Event" = field(default_factory=threading.Event, init=False, repr=False)
+    _writer: "threading.Thread | None" = field(default=None, init=False, repr=False)
+    _color: "bool | None" = field(default=None, init=False, repr=False)
+    _jsonl: object = field(default=None, init=False, repr=False)
+    _test_id: "str | None" = field(default=None, init=False, repr=False)
 
     # ---------- styling ----------
+    def _use_color(self) -> bool:
+        if self._color is None:  # isatty() once per run, not once per line
+            self._color = _supports_color()
+        return self.enable_color and self._color
+
     def _style_ts(self, ts: str) -> str:
-        if not self.enable_color or not _supports_color():
+        if not self._use_color():
             return ts
         # brighter light gray: bright white + dim
         return f"{DIM}{FG_BWHITE}{ts}{RESET}"
 
     def _style_msg(self, level: str, msg: str, always: bool) -> str:
-        if not self.enable_color or not _supports_color():
+        if not self._use_color():
             return msg
         if not always:
             # verbose-only lines: “smaller” but a bit brighter 
@@ -71,23 +91,94 @@ class RunLogger:
 
     # ---------- core ----------
     def _emit(self, level: str, msg: str, always: bool = False):
-        # skip empty/whitespace-only lines → prevents “[INFO]  ”
-        if msg is None or str(msg).strip() == "":
+        # level check first: filtered lines cost nothing beyond this test
+        if not (always or self.verbose) or msg is None:
+            return
+        self._pending.append((time.time(), level, msg, always, self._test_id))
+        if not self._wake.is_set():
+            if self._writer is None or not self._writer.is_alive():
+                self._start_writer()
+            self._wake.set()
+
+    def _start_writer(self):
+        self._writer = threading.Thread(target=self._write_loop, name="run-logger", daemon=True)
+        self._writer.start()
+
+    def _write_loop(self):
+        pending, wake = self._pending, self._wake
+        while True:
+            wake.wait()
+            wake.clear()
+            batch = []
+            while pending:
+                rec = pending.popleft()
+                if isinstance(rec, threading.Event):  # flush() marker: write what came before it, then release
+                    self._write(batch)
+                    batch = []
+                    rec.set()
+                else:
+                    batch.append(rec)
+            self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
             return
-        if always or self.verbose:
-            ts = self._style_ts(_now_ms())
-            styled = self._style_msg(level, str(msg), always)
-            print(f"{ts} [{level}] {styled}")
+        try:
+            out = []
+            for t, level, msg, always, test_id in batch:
+                msg = str(msg)
+                # skip empty/whitespace-only lines → prevents “[INFO]  ”
+                if msg.strip() == "":
+                    continue
+                ts = _fmt_ts(t)
+                out.append(f"{self._style_ts(ts)} [{level}] {self._style_msg(level, msg, always)}\n")
+                if self._jsonl is not None:
+                    rec = {"ts": ts, "level": level, "msg": _ANSI.sub("", msg)}
+                    if test_id:
+                        rec["test_id"] = test_id
+                    self._jsonl.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            if out:
+                sys.stdout.write("".join(out))
+                sys.stdout.flush()
+            if self._jsonl is not None:
+                self._jsonl.flush()
+        except Exception:
+            pass
+
+    def flush(self):
+        """Block until every line logged so far has been written."""
+        if self._writer is not None and self._writer.is_alive():
+            done = threading.Event()
+            self._pending.append(done)
+            self._wake.set()
+            done.wait()
+        else:
+            sys.stdout.flush()
+
+    def input(self, prompt: str = "") -> str:
+        """input() that shows the queued lines before its own prompt."""
+        self.flush()
+        return input(prompt)
+
+    def set_jsonl(self, path: str | None):
+        """Also write every logged line as {"ts", "level", "msg", "test_id"} to `path` (appended); None stops it."""
+        self.flush()
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._jsonl = open(path, "a", encoding="utf-8")
 
     # levels
     def info(self, msg: str):   self._emit("INFO", msg, always=False)
     def ok(self, msg: str):     self._emit("OK", msg, always=False)
     def wait(self, msg: str):   self._emit("INFO", msg, always=False)  # keep label for compatibility
     def warn(self, msg: str):   self._emit("WARN", msg, always=True)
-    def error(self, msg: str):  self._emit("ERROR", msg, always=True)
-    def fatal(self, msg: str):  self._emit("FATAL", msg, always=True)
+    def error(self, msg: str):  self._emit("ERROR", msg, always=True); self.flush()
+    def fatal(self, msg: str):  self._emit("FATAL", msg, always=True); self.flush()
     def result(self, msg: str): self._emit("RESULT", msg, always=True)
-    def prompt(self, msg: str): self._emit("PROMPT", msg, always=True)
+    def prompt(self, msg: str): self._emit("PROMPT", msg, always=True); self.flush()
 
     # plain stamped line for persisted logs (no ANSI)
     def stamp(self, line: str) -> str:
@@ -97,6 +188,7 @@ class RunLogger:
     def test_start(self, name: str, test_id: str, topic: str, device: str, request_body: str, suite: str | None = None):
         bar = "═" * 79
         sep = "─" * 79
+        self._test_id = test_id
         self.result(bar)
         self.result(f"Starting test: {name}")
         self.result(f"Test ID: {test_id}")
@@ -115,6 +207,8 @@ class RunLogger:
         else:
             self.result(f"Result: {outcome}")
         self.result("═" * 79)
+        self._test_id = None
+        self.flush()
 
     def _fmt_duration(self, ms: int) -> str:
         try:
@@ -132,3 +226,4 @@ class RunLogger:
 
 # Shared singleton
 LOGGER = RunLogger(verbose=False, enable_color=True)
+atexit.register(LOGGER.flush)
@@ -1,30 +1,35 @@
 import sys 
 import config
 import os
-from dab_tester import DabTester
-from dab_tester import Default_Validations
-from dab_tester import to_test_id
-import config
-import dab.app_telemetry
-import dab.device
-import dab.health_check
-import dab.input
-import dab.operations
-import dab.device_telemetry
-import dab.voice
-import dab.applications
-import dab.system
-import dab.content
-import dab.output
-import dab.version
 import argparse
 from logger import LOGGER
 from util.config_loader import init_interactive_setup, make_app_id_list
 from util.runtime_config_store import load_config, apply_overrides, save_config
+from util.runtime_config_store import DEFAULT_PATH as DEFAULT_CONFIG_PATH
+from util.test_scheduler import schedule_tests
+from util.rerun import load_results, select_test_ids, parse_outcomes, default_rerun_output, merge_rerun_results
+from util.sharding import parse_shard, shard_tests, shard_output_path, merge_shard_results
+from util.test_catalog import TestCatalog, SUITE_SOURCES
+from util.test_case import TestCase
+from util.verdict_providers import configure as configure_verdicts, bind_tester as bind_verdict_tester
+from util.verdict_providers import DEFAULT_SPEC as DEFAULT_VERDICT_SPEC
+from util.review_queue import REVIEW_QUEUE_PATH, run_review
+from util.tracing import TRACER, TraceInterceptor
+from util.profiling import PROFILER, DEFAULT_PROFILE_DIR, DEFAULT_MEM_TOP
 
 config_path = os.environ.get("DAB_CONFIG_JSON")
 
-SUITE_NAMES = ["conformance", "output_image", "netflix", "functional"]
+SUITE_NAMES = list(SUITE_SOURCES)
+
+def case_identity(test_case):
+    """(test_id, topic, title, is_functional) of a compiled test case or a suite tuple, without validating it."""
+    if isinstance(test_case, TestCase):
+        return test_case.test_id, test_case.topic, test_case.title, test_case.functional
+    from dab_tester import to_test_id
+    topic = test_case[0] if isinstance(test_case, tuple) and test_case else ""
+    functional = len(test_case) > 3 and test_case[1] == "functional"
+    title = test_case[3] if functional else (test_case[4] if len(test_case) > 4 else "")
+    return to_test_id(f"{topic}/{title}"), topic, title, functional
 
 if __name__ == "__main__":
     test_suites_str = ""
@@ -52,7 +57,7 @@ if __name__ == "__main__":
                         default="localhost")
 
     parser.add_argument("-c","--case", 
-                        help="test only the specified case(s). Use comma to separate multiple. Ex: -c InputLongKeyPressKeyDown,AppLaunchNegativeTest",
+                        help="test only the specified case(s). Use comma to separate multiple; globs and re:<regex> are accepted. Ex: -c InputLongKeyPressKeyDown,AppLaunch*,re:^SystemSettings",
                         type=str)
 
     parser.add_argument("-o","--output", 
@@ -69,6 +74,60 @@ if __name__ == "__main__":
                         choices=["2.0", "2.1"],
                         default=None)
 
+    parser.add_argument("--schedule", type=str, choices=["list", "cost"], default="list",
+                        help="Test execution order: 'list' keeps the suite order, 'cost' reorders to minimize app launches, setting changes and reboots.")
+
+    parser.add_argument("--no-response-cache", action="store_true",
+                        help="Always query the device for device/info, version, get-state and settings/get instead of reusing recent responses.")
+
+    parser.add_argument("--batch-reboots", action="store_true",
+                        help="Functional suite: run the setup of all reboot persistence checks, restart the device once, then verify them all.")
+
+    parser.add_argument("--rerun-from", type=str, default=None, metavar="RESULTS_JSON",
+                        help="Re-run only the tests of a previous results file whose outcome matches --only, then merge the new outcomes back into that file.")
+
+    parser.add_argument("--only", type=str, default="FAILED,SKIPPED",
+                        help="Outcomes to re-run with --rerun-from (comma separated). Default: FAILED,SKIPPED")
+
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its results journal, skipping tests already recorded for that run.")
+
+    parser.add_argument("--run-id", type=str, default=None,
+                        help="Run ID for the results journal. With --resume, defaults to the last run in the journal.")
+
+    parser.add_argument("--shard", type=str, default=None, metavar="I/N",
+                        help="Run only shard I of N of the selected tests, balanced by recorded test durations. Ex: --shard 2/8")
+
+    parser.add_argument("--merge-shards", nargs="+", default=None, metavar="RESULTS_JSON",
+                        help="Merge per-shard results files into one results file (-o, default ./test_result/<suite>.json), then exit.")
+
+    parser.add_argument("--verdict", type=str, default=None, metavar="PROVIDERS",
+                        help="How manual checks are answered, tried in order: interactive, answers:<file.json>, screenshot, deferred[:y|n]. "
+                             "Default: 'verdict' from the runtime config, else interactive. Ex: --verdict answers:nightly.json,deferred")
+
+    parser.add_argument("--review", nargs="?", const=REVIEW_QUEUE_PATH, default=None, metavar="QUEUE_JSONL",
+                        help="Answer the manual checks deferred with --verdict ...,deferred (default queue: " + REVIEW_QUEUE_PATH + "), patch the outcomes into the results, then exit.")
+
+    parser.add_argument("--capture-ref", type=str, default=None, metavar="NAME",
+                        help="Save the device's current screen (output/image) as visual reference NAME for --verdict screenshot "
+                             "(config/visual_refs/<device_id>/NAME.png), then exit. Ex: --capture-ref home")
+
+    parser.add_argument("--log-jsonl", type=str, default=None, metavar="PATH",
+                        help="Also write every console log line as JSON ({ts, level, msg, test_id}) to PATH (appended). "
+                             "Verbose-only lines are included with -v. Ex: --log-jsonl test_result/run.log.jsonl")
+
+    parser.add_argument("--trace", type=str, default=None, metavar="OUT_JSON",
+                        help="Write a timeline of the run (tests, phases, requests, MQTT round trips, sleeps, prompts) in Chrome trace "
+                             "format to OUT_JSON at exit. Open it in chrome://tracing or ui.perfetto.dev. Ex: --trace test_result/trace.json")
+
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, default=None, metavar="DIR",
+                        help="Run each test under cProfile: DIR/<test_id>.prof per test and DIR/hotspots.txt merged over the run "
+                             "(default DIR: " + DEFAULT_PROFILE_DIR + ").")
+
+    parser.add_argument("--profile-mem", nargs="?", type=int, const=DEFAULT_MEM_TOP, default=None, metavar="TOP_N",
+                        help="Trace allocations with tracemalloc: peak and top TOP_N growing source lines per test, appended to "
+                             "<profile DIR>/memory.jsonl (default TOP_N: " + str(DEFAULT_MEM_TOP) + "). Slows the run down.")
+
     parser.add_argument("--init", action="store_true",
                         help="Interactive setup: prompt for app paths (and optional store URL), then exit.")
 
@@ -85,6 +144,8 @@ if __name__ == "__main__":
     parser.set_defaults(case=99999)
     args = parser.parse_args()
     LOGGER.verbose = bool(args.verbose)
+    if args.log_jsonl:
+        LOGGER.set_jsonl(args.log_jsonl)
     device_id = args.ID
 
 
@@ -107,6 +168,11 @@ if __name__ == "__main__":
         LOGGER.result("[CONFIG] Done. Exiting....")
         raise SystemExit(0)
 
+    if args.review:
+        # No broker needed: answers are patched into the journals/results files named in the queue
+        run_review(args.review)
+        sys.exit(0)
+
     if args.config_app or args.config_va:
         try:
             from util.runtime_config_store import load_config, apply_overrides, save_config
@@ -136,88 +202,163 @@ if __name__ == "__main__":
     elif getattr(args, "init", False):
         # Fixed to exactly three apps; make_app_id_list() now returns the allowed set.
         ids = make_app_id_list()
-        print(f"[INIT] Managing fixed app set: {ids}")
+        LOGGER.result(f"[INIT] Managing fixed app set: {ids}")
         init_interactive_setup(app_ids=tuple(ids))  # safe: function uses the fixed allow-list
-        print("[INIT] Done.")
+        LOGGER.result("[INIT] Done.")
         sys.exit(0)  # if you use 'from sys import exit as sys_exit', change to: sys_exit(0)
 
     # Read runtime config ONCE for this run and apply in memory
     config.init_runtime_config(config_path)
     LOGGER.result(f"[CONFIG] Active: va={config.va}, youtube={config.apps.get('youtube')}")
 
-    import conformance
-    import output_image
-    import netflix
-    import functional
+    # Test ids → suite/topic/title/position, cached until a suite source changes. Suite modules load only when run.
+    catalog = TestCatalog(runtime_config=config_path or DEFAULT_CONFIG_PATH).load()
+
+    if args.merge_shards:
+        first = load_results(args.merge_shards[0])
+        suite = first.get("suite_name") or ""
+        merged_path = merge_shard_results(args.merge_shards, args.output or f"./test_result/{suite or 'merged'}.json", catalog.ids(suite))
+        LOGGER.ok(f"Merged {len(args.merge_shards)} shard result file(s) into {merged_path}.")
+        sys.exit(0)
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if (args.suite):
+        if args.suite not in SUITE_SOURCES:
+            parser.error(f"Unknown suite '{args.suite}'. Available: {test_suites_str}")
+        suite_to_run = [args.suite]
+        LOGGER.info(f"Selected suite: '{args.suite}' with {catalog.count(args.suite)} tests.")
+    else:
+        suite_to_run = catalog.suite_names()
+        LOGGER.info(f"No suite specified. All suites selected: {', '.join(suite_to_run)}.")
+
+    if (args.list == True):
+        # Served from the catalog: no suite import, no broker connection
+        for suite in suite_to_run:
+            LOGGER.info(f"Listing test cases for suite '{suite}'...")
+            listed = 0
+            for entry in catalog.entries.get(suite, ()):
+                if entry.valid:
+                    LOGGER.result(entry.test_id)
+                    listed += 1
+                else:
+                    LOGGER.warn(f"Skipping malformed test tuple #{entry.index} (topic={entry.topic!r}, title={entry.title!r}).")
+            LOGGER.ok(f"Listed {listed} case(s) in suite '{suite}'.")
+        sys.exit(0)
+
+    try:
+        verdicts = configure_verdicts(args.verdict or config.verdict or DEFAULT_VERDICT_SPEC)
+    except (OSError, ValueError) as e:
+        parser.error(f"--verdict: {e}")
+    LOGGER.info(f"Manual checks answered by: {verdicts.describe()}.")
 
-    ALL_SUITES = {
-        "conformance": conformance.CONFORMANCE_TEST_CASE,
-        "output_image": output_image.OUTPUT_IMAGE_TEST_CASES,
-        "netflix": netflix.NETFLIX_TEST_CASES,
-        "functional": functional.FUNCTIONAL_TEST_CASE,
-    }
+    if args.trace:
+        TRACER.start(args.trace)
+    if args.profile or args.profile_mem:
+        PROFILER.start(args.profile, cpu=bool(args.profile), mem_top=args.profile_mem or 0)
+    from dab_tester import DabTester
 
     Tester = DabTester(args.broker, override_dab_version=args.dab_version)
+    bind_verdict_tester(Tester)
+    if args.trace:
+        Tester.request_pipeline.register(TraceInterceptor())
 
     Tester.verbose = args.verbose
+    if args.no_response_cache:
+        Tester.request_pipeline.set_enabled("response-cache", False)
+    Tester.batch_reboots = args.batch_reboots
+    Tester.resume = args.resume
+    Tester.run_id = args.run_id
+    if shard:
+        Tester.durations.record_per_shard()
     try:
         Tester.logger.verbose = Tester.verbose
     except Exception:
         pass
     LOGGER.info(f"Starting run with broker {args.broker}, device ID '{device_id}', suite='{args.suite or 'ALL'}', output='{args.output or '(default)'}', dab-version override='{args.dab_version or 'auto'}'.")
 
-    suite_to_run = {}
-
-    if (args.suite):
-        # Let dict throw KeyError here
-        suite_to_run.update({args.suite: ALL_SUITES[args.suite]})
-        LOGGER.info(f"Selected suite: '{args.suite}' with {len(suite_to_run[args.suite])} tests.")
-    else:
-        suite_to_run = ALL_SUITES
-        LOGGER.info(f"No suite specified. All suites selected: {', '.join(suite_to_run.keys())}.")
+    if args.capture_ref:
+        from util.review_queue import capture_screenshot
+        from util.visual_verdict import ReferenceStore
+        png = capture_screenshot(Tester, device_id)
+        Tester.Close()
+        if not png:
+            LOGGER.fatal(f"Could not capture output/image from device '{device_id}'.")
+            sys.exit(1)
+        LOGGER.result(f"Saved visual reference '{args.capture_ref}': {ReferenceStore().save(args.capture_ref, device_id, png)}")
+        sys.exit(0)
 
-    if (args.list == True):
-        for suite in suite_to_run:
-            LOGGER.info(f"Listing test cases for suite '{suite}'...")
-            listed = 0
-            for test_case in suite_to_run[suite]:
-                try:
-                    topic, _body_spec, _func, _expected, title, _is_neg, _ver = Tester.unpack_test_case(test_case)
-                    if topic and title:
-                        LOGGER.result(to_test_id(f"{topic}/{title}"))
-                        listed += 1
-                    else:
-                        LOGGER.warn(f"Skipping malformed test tuple (no topic/title): {test_case}")
-                except Exception as e:
-                    LOGGER.warn(f"Skipping malformed test tuple: {type(e).__name__}: {e}")
-            LOGGER.ok(f"Listed {listed} case(s) in suite '{suite}'.")
+    if args.rerun_from:
+        previous = load_results(args.rerun_from)
+        outcomes = parse_outcomes(args.only)
+        wanted_ids = select_test_ids(previous, outcomes)
+        prev_suite = previous.get("suite_name")
+        LOGGER.info(f"Re-run: {len(wanted_ids)} test(s) with outcome in {sorted(outcomes)} from '{args.rerun_from}'.")
+        if not wanted_ids:
+            LOGGER.ok("Nothing to re-run.")
+        else:
+            # The results file names its suite; -s only narrows the search when the file does not
+            search = [prev_suite] if prev_suite in SUITE_SOURCES else suite_to_run
+            for suite in search:
+                entries = catalog.select(wanted_ids, [suite])
+                if not entries:
+                    continue
+                found = {e.test_id for e in entries}
+                unmatched = [tid for tid in wanted_ids if tid not in found]
+                if unmatched:
+                    LOGGER.warn(f"No test case in suite '{suite}' for: {unmatched}")
+                matched_tests = catalog.cases_for(entries)
+                LOGGER.result(f"Re-running {len(matched_tests)} case(s) in suite '{suite}'.")
+                if args.schedule == "cost":
+                    matched_tests = schedule_tests(matched_tests, suite)
+                rerun_output = args.output or default_rerun_output(args.rerun_from)
+                Tester.assert_device_available(device_id)
+                Tester.Execute_Single_Test(suite, device_id, matched_tests, rerun_output)
+                counts = merge_rerun_results(args.rerun_from, rerun_output, outcomes)
+                LOGGER.ok(f"Merged re-run results into '{args.rerun_from}' "
+                          f"(replaced={counts['replaced']}, added={counts['added']}, missing={counts['missing']}).")
+                break
+            else:
+                LOGGER.error(f"None of the test ids selected from '{args.rerun_from}' matched a test case.")
 
     else:
         if ((not isinstance(args.case, (str)) or len(args.case) == 0)):
             LOGGER.result("Testing all cases")
             for suite in suite_to_run:
-                LOGGER.info(f"Preparing to run suite '{suite}' with {len(suite_to_run[suite])} tests.")
+                LOGGER.info(f"Preparing to run suite '{suite}' with {catalog.count(suite)} tests.")
+                tests = catalog.suite_cases(suite)
+                output = args.output
+                if shard:
+                    tests = shard_tests(tests, shard[0], shard[1], case_identity, Tester.durations)
+                    output = output or shard_output_path(suite, *shard)
+                if args.schedule == "cost":
+                    tests = schedule_tests(tests, suite)
                 Tester.assert_device_available(device_id)
-                Tester.Execute_All_Tests(suite, device_id, suite_to_run[suite], args.output)
+                Tester.Execute_All_Tests(suite, device_id, tests, output)
                 LOGGER.ok(f"Completed suite '{suite}'.")
         else:
-            # Handle single or multiple cases passed via -c
+            # Handle single or multiple cases passed via -c (exact ids, globs, or re:<regex>)
             requested_cases = [c.strip() for c in args.case.split(",")]
             LOGGER.info(f"Requested case IDs: {requested_cases}")
-            matched_tests = []
             for suite in suite_to_run:
                 LOGGER.info(f"Searching for requested cases in suite '{suite}'...")
-                for test_case in suite_to_run[suite]:
-                    (dab_request_topic, dab_request_body, validate_output_function, expected_response, test_title, test_version, is_negative) = Tester.unpack_test_case(test_case)
-                    if dab_request_topic is None:
-                        continue
-                    test_id = to_test_id(f"{dab_request_topic}/{test_title}")
-                    if test_id in requested_cases:
-                        matched_tests.append(test_case)
-                if matched_tests:
+                entries = catalog.select(requested_cases, [suite])
+                if entries:
+                    matched_tests = catalog.cases_for(entries)
                     LOGGER.result(f"Matched {len(matched_tests)} case(s) in suite '{suite}'.")
+                    output = args.output
+                    if shard:
+                        matched_tests = shard_tests(matched_tests, shard[0], shard[1], case_identity, Tester.durations)
+                        output = output or shard_output_path(suite, *shard)
+                    if args.schedule == "cost":
+                        matched_tests = schedule_tests(matched_tests, suite)
                     Tester.assert_device_available(device_id)
-                    Tester.Execute_Single_Test(suite, device_id, matched_tests, args.output)
+                    Tester.Execute_Single_Test(suite, device_id, matched_tests, output)
                     break
             else:
                 LOGGER.error(f"None of the requested test case IDs matched: {requested_cases}")
@@ -1,6 +1,6 @@
 from jsonschema import validate
-import jsons
 import dab_tester
+from util.dab_response import response_json
 
 # DabRequest
 dab_request_schema = {
@@ -925,140 +925,140 @@ class dab_response_validator(object):
 
     @staticmethod
     def validate_dab_response_schema(response):
-        validate(instance=jsons.loads(response), schema=dab_response_schema)
+        validate(instance=response_json(response), schema=dab_response_schema)
 
     @staticmethod
     def validate_list_supported_operation_response_schema(response):
-        validate(instance=jsons.loads(response), schema=list_supported_operation_response_schema)
+        validate(instance=response_json(response), schema=list_supported_operation_response_schema)
 
     @staticmethod
     def validate_list_applications_response_schema(response):
-        validate(instance=jsons.loads(response), schema=list_applications_response_schema)
+        validate(instance=response_json(response), schema=list_applications_response_schema)
 
     @staticmethod
     def validate_launch_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=launch_application_response_schema)
+        validate(instance=response_json(response), schema=launch_application_response_schema)
 
     @staticmethod
     def validate_launch_application_with_content_response_schema(response):
-        validate(instance=jsons.loads(response), schema=launch_application_with_content_response_schema)
+        validate(instance=response_json(response), schema=launch_application_with_content_response_schema)
 
     @staticmethod
     def validate_get_application_state_response_schema(response):
-        validate(instance=jsons.loads(response), schema=get_application_state_response_schema)
+        validate(instance=response_json(response), schema=get_application_state_response_schema)
 
     @staticmethod
     def validate_exit_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=exit_application_response_schema)
+        validate(instance=response_json(response), schema=exit_application_response_schema)
 
     @staticmethod
     def validate_install_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=install_application_response_schema)
+        validate(instance=response_json(response), schema=install_application_response_schema)
 
     @staticmethod
     def validate_uninstall_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=uninstall_application_response_schema)
+        validate(instance=response_json(response), schema=uninstall_application_response_schema)
 
     @staticmethod
     def validate_clear_data_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=clear_data_application_response_schema)
+        validate(instance=response_json(response), schema=clear_data_application_response_schema)
     
     @staticmethod
     def validate_install_from_appstore_application_response_schema(response):
-        validate(instance=jsons.loads(response), schema=install_from_appstore_application_response_schema)
+        validate(instance=response_json(response), schema=install_from_appstore_application_response_schema)
 
     @staticmethod
     def validate_device_information_schema(response):
-        validate(instance=jsons.loads(response), schema=device_information_schema)
+        validate(instance=response_json(response), schema=device_information_schema)
 
     @staticmethod
     def validate_restart_response_schema(response):
-        validate(instance=jsons.loads(response), schema=restart_response_schema)
+        validate(instance=response_json(response), schema=restart_response_schema)
 
     @staticmethod
     def validate_list_system_settings_schema(response):
         dab_version = dab_tester.DAB_VERSION or "2.0"
         if dab_version == "2.0":
-            validate(instance=jsons.loads(response), schema=list_system_settings_schema_20)
+            validate(instance=response_json(response), schema=list_system_settings_schema_20)
         elif dab_version == "2.1":
-            validate(instance=jsons.loads(response), schema=list_system_settings_schema_21)
+            validate(instance=response_json(response), schema=list_system_settings_schema_21)
 
     @staticmethod
     def validate_get_system_settings_response_schema(response):
-        validate(instance=jsons.loads(response), schema=get_system_settings_response_schema)
+        validate(instance=response_json(response), schema=get_system_settings_response_schema)
 
     @staticmethod
     def validate_set_system_settings_response_schema(response):
-        validate(instance=jsons.loads(response), schema=set_system_settings_response_schema)
+        validate(instance=response_json(response), schema=set_system_settings_response_schema)
 
     @staticmethod
     def validate_key_list_schema(response):
-        validate(instance=jsons.loads(response), schema=key_list_schema)
+        validate(instance=response_json(response), schema=key_list_schema)
 
     @staticmethod
     def validate_output_image_response_schema(response):
-        validate(instance=jsons.loads(response), schema=output_image_response_schema)
+        validate(instance=response_json(response), schema=output_image_response_schema)
 
     @staticmethod
     def validate_start_device_telemetry_response_schema(response):
-        validate(instance=jsons.loads(response), schema=start_device_telemetry_response_schema)
+        validate(instance=response_json(response), schema=start_device_telemetry_response_schema)
 
     @staticmethod
     def validate_stop_device_telemetry_response_schema(response):
-        validate(instance=jsons.loads(response), schema=stop_device_telemetry_response_schema)
+        validate(instance=response_json(response), schema=stop_device_telemetry_response_schema)
 
     @staticmethod
     def validate_start_app_telemetry_response_schema(response):
-        validate(instance=jsons.loads(response), schema=start_app_telemetry_response_schema)
+        validate(instance=response_json(response), schema=start_app_telemetry_response_schema)
 
     @staticmethod
     def validate_stop_app_telemetry_response_schema(response):
-        validate(instance=jsons.loads(response), schema=stop_app_telemetry_response_schema)
+        validate(instance=response_json(response), schema=stop_app_telemetry_response_schema)
 
     @staticmethod
     def validate_health_check_response_schema(response):
-        validate(instance=jsons.loads(response), schema=health_check_response_schema)
+        validate(instance=response_json(response), schema=health_check_response_schema)
 
     @staticmethod
     def validate_list_voice_response_schema(response):
-        validate(instance=jsons.loads(response), schema=list_voice_response_schema)
+        validate(instance=response_json(response), schema=list_voice_response_schema)
 
     @staticmethod
     def validate_set_voice_system_response_schema(response):
-        validate(instance=jsons.loads(response), schema=set_voice_system_response_schema)
+        validate(instance=response_json(response), schema=set_voice_system_response_schema)
 
     @staticmethod
     def validate_discovery_response_schema(response):
-        validate(instance=jsons.loads(response), schema=discovery_response_schema)
+        validate(instance=response_json(response), schema=discovery_response_schema)
 
     @staticmethod
     def validate_version_response_schema(response):
-        validate(instance=jsons.loads(response), schema=version_response_schema)
+        validate(instance=response_json(response), schema=version_response_schema)
 
     @staticmethod
     def validate_stop_log_collection_response_schema(response):
-        validate(instance=jsons.loads(response), schema=stop_log_collection_response_schema)
+        validate(instance=response_json(response), schema=stop_log_collection_response_schema)
 
     @staticmethod
     def validate_start_log_collection_response_schema(response):
-        validate(instance=jsons.loads(response), schema=start_log_collection_response_schema)
+        validate(instance=response_json(response), schema=start_log_collection_response_schema)
 
     @staticmethod
     def validate_power_mode_set_response_schema(response):
-        validate(instance=jsons.loads(response), schema=power_mode_set_response_schema)
+        validate(instance=response_json(response), schema=power_mode_set_response_schema)
 
     @staticmethod
     def validate_power_mode_get_response_schema(response):
-        validate(instance=jsons.loads(response), schema=power_mode_get_response_schema)
+        validate(instance=response_json(response), schema=power_mode_get_response_schema)
 
     @staticmethod
     def validate_content_recommendations_response_schema(response):
-        validate(instance=jsons.loads(response), schema=content_recommendations_response_schema)
+        validate(instance=response_json(response), schema=content_recommendations_response_schema)
 
     @staticmethod
     def validate_content_search_response_schema(response):
-        validate(instance=jsons.loads(response), schema=content_search_response_schema)
+        validate(instance=response_json(response), schema=content_search_response_schema)
 
     @staticmethod
     def validate_content_open_response_schema(response):
-        validate(instance=jsons.loads(response), schema=content_open_response_schema)
+        validate(instance=response_json(response), schema=content_open_response_schema)
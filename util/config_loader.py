@@ -207,7 +207,7 @@ def ensure_app_available_anyext(
                 "Place it there (any extension) or run with --init."
             )
         LOGGER.warn(f"[INIT] App '{app_id}' not found in '{config_dir}'")
-        user_path = input(
+        user_path = LOGGER.input(
             f"Full path to the app file (any extension) to copy as "
             f"'{Path(config_dir) / (app_id)}.<ext>': "
         ).strip()
@@ -279,12 +279,12 @@ def init_sample_apps(
             current = _find_first_app_file(app_id, config_dir)
             if current:
                 LOGGER.info(f"[INIT] Current artifact for '{app_id}': {current.resolve()}")
-                choice = input(
+                choice = LOGGER.input(
                     f"Keep (K) / Replace (R) / Delete (D) this app under '{config_dir}' "
                     f"as '{app_id}.*'? [K]: "
                 ).strip().lower() or "k"
                 if choice.startswith("r"):
-                    new_path = input(
+                    new_path = LOGGER.input(
                         f"Full path to the NEW file to store as "
                         f"'{Path(config_dir) / (app_id + '.<ext>')}' (any extension): "
                     ).strip()
@@ -322,7 +322,7 @@ def init_sample_apps(
             if current_url:
                 prompt += f" (ENTER to keep: {current_url})"
             prompt += ": "
-            entered = input(prompt).strip()
+            entered = LOGGER.input(prompt).strip()
             if entered:
                 set_app_url(app_id, entered)
                 LOGGER.info(f"[INIT] URL set for '{app_id}'.")
@@ -437,7 +437,7 @@ def get_or_prompt_appstore_url(
 
     if prompt_if_missing:
         LOGGER.warn("[INIT] Global App Store URL not configured; prompting now.")
-        entered = input("Enter GLOBAL App Store URL to use as fallback for all apps: ").strip()
+        entered = LOGGER.input("Enter GLOBAL App Store URL to use as fallback for all apps: ").strip()
         if not entered:
             raise ValueError("App Store URL is required.")
         _write_appstore_url(entered, config_path)
@@ -539,7 +539,7 @@ def get_or_prompt_app_url(
         if url:
             return url
         if prompt_if_missing:
-            entered = input(f"Enter App Store URL for '{sid}' (e.g. market://details?id=..., https://...): ").strip()
+            entered = LOGGER.input(f"Enter App Store URL for '{sid}' (e.g. market://details?id=..., https://...): ").strip()
             if entered:
                 set_app_url(sid, entered, path=path)
                 return entered
@@ -556,7 +556,7 @@ def get_or_prompt_app_url(
 
     if prompt_if_missing:
         LOGGER.warn("[INIT] Global App Store URL not configured; prompting now.")
-        entered = input("Enter GLOBAL App Store URL to use as fallback for all apps: ").strip()
+        entered = LOGGER.input("Enter GLOBAL App Store URL to use as fallback for all apps: ").strip()
         if entered:
             _write_appstore_url(entered, store_config_path)
             return entered
@@ -677,12 +677,12 @@ def init_interactive_setup(
             existing = _find_first_app_file(app_id, config_dir)
             if existing:
                 LOGGER.info(f"[INIT] Current artifact for '{app_id}': {existing}")
-                choice = input(
+                choice = LOGGER.input(
                     f"Keep (K) / Replace (R) / Delete (D) this app under '{config_dir}' "
                     f"as '{app_id}.*'? [K]: "
                 ).strip().lower() or "k"
                 if choice.startswith("r"):
-                    new_path = input(
+                    new_path = LOGGER.input(
                         f"Full path to the NEW file to store as "
                         f"'{Path(config_dir) / (app_id + '.<ext>')}' (any extension): "
                     ).strip()
@@ -722,7 +722,7 @@ def init_interactive_setup(
             if current:
                 prompt += f" (ENTER to keep: {current})"
             prompt += ": "
-            entered = input(prompt).strip()
+            entered = LOGGER.input(prompt).strip()
             if entered:
                 set_app_url(app_id, entered)
                 LOGGER.info(f"[INIT] URL set for '{app_id}'.")
@@ -0,0 +1,48 @@
+"""
+DAB responses that are parsed once.
+DabClient.response() returns a DabResponse: the same pretty-printed JSON text callers always got (it is a str, so
+logging, string checks and the results JSON are unchanged), plus the payload bytes as received (.raw), the parsed
+body (.json(), cached) and the status code (.status). Validators, checkers and helpers read the body through
+response_json(), which only parses when it is handed a plain string.
+The parsed body is shared by everyone holding the response: treat it as read-only.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+
+class DabResponse(str):
+    def __new__(cls, body, raw: Optional[bytes] = None, status: Optional[int] = None):
+        self = super().__new__(cls, json.dumps(body, indent=2))
+        self.raw = raw
+        self._body = body
+        self.status = status if status is not None else (body.get("status") if isinstance(body, dict) else None)
+        return self
+
+    def json(self) -> Any:
+        return self._body
+
+    def pretty(self) -> str:
+        return str.__str__(self)
+
+
+def response_json(value) -> Any:
+    """Parsed body of a response as passed around the runner: DabResponse, JSON text/bytes or already parsed."""
+    if isinstance(value, DabResponse):
+        return value.json()
+    if isinstance(value, (dict, list)):
+        return value
+    return json.loads(value)
+
+
+def response_status(value, default=None):
+    """Status code of a response without parsing it again; `default` when it has none or is not JSON."""
+    if isinstance(value, DabResponse):
+        return default if value.status is None else value.status
+    try:
+        body = response_json(value)
+    except (TypeError, ValueError):
+        return default
+    return body.get("status", default) if isinstance(body, dict) else default
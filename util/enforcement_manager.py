@@ -1,4 +1,3 @@
-from singleton_decorator import singleton
 from typing import List, Dict
 from enum import Enum
 import base64
@@ -6,7 +5,10 @@ import tarfile
 import json
 import os
 import shutil
+import threading
 import time
+from util.settings_index import SettingsIndex, EMPTY_SETTINGS_INDEX
+from logger import LOGGER
 
 class Resolution:
     width: int
@@ -39,51 +41,125 @@ LOGS_COLLECTION_CATEGORIES = {"system", "application", "crash"}
 LOGS_COLLECTION_FOLDER = "logs"
 LOGS_COLLECTION_PACKAGE = f"{LOGS_COLLECTION_FOLDER}.tar.gz"
 
-@singleton
 class EnforcementManager:
-    def __init__(self):
-        self.supported_operations = set()
-        self.supported_keys = set()
-        self.supported_voice_assistants = set()
+    """
+    Per-device capability store.
+
+    `EnforcementManager(device_id)` returns the store for that device; calling it
+    without a device id returns the store bound to the current thread (see
+    `bind_device`), falling back to a process-wide default. Lookups are backed by
+    frozensets/dicts that are swapped atomically on write, so concurrent readers
+    never take the lock and every gate check is O(1).
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _binding = threading.local()
+
+    def __new__(cls, device_id=None):
+        key = device_id if device_id is not None else getattr(cls._binding, "device_id", None)
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._instances_lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    instance._init_state(key)
+                    cls._instances[key] = instance
+        return instance
+
+    def __init__(self, device_id=None):
+        # State is created once per device in __new__; repeated lookups must not reset it.
+        pass
+
+    def _init_state(self, device_id):
+        self.device_id = device_id
+        self._lock = threading.RLock()
+        self.supported_operations = frozenset()
+        self.supported_keys = frozenset()
+        self.supported_voice_assistants = []
+        self._voice_assistants_by_name = {}
         self.supported_settings = None
+        self.settings_index = EMPTY_SETTINGS_INDEX
         self.has_checked_settings = False
-        self.supported_applications = set()
+        self.supported_applications = frozenset()
+
+    @classmethod
+    def bind_device(cls, device_id):
+        """Make `EnforcementManager()` resolve to `device_id` for the calling thread."""
+        cls._binding.device_id = device_id
+        return cls(device_id)
+
+    @classmethod
+    def bound_device(cls):
+        return getattr(cls._binding, "device_id", None)
+
+    @classmethod
+    def reset(cls, device_id=None):
+        """Drop cached capabilities for one device (or all devices when None)."""
+        with cls._instances_lock:
+            if device_id is None:
+                cls._instances.clear()
+            else:
+                cls._instances.pop(device_id, None)
+
+    @staticmethod
+    def _names(items, field):
+        # operations/list may return plain strings or {"operation": "..."} objects
+        names = set()
+        for item in items or []:
+            name = item.get(field) if isinstance(item, dict) else item
+            if isinstance(name, str) and name:
+                names.add(name)
+        return frozenset(names)
 
     def add_supported_operation(self, operation):
-        self.supported_operations.add(operation)
+        with self._lock:
+            self.supported_operations = self.supported_operations | self._names([operation], "operation")
 
     def is_operation_supported(self, operation):
-        return not self.supported_operations or operation in self.supported_operations
+        ops = self.supported_operations
+        return not ops or operation in ops
+
+    def has_operation(self, operation):
+        """Strict membership test: False when the operations cache is empty."""
+        return operation in self.supported_operations
 
     def add_supported_operations(self, operations):
-        self.supported_operations = operations
+        with self._lock:
+            self.supported_operations = self._names(operations, "operation")
 
     def get_supported_operations(self):
         return self.supported_operations
-    
+
     def add_supported_key(self, key):
-        self.supported_keys.add(key)
+        with self._lock:
+            self.supported_keys = self.supported_keys | self._names([key], "keyCode")
 
     def is_key_supported(self, key):
-        return not self.supported_keys or key in self.supported_keys
+        keys = self.supported_keys
+        return not keys or key in keys
 
     def add_supported_keys(self, keys):
-        self.supported_keys = keys
+        with self._lock:
+            self.supported_keys = self._names(keys, "keyCode")
 
     def get_supported_keys(self):
         return self.supported_keys
-    
+
     def get_supported_voice_assistants(self, voice_assistant = None):
         if not voice_assistant:
             return self.supported_voice_assistants
-
-        for voice_system in self.supported_voice_assistants:
-            if voice_assistant == voice_system["name"]:
-                return voice_system
-        return None
+        return self._voice_assistants_by_name.get(voice_assistant)
 
     def set_supported_voice_assistants(self, voice_assistants):
-        self.supported_voice_assistants = voice_assistants
+        voice_assistants = list(voice_assistants) if voice_assistants else []
+        by_name = {}
+        for voice_system in voice_assistants:
+            if isinstance(voice_system, dict) and voice_system.get("name") not in by_name:
+                by_name[voice_system.get("name")] = voice_system
+        with self._lock:
+            self.supported_voice_assistants = voice_assistants
+            self._voice_assistants_by_name = by_name
 
     def get_voice_assistant(self, voice_assistant):
         return "AmazonAlexa" if len(self.supported_voice_assistants) == 0 else self.supported_voice_assistants[0]
@@ -92,12 +168,19 @@ class EnforcementManager:
         return self.has_checked_settings
 
     def set_supported_settings(self, settings):
-        self.supported_settings = settings
-        self.has_checked_settings = True
+        # Compile outside the lock; readers keep using the previous index until the swap.
+        index = SettingsIndex(settings)
+        with self._lock:
+            self.supported_settings = settings
+            self.settings_index = index
+            self.has_checked_settings = True
 
     def get_supported_settings(self):
         return self.supported_settings
 
+    def get_settings_index(self):
+        return self.settings_index
+
     def is_setting_supported(self, setting, value = None):
         """
         Checks if a setting is supported by the target.
@@ -132,10 +215,12 @@ class EnforcementManager:
         return ValidateCode.UNSUPPORT
 
     def add_supported_application(self, application):
-        self.supported_applications.add(application)
+        with self._lock:
+            self.supported_applications = self.supported_applications | {application}
 
     def is_application_supported(self, application):
-        return not self.supported_applications or application in self.supported_applications
+        apps = self.supported_applications
+        return not apps or application in apps
 
     def verify_logs_chunk(self, tester, logs):
         previous_remainingChunks = -1
@@ -149,7 +234,7 @@ class EnforcementManager:
             if not chunkData:
                 if currentTime - startTime > 90:
                     validate_state = False
-                    print(f"More than 90s without receiving logs chunk. Timeout!")
+                    LOGGER.warn(f"More than 90s without receiving logs chunk. Timeout!")
                     logs.append(f"[FAILED] More than 90s without receiving logs chunk. Timeout!.")
                     break
                 else:
@@ -159,11 +244,11 @@ class EnforcementManager:
             remainingChunks = chunkData["remainingChunks"]
             if previous_remainingChunks != -1 and remainingChunks != previous_remainingChunks - 1:
                 validate_state = False
-                print(f"Lost the logs chunk with 'remainingChunks':{previous_remainingChunks - 1}.")
+                LOGGER.warn(f"Lost the logs chunk with 'remainingChunks':{previous_remainingChunks - 1}.")
                 logs.append(f"[FAILED] Lost the logs chunk with 'remainingChunks':{previous_remainingChunks - 1}.")
                 break
             if remainingChunks != previous_remainingChunks:
-                print(chunkData)
+                LOGGER.info(str(chunkData))
                 all_logArchives.extend(base64.b64decode(chunkData["logArchive"]))
                 logs.append(json.dumps(chunkData))
                 previous_remainingChunks = remainingChunks
@@ -175,11 +260,11 @@ class EnforcementManager:
             try:
                 with open(LOGS_COLLECTION_PACKAGE, 'wb') as f:
                     f.write(all_logArchives)
-                    print(f"Received all log chunks, and combined into log.tar.gz file.")
+                    LOGGER.result(f"Received all log chunks, and combined into log.tar.gz file.")
                     logs.append(f"Received all log chunks, and combined into log.tar.gz file.")
             except Exception as e:
                 validate_state = False
-                print(f"[Error] Combine chunks failed: {str(e)}")
+                LOGGER.error(f"Combine chunks failed: {str(e)}")
                 logs.append(f"[FAILED] Combine chunks failed: {str(e)}")
 
         return validate_state
@@ -190,7 +275,7 @@ class EnforcementManager:
             with tarfile.open(LOGS_COLLECTION_PACKAGE, 'r:gz') as tar:
                 tar.extractall(LOGS_COLLECTION_FOLDER)
         except Exception as e:
-            print(f"[Error] Uncompress {LOGS_COLLECTION_PACKAGE}: {str(e)}")
+            LOGGER.error(f"Uncompress {LOGS_COLLECTION_PACKAGE}: {str(e)}")
             logs.append(f"[FAILED] Verify {LOGS_COLLECTION_PACKAGE} failed: {str(e)}")
             return False
 
@@ -205,7 +290,7 @@ class EnforcementManager:
             validate_state = True
         else:
             validate_state = False
-            print(f"The logs structure doesn't follows DAB requirement.")
+            LOGGER.warn(f"The logs structure doesn't follows DAB requirement.")
             logs.append(f"[FAILED] The logs structure doesn't follows DAB requirement.")
 
         return validate_state
@@ -214,13 +299,13 @@ class EnforcementManager:
         if os.path.exists(LOGS_COLLECTION_FOLDER):
             try:
                 shutil.rmtree(LOGS_COLLECTION_FOLDER)
-                print(f"Delete logs collection folder '{LOGS_COLLECTION_FOLDER}'.")
+                LOGGER.result(f"Delete logs collection folder '{LOGS_COLLECTION_FOLDER}'.")
             except Exception as e:
-                print(f"{str(e)}. Please delete logs collection folder {LOGS_COLLECTION_FOLDER} manually.")
+                LOGGER.warn(f"{str(e)}. Please delete logs collection folder {LOGS_COLLECTION_FOLDER} manually.")
 
         if os.path.exists(LOGS_COLLECTION_PACKAGE):
             try:
                 os.remove(LOGS_COLLECTION_PACKAGE)
-                print(f"Delete logs collection package '{LOGS_COLLECTION_PACKAGE}'.")
+                LOGGER.result(f"Delete logs collection package '{LOGS_COLLECTION_PACKAGE}'.")
             except Exception as e:
-                print(f"{str(e)}, Please delete logs collection package '{LOGS_COLLECTION_PACKAGE}' manually.")
+                LOGGER.warn(f"{str(e)}, Please delete logs collection package '{LOGS_COLLECTION_PACKAGE}' manually.")
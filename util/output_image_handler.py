@@ -1,7 +1,7 @@
 # util/output_image_handler.py
 from __future__ import annotations
 from typing import Any, Dict, Optional, Union
-import os, json, base64, re, datetime as dt, sys
+import os, json, binascii, datetime as dt, sys
 
 # ----------------- helpers -----------------
 
@@ -11,37 +11,104 @@ def _ts() -> str:
 def _safe(s: Optional[str]) -> str:
     return "".join(c if (c.isalnum() or c in "-_.:@") else "_" for c in (s or "device"))
 
-def _normalize_b64(s: str) -> str:
-    s = re.sub(r"\s+", "", s)
-    rem = len(s) % 4
-    if rem:
-        s += "=" * (4 - rem)
-    return s
-
-def _from_data_uri(v: str) -> str:
-    # Accept "data:image/png;base64,AAAA..." → return "AAAA..."
-    if isinstance(v, str) and v.startswith("data:image/"):
-        i = v.find(",")
-        if i != -1:
-            return v[i + 1 :]
-    return v
-
-def _extract_png_bytes(resp: Union[Dict[str, Any], str]) -> bytes:
-    """Extract base64 image bytes from response['outputImage'] or raise."""
+# outputImage is decoded straight from the raw MQTT payload: the base64 text is located with bytes.find (no JSON
+# parse), filtered and decoded CHUNK characters at a time (bytes.translate drops whitespace, the '\' of JSON '\/'
+# escapes and padding; a2b_base64 decodes whole quads), and written to a file or into a reusable buffer.
+# Peak extra memory is about one chunk instead of several copies of the whole image.
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_B64_DROP = bytes(c for c in range(256) if c not in _B64_ALPHABET)
+_FIELD = b'"outputImage"'
+CHUNK = 1 << 20
+
+def _b64_span(payload: bytes):
+    """(text, start, end) of the base64 image in a raw JSON payload, without the data-URI prefix."""
+    key = payload.find(_FIELD)
+    if key < 0:
+        raise ValueError("response['outputImage'] missing or empty")
+    i, n = key + len(_FIELD), len(payload)
+    while i < n and payload[i] in b" \t\r\n:":
+        i += 1
+    if i >= n or payload[i] != 0x22:
+        raise ValueError("response['outputImage'] is not a string")
+    start = i + 1
+    end = payload.find(b'"', start)
+    if end < 0:
+        raise ValueError("response['outputImage'] is not terminated")
+    if payload.count(b"\\", start, end) != payload.count(b"\\/", start, end):
+        # Escapes other than '\/' (e.g. line-wrapped base64): let the JSON decoder unescape the field
+        text = json.loads(payload[i:end + 1]).encode("ascii", "ignore")
+        return _b64_source({"outputImage": text})
+    if payload.startswith(b"data:", start):
+        comma = payload.find(b",", start, end)
+        if comma >= 0:
+            start = comma + 1
+    if start >= end:
+        raise ValueError("response['outputImage'] missing or empty")
+    return payload, start, end
+
+def _b64_source(resp: Union[Dict[str, Any], str, bytes, bytearray]):
+    """Raw payload bytes, a JSON string or an already parsed response → (text, start, end)."""
+    if isinstance(resp, (bytes, bytearray)):
+        return _b64_span(resp)
     if isinstance(resp, str):
-        resp = json.loads(resp)
+        return _b64_span(resp.encode("utf-8"))
     if not isinstance(resp, dict):
-        raise ValueError("response must be a dict or JSON string")
-
+        raise ValueError("response must be a dict, JSON string or payload bytes")
     raw = resp.get("outputImage")
-    if not isinstance(raw, str) or not raw.strip():
+    if isinstance(raw, str):
+        raw = raw.encode("ascii", "ignore")
+    if not isinstance(raw, (bytes, bytearray)) or not raw.strip():
         raise ValueError("response['outputImage'] missing or empty")
+    start = raw.find(b",") + 1 if raw.startswith(b"data:") else 0
+    return raw, start, len(raw)
 
-    b64 = _normalize_b64(_from_data_uri(raw))
+def _decode_b64(text, start, end, write) -> int:
+    """Decode text[start:end] chunk by chunk into write(); checks the PNG signature. Returns the byte count."""
+    carry, total = b"", 0
     try:
-        return base64.b64decode(b64, validate=False)
-    except Exception as e:
+        for pos in range(start, end, CHUNK):
+            part = carry + text[pos:min(pos + CHUNK, end)].translate(None, _B64_DROP)
+            cut = len(part) - len(part) % 4
+            carry = part[cut:]
+            if cut:
+                chunk = binascii.a2b_base64(part[:cut])
+                if not total and chunk[:8] != _PNG_SIGNATURE:
+                    raise ValueError("decoded outputImage is not a PNG (bad signature)")
+                write(chunk)
+                total += len(chunk)
+        if len(carry) == 1:
+            raise ValueError("base64 decode failed: truncated data")
+        if carry:
+            chunk = binascii.a2b_base64(carry + b"=" * (4 - len(carry)))
+            if not total and chunk[:8] != _PNG_SIGNATURE:
+                raise ValueError("decoded outputImage is not a PNG (bad signature)")
+            write(chunk)
+            total += len(chunk)
+    except binascii.Error as e:
         raise ValueError(f"base64 decode failed: {e}")
+    if not total:
+        raise ValueError("response['outputImage'] missing or empty")
+    return total
+
+def _extract_png_bytes(resp: Union[Dict[str, Any], str, bytes, bytearray], buffer: Optional[bytearray] = None):
+    """
+    Decode response['outputImage'] (raw payload bytes, JSON string or dict) or raise ValueError.
+    With `buffer`, the PNG is decoded into it (resized to fit, reused across calls) and the buffer is returned.
+    """
+    text, start, end = _b64_source(resp)
+    if buffer is None:
+        parts = []
+        _decode_b64(text, start, end, parts.append)
+        return b"".join(parts)
+    size = 0
+    def write(chunk):
+        nonlocal size
+        buffer[size:size + len(chunk)] = chunk
+        size += len(chunk)
+    _decode_b64(text, start, end, write)
+    del buffer[size:]
+    return buffer
 
 def _dir_of(path_like: Optional[str]) -> Optional[str]:
     if not path_like:
@@ -80,22 +147,31 @@ def _detect_results_root(fallback_root: Optional[str]) -> str:
     # 4) Final fallback
     return "./test_result"
 
-def _save_png_bytes(png: bytes, results_root: str, device_id: Optional[str], prefix: Optional[str]) -> str:
+def _save_png(resp, results_root: str, device_id: Optional[str], prefix: Optional[str]) -> str:
+    """Stream the decoded image to <results_root>/images/<device>-<prefix>-<ts>.png; no partial file is left."""
+    text, start, end = _b64_source(resp)
     images_dir = os.path.join(results_root or ".", "images")
     os.makedirs(images_dir, exist_ok=True)
     out_path = os.path.join(
         images_dir,
         f"{_safe(device_id)}-{_safe(prefix or 'output_image')}-{_ts()}.png",
     )
-    with open(out_path, "wb") as f:
-        f.write(png)
+    try:
+        with open(out_path, "wb") as f:
+            _decode_b64(text, start, end, f.write)
+    except Exception:
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        raise
     return os.path.abspath(out_path)
 
 # ----------------- public APIs -----------------
 
 def save_output_image(
     *,
-    response: Union[Dict[str, Any], str],
+    response: Union[Dict[str, Any], str, bytes],
     device_id: Optional[str],
     results_root: Optional[str] = "./test_result",
     filename_prefix: Optional[str] = "output_image",
@@ -109,9 +185,8 @@ def save_output_image(
     This function *auto-detects* the real results JSON directory if possible
     (env/argv) so images land next to the user's -o path without changing other code.
     """
-    png = _extract_png_bytes(response)
     root = _detect_results_root(results_root)
-    return _save_png_bytes(png, root, device_id, filename_prefix)
+    return _save_png(response, root, device_id, filename_prefix)
 
 def handle_output_image_response(
     resp: Union[Dict[str, Any], str],
@@ -123,9 +198,8 @@ def handle_output_image_response(
     Uses the *exact* results JSON path provided by the writer.
     """
     try:
-        png = _extract_png_bytes(resp)
         root = _dir_of(results_json_path) or "."
-        path = _save_png_bytes(png, root, device_id, "output_image")
+        path = _save_png(resp, root, device_id, "output_image")
         return f"[INFO] Image saved: {path}"
     except Exception as e:
         return f"[WARN] Image save failed: {e}"
@@ -0,0 +1,106 @@
+"""
+Per-phase wall time of each test, stored on the result as phase_timings_ms and aggregated per suite.
+The runner opens one PhaseTimer per test (DabTester.phase_timer) and wraps each step of the test in
+`with timer.phase(name):`. Phases do not nest: a step is timed once, under the name it was given.
+  conformance  unpack, payload, preflight_discovery, health_check, version_gate, capability_precheck,
+               request, validator, checker, render, return_to_home
+  functional   version_gate, preflight_discovery, health_check, test, return_to_home
+finish() adds "total" (wall time since the timer was created) and "other" (total minus the phases: logging,
+result bookkeeping and anything not wrapped in a phase).
+summarize() builds the end-of-suite table written to the results JSON as "phase_summary_ms"; "share" is the
+phase's part of the summed test wall time, so it shows e.g. how much of a run is preflight rather than requests.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+from util.tracing import TRACER
+
+TOTAL = "total"
+OTHER = "other"
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}  # first-seen order; ms rounded to 0.1
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            with TRACER.span(name, "phase"):
+                yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float):
+        self.timings[name] = round(self.timings.get(name, 0.0) + ms, 1)
+
+    def attach(self, result):
+        """Expose the timings on `result` (same dict, so phases timed after this still show up)."""
+        if result is not None:
+            try:
+                result.phase_timings_ms = self.timings
+            except Exception:
+                pass
+        return result
+
+    def finish(self) -> Dict[str, float]:
+        total = round((time.perf_counter() - self.started) * 1000, 1)
+        measured = sum(v for k, v in self.timings.items() if k not in (TOTAL, OTHER))
+        self.timings[OTHER] = round(max(0.0, total - measured), 1)
+        self.timings[TOTAL] = total
+        return self.timings
+
+
+def _timings_of(result):
+    if isinstance(result, dict):
+        return result.get("phase_timings_ms")
+    return getattr(result, "phase_timings_ms", None)
+
+
+def summarize(results: Iterable) -> Dict[str, dict]:
+    """{phase: {tests, total, mean, max, share}} over the results that carry phase_timings_ms."""
+    stats: Dict[str, dict] = {}
+    wall, tests = 0.0, 0
+    for r in results:
+        timings = _timings_of(r)
+        if not isinstance(timings, dict):
+            continue
+        tests += 1
+        wall += float(timings.get(TOTAL, 0.0) or 0.0)
+        for name, ms in timings.items():
+            if name == TOTAL:
+                continue
+            s = stats.setdefault(name, {"tests": 0, "total": 0.0, "max": 0.0})
+            s["tests"] += 1
+            s["total"] += float(ms)
+            s["max"] = max(s["max"], float(ms))
+    for s in stats.values():
+        s["mean"] = round(s["total"] / s["tests"], 1)
+        s["share"] = round(s["total"] / wall, 3) if wall else 0.0
+        s["total"] = round(s["total"], 1)
+        s["max"] = round(s["max"], 1)
+    ordered = dict(sorted(stats.items(), key=lambda kv: -kv[1]["total"]))
+    if wall:
+        ordered[TOTAL] = {"tests": tests, "total": round(wall, 1)}
+    return ordered
+
+
+def format_table(summary: Dict[str, dict]) -> List[str]:
+    """Lines of the end-of-suite phase table (largest share first)."""
+    if not summary:
+        return []
+    lines = [f"{'Phase':<20} {'Tests':>5} {'Total':>11} {'Mean':>9} {'Max':>9} {'Share':>6}"]
+    for name, s in summary.items():
+        if name == TOTAL:
+            continue
+        lines.append(f"{name:<20} {s['tests']:>5} {s['total'] / 1000:>10.1f}s {s['mean']:>7.0f}ms "
+                     f"{s['max']:>7.0f}ms {s['share'] * 100:>5.1f}%")
+    if TOTAL in summary:
+        lines.append(f"{'test wall time':<20} {summary[TOTAL]['tests']:>5} {summary[TOTAL]['total'] / 1000:>10.1f}s")
+    return lines
@@ -0,0 +1,169 @@
+"""
+Per-test profiling of the harness itself (--profile, --profile-mem).
+  --profile [DIR]        every test runs under cProfile: DIR/<test_id>.prof per test (open with pstats, snakeviz...)
+                         and, at the end of the run, DIR/hotspots.txt with the merged profile of all tests: all
+                         functions by own time, then the suite's own functions (this repository) by own and by
+                         cumulative time. Own time of suite functions is harness CPU: waiting for the device is
+                         spent in lock/socket builtins, not in them
+  --profile-mem [TOP_N]  tracemalloc around every test: peak traced memory (and its growth over the start of the
+                         test) and the TOP_N source lines whose retained allocations grew the most, appended to
+                         DIR/memory.jsonl
+Conformance tests are profiled from payload resolution to return-to-home, functional tests around their test
+function. Only the runner thread is profiled; time spent waiting for the device shows up as lock waits.
+tracemalloc slows allocation-heavy code down noticeably: use --profile-mem to find memory hogs, not for timing.
+"""
+
+from __future__ import annotations
+
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import tracemalloc
+from contextlib import contextmanager
+
+from logger import LOGGER
+
+DEFAULT_PROFILE_DIR = "./test_result/profile"
+DEFAULT_MEM_TOP = 10
+HOTSPOTS = 25  # rows per section of hotspots.txt
+CONSOLE_HOTSPOTS = 10
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+# allocations made by the profiler itself are not the test's
+_MEM_IGNORE = tuple(tracemalloc.Filter(False, path) for path in (
+    tracemalloc.__file__, cProfile.__file__, pstats.__file__, __file__, "<frozen importlib._bootstrap>"))
+
+
+def _own(path) -> bool:
+    # builtins are reported as "~", generated code as "<...>"
+    return os.path.isabs(path) and path.startswith(_ROOT + os.sep) and "site-packages" not in path
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.out_dir = DEFAULT_PROFILE_DIR
+        self.cpu = False
+        self.mem_top = 0
+        self.profiled = 0
+        self._merged = None
+        self._active = False
+
+    def start(self, out_dir=None, cpu=True, mem_top=0):
+        self.out_dir = out_dir or DEFAULT_PROFILE_DIR
+        self.cpu, self.mem_top = bool(cpu), int(mem_top or 0)
+        self.enabled = self.cpu or self.mem_top > 0
+        if not self.enabled:
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        if self.mem_top and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        atexit.register(self.report)
+        modes = [m for m, on in (("cProfile", self.cpu), (f"tracemalloc top-{self.mem_top}", self.mem_top)) if on]
+        LOGGER.info(f"Profiling each test ({' + '.join(modes)}) into {os.path.abspath(self.out_dir)}.")
+
+    @contextmanager
+    def test(self, test_id):
+        """Profile the enclosed block as test `test_id` (no-op when disabled or already inside a profiled test)."""
+        if not self.enabled or self._active:
+            yield
+            return
+        self._active = True
+        prof = cProfile.Profile() if self.cpu else None
+        before = None
+        if self.mem_top:
+            before = tracemalloc.take_snapshot().filter_traces(_MEM_IGNORE)
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        try:
+            if prof is not None:
+                prof.enable()
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+            self._active = False
+            self.profiled += 1
+            name = _UNSAFE.sub("_", str(test_id)) or "test"
+            try:
+                if before is not None:
+                    self._save_mem(test_id, before, base)
+                if prof is not None:
+                    self._save_cpu(name, prof)
+            except (OSError, ValueError, TypeError) as e:
+                LOGGER.warn(f"[PROFILE] Could not write the profile of '{test_id}': {e}")
+
+    def _save_cpu(self, name, prof):
+        prof.dump_stats(os.path.join(self.out_dir, f"{name}.prof"))
+        if self._merged is None:
+            self._merged = pstats.Stats(prof)
+        else:
+            self._merged.add(prof)
+
+    def _save_mem(self, test_id, before, base):
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(_MEM_IGNORE)
+        grown = sorted((st for st in after.compare_to(before, "lineno") if st.size_diff > 0),
+                       key=lambda st: st.size_diff, reverse=True)
+        top = []
+        for stat in grown[: self.mem_top]:
+            frame = stat.traceback[0]
+            where = os.path.relpath(frame.filename, _ROOT) if _own(frame.filename) else frame.filename
+            top.append({"where": f"{where}:{frame.lineno}", "size_diff_kb": round(stat.size_diff / 1024, 1),
+                        "count_diff": stat.count_diff})
+        record = {"test_id": test_id, "peak_kb": round(peak / 1024, 1), "peak_growth_kb": round((peak - base) / 1024, 1),
+                  "top": top}
+        with open(os.path.join(self.out_dir, "memory.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        if top:
+            LOGGER.info(f"[PROFILE] {test_id}: peak +{record['peak_growth_kb']:.0f} KiB; top growth {top[0]['where']} "
+                        f"(+{top[0]['size_diff_kb']:.0f} KiB)")
+
+    # ---------- end of run ----------
+    def _own_rows(self, key):
+        """(file, line, func, calls, tottime, cumtime) of this repository's functions, largest `key` first."""
+        rows = [(path, line, func, nc, tt, ct) for (path, line, func), (cc, nc, tt, ct, _) in self._merged.stats.items()
+                if _own(path)]
+        return sorted(rows, key=lambda r: r[key], reverse=True)
+
+    def hotspots(self) -> str:
+        """Merged profile of all tests as text (hotspots.txt)."""
+        if self._merged is None:
+            return ""
+        out = io.StringIO()
+        stats = self._merged
+        stats.stream = out
+        out.write(f"Merged cProfile of {self.profiled} test(s)\n\n== All code by own time ==\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(HOTSPOTS)
+        for title, key in (("Suite code by own time (harness CPU)", 4), ("Suite code by cumulative time", 5)):
+            out.write(f"\n== {title} ==\n{'tottime':>10} {'cumtime':>10} {'calls':>9}  function\n")
+            for path, line, func, calls, tt, ct in self._own_rows(key)[:HOTSPOTS]:
+                out.write(f"{tt:>10.3f} {ct:>10.3f} {calls:>9}  {os.path.relpath(path, _ROOT)}:{line}({func})\n")
+        return out.getvalue()
+
+    def report(self):
+        if not self.enabled or not self.profiled:
+            return
+        if self._merged is not None:
+            path = os.path.join(self.out_dir, "hotspots.txt")
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(self.hotspots())
+            except OSError as e:
+                LOGGER.warn(f"[PROFILE] Could not write {path}: {e}")
+            LOGGER.result(f"[PROFILE] Harness CPU by function over {self.profiled} test(s) (own time, cumulative):")
+            for path, line, func, calls, tt, ct in self._own_rows(4)[:CONSOLE_HOTSPOTS]:
+                LOGGER.result(f"[PROFILE] {tt:8.3f}s {ct:9.3f}s  {os.path.relpath(path, _ROOT)}:{line}({func}) x{calls}")
+            LOGGER.result(f"[PROFILE] Per-test .prof files and hotspots.txt: {os.path.abspath(self.out_dir)}")
+        if self.mem_top:
+            LOGGER.result(f"[PROFILE] Allocation top-{self.mem_top} per test: "
+                          f"{os.path.abspath(os.path.join(self.out_dir, 'memory.jsonl'))}")
+
+
+# Shared singleton
+PROFILER = Profiler()
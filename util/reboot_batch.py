@@ -0,0 +1,195 @@
+"""
+Reboot-batched persistence verification (opt-in via --batch-reboots).
+Functional tests that verify something survives a restart are written as phases with
+@reboot_phases(before, after, restart):
+  before(ctx)  -> bool   header, set up / record the "before" state; False if the test already concluded (result set)
+  restart(ctx) -> bool   the test's own restart; False if the device did not come back (result set)
+  after(ctx)   -> None   verify the "after" state and set ctx.result.test_result
+The test function itself is `return run_reboot_check(<the function>, dab_topic, test_name, tester, device_id)`,
+which runs before → restart → after. RebootBatch runs every selected test's before-phase, performs ONE fire-and-forget
+system/restart, waits until health-check/get reports healthy, and then runs all after-phases. Either way each test
+keeps its own TestResult and logs; the runner emits them in list order.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from logger import LOGGER
+from result_json import TestResult
+from util.test_case import as_tuple
+
+RESTART_SETTLE_WAIT = 20       # seconds before the first health poll
+DEVICE_REBOOT_WAIT = 180       # max seconds to wait for a healthy device
+HEALTH_CHECK_INTERVAL = 5
+
+
+class RebootPhases:
+    __slots__ = ("before", "after", "restart", "operation")
+
+    def __init__(self, before: Callable, after: Callable, restart: Callable, operation=None):
+        self.before = before
+        self.after = after
+        self.restart = restart
+        self.operation = operation
+
+
+def reboot_phases(before: Callable, after: Callable, restart: Callable, operation=None):
+    """Attach the phases of a reboot check to its functional test (`operation` defaults to the test's topic)."""
+    def deco(func):
+        func.reboot_phases = RebootPhases(before, after, restart, operation)
+        return func
+    return deco
+
+
+def phases_of(func) -> Optional[RebootPhases]:
+    return getattr(func, "reboot_phases", None)
+
+
+class RebootContext:
+    """Per-test state carried from the before-phase to the after-phase."""
+
+    def __init__(self, dab_topic, test_name, tester, device_id, operation=None):
+        self.dab_topic = dab_topic
+        self.test_name = test_name
+        self.tester = tester
+        self.device_id = device_id
+        from dab_tester import to_test_id  # dab_tester imports this module
+        self.test_id = to_test_id(f"{dab_topic}/{test_name}")
+        self.logs: List[str] = []
+        self.result = TestResult(self.test_id, device_id, operation or dab_topic, "{}", "UNKNOWN", "", self.logs)
+        self.data: Dict[str, object] = {}
+        self.summary: Dict[str, object] = {}  # extra key=value fields of the [SUMMARY] line
+
+    def log(self, line, level="result"):
+        getattr(LOGGER, level)(line)
+        self.logs.append(line)
+
+    def finish(self, outcome, message):
+        self.result.test_result = outcome
+        self.log(f"[RESULT] {outcome} — {message}")
+
+    def close(self, **extra) -> TestResult:
+        fields = {**self.summary, **extra, "test_id": self.test_id, "device": self.device_id}
+        outcome = getattr(self.result, "test_result", self.result.outcome)
+        self.log(f"[SUMMARY] outcome={outcome}, " + ", ".join(f"{k}={v}" for k, v in fields.items()))
+        return self.result
+
+
+def _run_phase(ctx, phase) -> bool:
+    from functionals.functional_helpers import UnsupportedOperationError
+    try:
+        return bool(phase(ctx))
+    except UnsupportedOperationError as e:
+        ctx.finish("OPTIONAL_FAILED", f"Operation '{e.topic}' is not supported.")
+    except Exception as e:
+        ctx.finish("SKIPPED", f"An unexpected error occurred: {e}")
+    return False
+
+
+def run_reboot_check(func, dab_topic, test_name, tester, device_id) -> TestResult:
+    """Standalone run of a @reboot_phases test: before-phase, its own restart, after-phase."""
+    phases = phases_of(func)
+    ctx = RebootContext(dab_topic, test_name, tester, device_id, phases.operation)
+    if _run_phase(ctx, phases.before) and _run_phase(ctx, phases.restart):
+        _run_phase(ctx, phases.after)
+    return ctx.close()
+
+
+def restart_and_wait_healthy(tester, device_id, logs=None, timeout=DEVICE_REBOOT_WAIT,
+                             step="[STEP] Rebooting the device.") -> bool:
+    """Send system/restart (fire-and-forget) and poll health-check/get until the device reports healthy."""
+    from functionals.functional_helpers import fire_and_forget_restart
+
+    def note(line, level="result"):
+        getattr(LOGGER, level)(line)
+        if logs is not None:
+            logs.append(line)
+
+    note(step)
+    # the device goes down before it can answer: waiting for the response would only time out
+    fire_and_forget_restart(tester.dab_client, device_id)
+    tester.ui_state.mark_dirty(device_id)
+    note(f"[WAIT] {RESTART_SETTLE_WAIT}s before polling health (max {timeout}s).", "info")
+    time.sleep(RESTART_SETTLE_WAIT)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            rc = tester.execute_cmd(device_id, "health-check/get", "{}", fresh=True)
+            body = json.loads(tester.dab_client.response() or "{}")
+            if rc == 0 and body.get("healthy"):
+                note("[INFO] Device is healthy after reboot.")
+                return True
+        except Exception:
+            pass  # device still rebooting
+        time.sleep(HEALTH_CHECK_INTERVAL)
+    note(f"[WARN] Device did not report healthy within {timeout}s after reboot.", "warn")
+    return False
+
+
+class RebootBatch:
+    """
+    Runs the before/after phases of `cases` around a single restart. The batch
+    executes lazily on the first result() call so it happens at the position of
+    the first batched test in the run.
+    """
+
+    def __init__(self, tester, device_id, cases: Sequence[Tuple[int, tuple]]):
+        self.tester = tester
+        self.device_id = device_id
+        self.cases = list(cases)
+        self.indices = frozenset(i for i, _ in self.cases)
+        self._results: Optional[Dict[int, TestResult]] = None
+
+    def covers(self, index) -> bool:
+        return index in self.indices
+
+    def result(self, index) -> Optional[TestResult]:
+        if self._results is None:
+            self._results = self.__run()
+        return self._results.get(index)
+
+    def __run(self) -> Dict[int, TestResult]:
+        LOGGER.result(f"[BATCH] Reboot batch: running setup for {len(self.cases)} persistence check(s).")
+        contexts: List[Tuple[int, RebootContext, RebootPhases]] = []
+        ready: List[Tuple[RebootContext, RebootPhases]] = []
+        for index, case in self.cases:
+            dab_topic, _category, func, test_name = case[:4]
+            phases = phases_of(func)
+            ctx = RebootContext(dab_topic, test_name, self.tester, self.device_id, phases.operation)
+            contexts.append((index, ctx, phases))
+            if _run_phase(ctx, phases.before):
+                ready.append((ctx, phases))
+
+        if ready:
+            shared_logs: List[str] = []
+            healthy = restart_and_wait_healthy(self.tester, self.device_id, shared_logs,
+                                               step="[STEP] Rebooting the device once for all batched persistence checks.")
+            for ctx, phases in ready:
+                ctx.logs.extend(shared_logs)
+                if not healthy:
+                    ctx.finish("FAILED", f"Device did not become healthy within {DEVICE_REBOOT_WAIT}s after reboot.")
+                    continue
+                _run_phase(ctx, phases.after)
+
+        return {index: ctx.close(batched_reboot=True) for index, ctx, _phases in contexts}
+
+
+def collect_batchable(functional_tests: Sequence, dab_version=None) -> List[Tuple[int, tuple]]:
+    """(index, case) for every functional case that declares reboot phases and fits the device DAB version."""
+    from packaging.version import Version, InvalidVersion
+    picked = []
+    for index, case in enumerate(functional_tests):
+        if not isinstance(as_tuple(case), tuple) or len(case) < 4 or phases_of(case[2]) is None:
+            continue
+        required = case[4] if len(case) > 4 else "2.0"
+        try:
+            if dab_version and Version(str(dab_version)) < Version(str(required)):
+                continue
+        except InvalidVersion:
+            pass
+        picked.append((index, case))
+    return picked
@@ -0,0 +1,182 @@
+"""
+Interceptor chain around DAB request dispatch.
+DabTester.execute_cmd() sends every request through a RequestPipeline; interceptors registered on it can
+rewrite payloads, record traffic, collect metrics, serve cached responses or emit trace events.
+Each interceptor implements handle(ctx, call_next) and returns the dispatch code (0 = status 200, 1 = otherwise).
+Interceptors may declare the topics they care about; the pipeline builds and caches one chain per topic,
+so a topic nobody intercepts is dispatched straight to the client with no per-call overhead.
+Disabled interceptors are dropped from the chain when it is rebuilt (set_enabled / register / unregister).
+Ordering: lower `priority` runs first (outermost); ties keep registration order.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class RequestContext:
+    """Mutable request state handed down the chain."""
+
+    __slots__ = ("device_id", "topic", "body", "options", "code")
+
+    def __init__(self, device_id, topic, body, options=None):
+        self.device_id = device_id
+        self.topic = topic
+        self.body = body
+        self.options = options or {}
+        self.code = None
+
+
+class Interceptor:
+    """
+    Base class for pipeline hooks. Override handle(); call call_next(ctx) to continue
+    the chain, or return a code without calling it to short-circuit dispatch.
+    `topics=None` means every topic.
+    """
+
+    name = "interceptor"
+    priority = 100
+    topics: Optional[Iterable[str]] = None
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+    def wants(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def handle(self, ctx, call_next):
+        return call_next(ctx)
+
+
+class CallableInterceptor(Interceptor):
+    """Wrap a plain handle(ctx, call_next) function as an interceptor."""
+
+    def __init__(self, name, handler, topics=None, priority=100, enabled=True):
+        super().__init__(enabled)
+        self.name = name
+        self.priority = priority
+        self.topics = frozenset(topics) if topics is not None else None
+        self._handler = handler
+
+    def handle(self, ctx, call_next):
+        return self._handler(ctx, call_next)
+
+
+class MetricsInterceptor(Interceptor):
+    """Per-topic request counts, failures and dispatch time."""
+
+    name = "metrics"
+    priority = 10
+
+    def __init__(self, enabled=True):
+        super().__init__(enabled)
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def handle(self, ctx, call_next):
+        start = time.perf_counter()
+        code = call_next(ctx)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        s = self.stats.setdefault(ctx.topic, {"count": 0, "failed": 0, "total_ms": 0.0})
+        s["count"] += 1
+        s["total_ms"] += elapsed_ms
+        if code != 0:
+            s["failed"] += 1
+        return code
+
+
+class RecordingInterceptor(Interceptor):
+    """Keep a bounded in-memory record of requests and their responses."""
+
+    name = "recording"
+    priority = 20
+
+    def __init__(self, response_getter: Callable[[], str], limit=500, enabled=True):
+        super().__init__(enabled)
+        self._response_getter = response_getter
+        self.limit = limit
+        self.records: List[dict] = []
+
+    def handle(self, ctx, call_next):
+        code = call_next(ctx)
+        self.records.append({
+            "device_id": ctx.device_id,
+            "topic": ctx.topic,
+            "request": ctx.body,
+            "code": code,
+            "response": self._response_getter(),
+        })
+        if len(self.records) > self.limit:
+            del self.records[: len(self.records) - self.limit]
+        return code
+
+
+class RequestPipeline:
+    def __init__(self, dispatch: Callable[[str, str, str], int]):
+        """
+        dispatch(device_id, topic, body) -> code performs the actual send.
+        """
+        self._dispatch = dispatch
+        self._interceptors: List[Interceptor] = []
+        self._chains: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    # ---- registration ----
+    def register(self, interceptor: Interceptor):
+        with self._lock:
+            if any(i.name == interceptor.name for i in self._interceptors):
+                raise ValueError(f"Interceptor '{interceptor.name}' is already registered.")
+            self._interceptors.append(interceptor)
+            # sort is stable, so equal priorities keep registration order
+            self._interceptors.sort(key=lambda i: i.priority)
+            self._chains = {}
+        return interceptor
+
+    def unregister(self, name):
+        with self._lock:
+            self._interceptors = [i for i in self._interceptors if i.name != name]
+            self._chains = {}
+
+    def get(self, name) -> Optional[Interceptor]:
+        for i in self._interceptors:
+            if i.name == name:
+                return i
+        return None
+
+    def set_enabled(self, name, enabled):
+        interceptor = self.get(name)
+        if interceptor is None:
+            return False
+        with self._lock:
+            interceptor.enabled = bool(enabled)
+            self._chains = {}
+        return True
+
+    def names(self):
+        return [i.name for i in self._interceptors]
+
+    # ---- dispatch ----
+    def _terminal(self, ctx):
+        ctx.code = self._dispatch(ctx.device_id, ctx.topic, ctx.body)
+        return ctx.code
+
+    def _chain_for(self, topic):
+        chain = self._chains.get(topic)
+        if chain is None:
+            active = [i for i in self._interceptors if i.enabled and i.wants(topic)]
+            if not active:
+                chain = False  # no interceptor cares → raw dispatch
+            else:
+                chain = self._terminal
+                for interceptor in reversed(active):
+                    chain = partial(interceptor.handle, call_next=chain)
+            self._chains[topic] = chain
+        return chain
+
+    def send(self, device_id, topic, body="{}", **options):
+        chain = self._chain_for(topic)
+        if chain is False:
+            return self._dispatch(device_id, topic, body)
+        return chain(RequestContext(device_id, topic, body, options))
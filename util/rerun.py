@@ -0,0 +1,150 @@
+"""
+Incremental re-run support (--rerun-from results.json --only FAILED,SKIPPED).
+select_test_ids() reads a previous write_test_result_json() output and returns the test ids whose outcome is in
+the requested set; main.py matches them against the suite tuples with to_test_id() and runs only those.
+merge_rerun_results() then folds the new results back into the original file: every re-run entry replaces
+its previous one and carries a "rerun" block (previous outcome, time, results file) for provenance, a "reruns"
+history is kept at the top level, and result_summary is recomputed from the merged list.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List
+
+from util.phase_timer import summarize as summarize_phases
+
+DEFAULT_RERUN_OUTCOMES = ("FAILED", "SKIPPED")
+
+
+def outcome_of(entry) -> str:
+    """Same precedence as the JSON writer: test_result first, then outcome."""
+    if not isinstance(entry, dict):
+        return ""
+    return entry.get("test_result") or entry.get("outcome") or ""
+
+
+def parse_outcomes(spec) -> frozenset:
+    items = [s.strip().upper() for s in str(spec or "").split(",") if s.strip()]
+    return frozenset(items or DEFAULT_RERUN_OUTCOMES)
+
+
+def load_results(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("test_result_list"), list):
+        raise ValueError(f"'{path}' is not a results file (no test_result_list).")
+    return data
+
+
+def select_test_ids(previous: dict, outcomes: Iterable[str]) -> List[str]:
+    """Ids of previous results whose outcome is in `outcomes`, in file order, without duplicates."""
+    wanted = frozenset(outcomes)
+    picked, seen = [], set()
+    for entry in previous.get("test_result_list", []):
+        test_id = entry.get("test_id") if isinstance(entry, dict) else None
+        if test_id and outcome_of(entry) in wanted and test_id not in seen:
+            seen.add(test_id)
+            picked.append(test_id)
+    return picked
+
+
+def default_rerun_output(previous_path) -> str:
+    root, ext = os.path.splitext(previous_path)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{root}.rerun-{stamp}{ext or '.json'}"
+
+
+def summarize(entries: List[dict]) -> Dict[str, object]:
+    """
+    result_summary block computed the same way write_test_result_json() does.
+    A PASS that still has deferred questions (review_pending) is only provisional: it is counted as pending
+    review, not passed, and the suite is not overall_passed until --review settles it.
+    """
+    counts = defaultdict(int)
+    for e in entries:
+        outcome = outcome_of(e)
+        if outcome == "PASS" and e.get("review_pending"):
+            outcome = "PENDING_REVIEW"
+        counts[outcome] += 1
+    failed, skipped, pending = counts["FAILED"], counts["SKIPPED"], counts["PENDING_REVIEW"]
+    return {
+        "tests_executed": len(entries),
+        "tests_passed": counts["PASS"],
+        "tests_failed": failed,
+        "tests_optional_failed": counts["OPTIONAL_FAILED"],
+        "tests_skipped": skipped,
+        "tests_pending_review": pending,
+        "overall_passed": (failed == 0 and skipped == 0 and pending == 0),
+    }
+
+
+def merge_rerun_results(previous_path, rerun_path, outcomes: Iterable[str]) -> Dict[str, int]:
+    """
+    Replace the re-run entries of `previous_path` in place with those from `rerun_path`.
+    Returns counts: replaced, added (ids the original file did not have), missing (selected but not re-run).
+    """
+    previous = load_results(previous_path)
+    rerun = load_results(rerun_path)
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    wanted = frozenset(outcomes)
+
+    fresh = defaultdict(deque)
+    for entry in rerun["test_result_list"]:
+        if isinstance(entry, dict) and entry.get("test_id"):
+            fresh[entry["test_id"]].append(entry)
+
+    merged, replaced, missing = [], 0, 0
+    for entry in previous["test_result_list"]:
+        test_id = entry.get("test_id") if isinstance(entry, dict) else None
+        queue = fresh.get(test_id)
+        if queue and outcome_of(entry) in wanted:
+            new = dict(queue.popleft())
+            # Chain of earlier outcomes; "at" is None for the original run
+            earlier = entry.get("rerun") if isinstance(entry.get("rerun"), dict) else {}
+            history = list(earlier.get("history", []))
+            history.append({"outcome": outcome_of(entry), "at": earlier.get("rerun_at")})
+            new["rerun"] = {
+                "previous_outcome": outcome_of(entry),
+                "rerun_at": now,
+                "results_file": os.path.abspath(rerun_path),
+                "history": history,
+            }
+            merged.append(new)
+            replaced += 1
+        else:
+            if test_id and outcome_of(entry) in wanted and not queue:
+                missing += 1
+            merged.append(entry)
+
+    # Ids the original file never had are appended; leftovers for known ids are dropped
+    known = {e.get("test_id") for e in previous["test_result_list"] if isinstance(e, dict)}
+    added = 0
+    for test_id, queue in fresh.items():
+        while queue and test_id not in known:
+            new = dict(queue.popleft())
+            new["rerun"] = {"previous_outcome": None, "rerun_at": now, "results_file": os.path.abspath(rerun_path)}
+            merged.append(new)
+            added += 1
+
+    previous["test_result_list"] = merged
+    previous["result_summary"] = summarize(merged)
+    previous["phase_summary_ms"] = summarize_phases(merged)
+    previous.setdefault("reruns", []).append({
+        "at": now,
+        "only": sorted(wanted),
+        "results_file": os.path.abspath(rerun_path),
+        "replaced": replaced,
+        "added": added,
+        "missing": missing,
+        "summary": rerun.get("result_summary", {}),
+    })
+
+    tmp = f"{previous_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(previous, f, indent=4, ensure_ascii=False)
+    os.replace(tmp, previous_path)
+    return {"replaced": replaced, "added": added, "missing": missing}
@@ -0,0 +1,137 @@
+"""
+Read-through cache for idempotent DAB queries, installed as a request pipeline interceptor.
+Cached topics and their TTLs (seconds) are listed in CACHE_TTLS; a hit replays the stored response into the
+DabClient so callers read it through dab_client.response() exactly as after a real round trip.
+Only status-200 responses are stored. Requests sent with fresh=True always reach the device and refresh the entry.
+Writes invalidate per INVALIDATION_RULES; restart / power / setup topics drop everything for the device,
+and any unrecognised non-query topic conservatively drops the short-lived state entries.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from typing import Dict, Tuple
+
+from util.request_pipeline import Interceptor
+
+ALL = "*"
+
+CACHE_TTLS: Dict[str, float] = {
+    "device/info": 600.0,
+    "version": 600.0,
+    "applications/get-state": 1.0,
+    "system/settings/get": 2.0,
+}
+
+INVALIDATION_RULES: Dict[str, Tuple[str, ...]] = {
+    "system/settings/set": ("system/settings/get",),
+    "applications/launch": ("applications/get-state",),
+    "applications/launch-with-content": ("applications/get-state",),
+    "applications/exit": ("applications/get-state",),
+    "applications/install": ("applications/get-state",),
+    "applications/install-from-app-store": ("applications/get-state",),
+    "applications/uninstall": ("applications/get-state",),
+    "applications/clear-data": ("applications/get-state",),
+    "content/open": ("applications/get-state",),
+    "input/key-press": ("applications/get-state",),
+    "input/long-key-press": ("applications/get-state",),
+    "system/restart": (ALL,),
+    "system/power-mode/set": (ALL,),
+    "system/setup/skip": (ALL,),
+}
+
+# Queries and side-channel operations that never change cached state
+NON_MUTATING = frozenset({
+    "operations/list",
+    "applications/list",
+    "input/key/list",
+    "system/settings/list",
+    "system/power-mode/get",
+    "voice/list",
+    "health-check/get",
+    "output/image",
+    "content/search",
+    "content/recommendations",
+    "device-telemetry/start",
+    "device-telemetry/stop",
+    "app-telemetry/start",
+    "app-telemetry/stop",
+    "system/logs/start-collection",
+    "system/logs/stop-collection",
+})
+
+STATE_TOPICS = ("applications/get-state", "system/settings/get")
+
+
+def _body_key(body):
+    if isinstance(body, (dict, list)):
+        return json.dumps(body, sort_keys=True)
+    try:
+        return json.dumps(json.loads(body or "{}"), sort_keys=True)
+    except Exception:
+        return str(body)
+
+
+class ResponseCacheInterceptor(Interceptor):
+    name = "response-cache"
+    priority = 30
+
+    def __init__(self, client, ttls=None, enabled=True):
+        super().__init__(enabled)
+        self._client = client
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---- invalidation ----
+    def invalidate(self, device_id=None, topics=(ALL,)):
+        with self._lock:
+            if ALL in topics:
+                if device_id is None:
+                    self._entries.clear()
+                    return
+                doomed = [k for k in self._entries if k[0] == device_id]
+            else:
+                doomed = [k for k in self._entries
+                          if k[1] in topics and (device_id is None or k[0] == device_id)]
+            for k in doomed:
+                self._entries.pop(k, None)
+
+    def __invalidate_for(self, device_id, topic):
+        if topic in NON_MUTATING or topic in self.ttls:
+            return
+        self.invalidate(device_id, INVALIDATION_RULES.get(topic, STATE_TOPICS))
+
+    # ---- interceptor ----
+    def handle(self, ctx, call_next):
+        ttl = self.ttls.get(ctx.topic)
+        if ttl is None:
+            code = call_next(ctx)
+            self.__invalidate_for(ctx.device_id, ctx.topic)
+            return code
+
+        key = (ctx.device_id, ctx.topic, _body_key(ctx.body))
+        if not ctx.options.get("fresh"):
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                _, status, response = entry
+                self._client.replay_response(status, copy.deepcopy(response))
+                ctx.code = 0
+                return 0
+
+        self.misses += 1
+        code = call_next(ctx)
+        if code == 0:
+            status, response = self._client.snapshot_response()
+            with self._lock:
+                self._entries[key] = (time.monotonic() + ttl, status, copy.deepcopy(response))
+        else:
+            with self._lock:
+                self._entries.pop(key, None)
+        return code
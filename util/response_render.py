@@ -0,0 +1,149 @@
+"""
+Bounded rendering of DAB responses into test logs.
+The full response stays in TestResult.response (and the results JSON); the logs get a flattened view of it:
+one "key: value" line per scalar, per list item and per nested key, with top-level list items indexed as item[i].
+The view is generated line by line and stops at the budget, so its cost does not grow with the response:
+  max_lines       lines rendered per response (0 = no limit)
+  max_line_chars  characters kept per line (0 = no limit)
+The budget comes from "response_log" in the runtime config (config.response_log), e.g.
+  "response_log": {"max_lines": 200, "max_line_chars": 500}
+Rendered lines are printed only in verbose mode, so only verbose runs render during the test. Otherwise
+log_response() records where the view belongs (result.response_view_at, kept in the results journal) and
+expand_response_views() renders it from result.response when the results JSON is written.
+Single-line response logs (execute_cmd_and_log) are capped at max_lines * max_line_chars characters.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from logger import LOGGER
+from util.dab_response import DabResponse
+
+LITERAL_EVAL_LIMIT = 64 * 1024  # legacy "['{', 'status: 200', ...]" texts are only re-joined when small
+FALLBACK_CHARS = 4096  # raw text logged when a response cannot be rendered at all
+
+
+def _budget(max_lines, max_line_chars):
+    import config
+    cfg = getattr(config, "response_log", None) or {}
+    if max_lines is None:
+        max_lines = int(cfg.get("max_lines", 0) or 0)
+    if max_line_chars is None:
+        max_line_chars = int(cfg.get("max_line_chars", 0) or 0)
+    return max_lines, max_line_chars
+
+
+def flatten(obj) -> Iterator[str]:
+    """Flattened lines of a parsed response, produced one at a time."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, list):
+                for item in value:  # no index for sub-items
+                    yield f"{key}: {item}"
+            elif isinstance(value, dict):
+                for sub_key, sub_val in value.items():  # one level, no indices
+                    yield f"{key}.{sub_key}: {sub_val}"
+            else:
+                yield f"{key}: {value}"
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):  # index only the top-level items
+            if isinstance(item, dict):
+                for key, value in item.items():
+                    if isinstance(value, list):
+                        for sub_item in value:
+                            yield f"item[{i}].{key}: {sub_item}"
+                    elif isinstance(value, dict):
+                        for sub_key, sub_val in value.items():
+                            yield f"item[{i}].{key}.{sub_key}: {sub_val}"
+                    else:
+                        yield f"item[{i}].{key}: {value}"
+            elif isinstance(item, list):
+                for sub_item in item:
+                    yield f"item[{i}]: {sub_item}"
+            else:
+                yield f"item[{i}]: {item}"
+    else:
+        yield str(obj)
+
+
+def _lines(resp) -> Iterator[str]:
+    if isinstance(resp, DabResponse):
+        return flatten(resp.json())
+    text = str(resp)
+    chunks = None
+    if text.startswith('[') and text.endswith(']') and len(text) <= LITERAL_EVAL_LIMIT:
+        try:
+            chunks = ast.literal_eval(text)
+            if isinstance(chunks, list):
+                text = " ".join(str(x) for x in chunks if str(x))
+        except Exception:
+            chunks = None
+    try:
+        return flatten(json.loads(text))
+    except Exception:
+        if isinstance(chunks, list):
+            return (str(chunk) for chunk in chunks)
+        return iter(text.splitlines())
+
+
+def clip(text: str, limit: int) -> str:
+    text = str(text)
+    if limit and len(text) > limit:
+        return f"{text[:limit]}... (+{len(text) - limit} chars)"
+    return text
+
+
+def render_response(resp, max_lines: Optional[int] = None, max_line_chars: Optional[int] = None) -> List[str]:
+    """Flattened, bounded view of a response (DabResponse, JSON text or legacy chunk list text)."""
+    max_lines, max_line_chars = _budget(max_lines, max_line_chars)
+    source = _lines(resp)
+    out = []
+    for line in (source if not max_lines else islice(source, max_lines)):
+        line = line.strip().replace("\n", " ")
+        if line:
+            out.append(clip(line, max_line_chars))
+    if max_lines and next(source, None) is not None:
+        out.append(f"... response view truncated after {max_lines} lines ({len(resp)} chars in total; "
+                   f"the full response is kept in the results JSON)")
+    return out
+
+
+def clip_response(text) -> str:
+    """Response text for a single log line, capped at max_lines * max_line_chars characters."""
+    max_lines, max_line_chars = _budget(None, None)
+    return clip(text, max_lines * max_line_chars)
+
+
+def log_response(test_result, resp, max_lines: Optional[int] = None, max_line_chars: Optional[int] = None):
+    """Add the bounded view of `resp` (test_result.response) to test_result.logs: now in verbose mode, else at report time."""
+    if not LOGGER.verbose and max_lines is None and max_line_chars is None:
+        test_result.response_view_at = len(test_result.logs)
+        return
+    for line in render_response(resp, max_lines, max_line_chars):
+        test_result.logs.append(line)
+        LOGGER.info(line)
+
+
+def expand_response_views(results):
+    """Render the views deferred by log_response() into the logs of `results`."""
+    for r in results:
+        at = getattr(r, "response_view_at", None)
+        if at is None:
+            continue
+        try:
+            del r.response_view_at
+        except AttributeError:
+            pass
+        resp = getattr(r, "response", None)
+        logs = getattr(r, "logs", None)
+        if not resp or not isinstance(logs, list):
+            continue
+        try:
+            lines = render_response(resp)
+        except Exception:
+            lines = [clip(resp, FALLBACK_CHARS)]
+        logs[at:at] = lines
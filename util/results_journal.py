@@ -0,0 +1,161 @@
+"""
+Crash-safe results journal.
+Every completed TestResult is appended to <results>.journal.jsonl as one JSON line and fsync'd before the next test
+starts, so a crash, Ctrl-C or sys_exit() mid-suite loses at most the test that was running.
+Line types:
+  {"type": "run",    "run_id": ..., "suite": ..., "started": ...}            written when a run (or a resumed session) opens
+  {"type": "result", "run_id": ..., "seq": n, "result": {TestResult fields}}
+  {"type": "review", "run_id": ..., "id": ..., "test_id": ..., "answer": ...}  a deferred check answered (review_queue.py)
+With --resume the journal is reopened for the same run id (the last one in the file unless --run-id is given),
+tests already recorded for it are skipped, and the final results JSON is assembled from the journal plus the
+tests run in this session. Without --resume a fresh journal is started.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import uuid
+from typing import Dict, List
+
+import jsons
+
+from logger import LOGGER
+from result_json import TestResult
+
+RESULT_FIELDS = ("test_id", "device_id", "operation", "request", "outcome", "response", "logs")
+
+
+def journal_path_for(results_path) -> str:
+    root, _ext = os.path.splitext(results_path)
+    return f"{root}.journal.jsonl"
+
+
+def new_run_id() -> str:
+    return f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _read_lines(path):
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-write; everything before it is intact
+                    LOGGER.warn(f"Ignoring an incomplete line in results journal '{path}'.")
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def append_record(path, record):
+    """Append one synced line to a journal another process may hold open (used by --review)."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def result_from_record(data: dict) -> TestResult:
+    """Rebuild a TestResult (plus dynamic attributes such as test_result) from its journaled form."""
+    r = TestResult(*(data.get(k, [] if k == "logs" else "") for k in RESULT_FIELDS))
+    for key, value in data.items():
+        if key not in RESULT_FIELDS:
+            try:
+                setattr(r, key, value)
+            except Exception:
+                pass
+    return r
+
+
+class ResultsJournal:
+    def __init__(self, path, suite_name, run_id=None, resume=False, results_path=None):
+        self.path = path
+        self.suite_name = suite_name
+        self.results_path = results_path
+        records = _read_lines(path) if resume else []
+        if resume and not run_id:
+            run_id = next((rec.get("run_id") for rec in reversed(records) if rec.get("type") == "run"), None)
+        self.run_id = run_id or new_run_id()
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._journaled = set()  # id() of results written in this session
+
+        prior = [rec for rec in records if rec.get("type") == "result" and rec.get("run_id") == self.run_id]
+        self._prior: List[dict] = [rec.get("result") or {} for rec in prior]
+        self._done = {d.get("test_id"): d.get("test_result") or d.get("outcome") for d in self._prior if d.get("test_id")}
+        self._seq = max((rec.get("seq", 0) for rec in prior), default=0)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if not resume:
+            open(path, "w", encoding="utf-8").close()
+        # Always append: --review may add lines to the journal while the run holds it open
+        self._fh = open(path, "a", encoding="utf-8")
+        if resume and self._fh.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+            if torn:
+                self._fh.write("\n")  # terminate a torn last line so the next record stays parseable
+        self.__write({"type": "run", "run_id": self.run_id, "suite": suite_name,
+                      "started": datetime.datetime.now().isoformat(timespec="seconds"), "resumed": bool(resume)})
+        if resume:
+            LOGGER.info(f"Resuming run '{self.run_id}' from '{path}': {len(self._prior)} result(s) already recorded.")
+
+    def __write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    # ---- recording ----
+    def append(self, result):
+        if result is None:
+            return
+        try:
+            data = json.loads(jsons.dumps(result))
+        except Exception as e:
+            LOGGER.warn(f"Could not journal result {getattr(result, 'test_id', '?')}: {e}")
+            return
+        self._seq += 1
+        self.__write({"type": "result", "run_id": self.run_id, "seq": self._seq, "result": data})
+        self._journaled.add(id(result))
+
+    # ---- resume ----
+    def completed(self) -> Dict[str, str]:
+        """test_id → outcome for tests recorded by earlier sessions of this run."""
+        return dict(self._done)
+
+    def is_completed(self, test_id) -> bool:
+        return test_id in self._done
+
+    def assemble(self, session_results) -> list:
+        """
+        Final result list: everything journaled for this run (earlier sessions and this one, in
+        journal order) followed by this session's results that were never journaled.
+        """
+        from util.review_queue import apply_reviews, group_reviews
+        lines = [rec for rec in _read_lines(self.path) if rec.get("run_id") == self.run_id]
+        records = [rec.get("result") or {} for rec in lines if rec.get("type") == "result"]
+        reviews = group_reviews(rec for rec in lines if rec.get("type") == "review")
+        for d in records:
+            apply_reviews(d, reviews.get(d.get("test_id"), []))
+        assembled = [result_from_record(d) for d in records]
+        assembled.extend(r for r in session_results if id(r) not in self._journaled)
+        return assembled
+
+    def close(self):
+        with self._lock:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
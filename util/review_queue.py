@@ -0,0 +1,275 @@
+"""
+Deferred manual verification (--verdict ...,deferred and --review).
+When a manual check is deferred, evidence is captured while the step runs (output/image screenshot, the test's
+response so far, timestamps) and a "question" line is appended to the review queue; the test continues with a
+provisional answer and its result carries review_pending = [question ids].
+`main.py --review` walks the unanswered questions in a batch, during or after the run (any number of devices can
+share one queue). Each answer is appended to the queue as an "answer" line and patched back:
+  - into the results journal of the run as a "review" record, applied when the results JSON is assembled;
+  - into the results JSON itself if it was already written and still lists the question as pending.
+Outcome rule once a test's questions are answered: answers that match the provisional ones confirm the recorded
+outcome (always, for negative tests); a 'no' where 'yes' was assumed makes the test FAILED; a 'yes' where 'no'
+was assumed, or a different choice, cannot be inferred and marks it SKIPPED so it is picked up by --rerun-from.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from logger import LOGGER
+
+REVIEW_QUEUE_PATH = "./test_result/review_queue.jsonl"
+EVIDENCE_DIR = "./test_result/review"
+
+_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def _append(path, record):
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _read(path) -> List[dict]:
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn line from a concurrent writer crash
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def capture_screenshot(tester, device_id, buffer=None) -> Optional[bytes]:
+    """
+    PNG bytes of a fresh output/image, or None when the device cannot provide one.
+    Decoded from the raw response payload; with `buffer` (bytearray) the PNG is decoded into it and it is returned.
+    """
+    from util.output_image_handler import _extract_png_bytes
+    if tester is None or not device_id:
+        return None
+    try:
+        tester.execute_cmd(device_id, "output/image", "{}", fresh=True)
+        if tester.dab_client.last_error_code() != 200:
+            return None
+        return _extract_png_bytes(tester.dab_client.response_payload(), buffer)
+    except Exception as e:
+        LOGGER.warn(f"[REVIEW] Screenshot capture failed: {e}")
+        return None
+
+
+class ReviewQueue:
+    def __init__(self, path=REVIEW_QUEUE_PATH, evidence_dir=EVIDENCE_DIR):
+        self.path = path
+        self.evidence_dir = evidence_dir
+
+    # ---- producer side (the run) ----
+    def add(self, request, provisional, tester=None) -> dict:
+        """Capture evidence for `request` and queue it. Returns the queued entry."""
+        qid = uuid.uuid4().hex[:12]
+        entry = {
+            "type": "question",
+            "id": qid,
+            "test_id": request.test_id,
+            "device_id": request.device_id,
+            "kind": request.kind,
+            "question": request.question,
+            "options": request.options,
+            "provisional": provisional,
+            "asked_at": _now(),
+            "evidence": self.__capture(qid, request, tester),
+        }
+        case = getattr(tester, "current_case", None)
+        if case is not None and case.test_id == request.test_id:
+            entry["negative"] = case.is_negative
+        journal = getattr(tester, "results_journal", None)
+        if journal is not None:
+            entry.update(run_id=journal.run_id, suite=journal.suite_name, journal=os.path.abspath(journal.path),
+                         results=os.path.abspath(journal.results_path) if journal.results_path else None)
+        _append(self.path, entry)
+        return entry
+
+    def __capture(self, qid, request, tester) -> dict:
+        evidence = {}
+        try:
+            os.makedirs(self.evidence_dir, exist_ok=True)
+        except OSError:
+            return evidence
+        png = capture_screenshot(tester, request.device_id)
+        if png:
+            evidence["screenshot_at"] = _now()
+            path = os.path.join(self.evidence_dir, f"{qid}.png")
+            with open(path, "wb") as f:
+                f.write(png)
+            evidence["screenshot"] = os.path.abspath(path)
+        response = getattr(request.result, "response", "")
+        if response:
+            path = os.path.join(self.evidence_dir, f"{qid}.response.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(str(response))
+            evidence["response"] = os.path.abspath(path)
+        return evidence
+
+    # ---- reviewer side ----
+    def entries(self) -> List[dict]:
+        return _read(self.path)
+
+    def pending(self) -> List[dict]:
+        records = self.entries()
+        answered = {r.get("id") for r in records if r.get("type") == "answer"}
+        return [r for r in records if r.get("type") == "question" and r.get("id") not in answered]
+
+    def answer(self, entry, value, reviewer=None) -> dict:
+        """Record the answer and patch it into the run's journal and results file."""
+        record = {
+            "type": "answer",
+            "id": entry["id"],
+            "test_id": entry.get("test_id"),
+            "answer": value,
+            "provisional": entry.get("provisional"),
+            "negative": bool(entry.get("negative")),
+            "question": entry.get("question"),
+            "answered_at": _now(),
+            "reviewer": reviewer or os.environ.get("USER") or "",
+        }
+        _append(self.path, record)
+        if entry.get("journal") and entry.get("run_id"):
+            from util.results_journal import append_record
+            try:
+                append_record(entry["journal"], {**record, "type": "review", "run_id": entry["run_id"]})
+            except OSError as e:
+                LOGGER.warn(f"[REVIEW] Could not patch the results journal '{entry['journal']}': {e}")
+        if entry.get("results") and os.path.exists(entry["results"]):
+            patch_results_file(entry["results"], [record])
+        return record
+
+
+def reviewed_outcome(outcome, reviews) -> str:
+    """Final outcome of a test whose deferred questions were answered (see module docstring)."""
+    final = outcome
+    for r in reviews:
+        answer, provisional = r.get("answer"), r.get("provisional")
+        if answer == provisional or r.get("negative"):
+            continue  # negative tests pass whichever way the manual check goes
+        if provisional is True and answer is False:
+            return "FAILED"
+        final = "SKIPPED"  # the test followed the other branch; only a re-run can tell
+    return final
+
+
+def apply_reviews(entry: dict, reviews: List[dict]) -> bool:
+    """Apply answered questions to one serialized result. Returns True if anything changed."""
+    pending = list(entry.get("review_pending") or [])
+    mine = list({r["id"]: r for r in reviews if r.get("id") in pending}.values())
+    if not mine:
+        return False
+    outcome = entry.get("test_result") or entry.get("outcome") or ""
+    final = reviewed_outcome(outcome, mine)
+    logs = entry.setdefault("logs", [])
+    for r in mine:
+        pending.remove(r["id"])
+        logs.append(f"[REVIEW] {r.get('question') or 'question'} → {r.get('answer')} "
+                    f"(provisional {r.get('provisional')}, by {r.get('reviewer') or 'reviewer'} at {r.get('answered_at')})")
+    entry["review_pending"] = pending
+    entry.setdefault("reviews", []).extend(mine)
+    if final != outcome:
+        logs.append(f"[REVIEW] Outcome changed by review: {outcome} → {final}")
+        entry["test_result"] = final
+        if "outcome" in entry:
+            entry["outcome"] = final
+    return True
+
+
+def group_reviews(records) -> Dict[str, List[dict]]:
+    by_test = defaultdict(list)
+    for r in records:
+        if r.get("type") in ("answer", "review") and r.get("test_id"):
+            by_test[r["test_id"]].append(r)
+    return by_test
+
+
+def patch_results_file(path, reviews: List[dict]) -> int:
+    """Patch answered questions into a written results JSON; returns the number of results changed."""
+    from util.rerun import load_results, summarize
+    try:
+        data = load_results(path)
+    except (OSError, ValueError) as e:
+        LOGGER.warn(f"[REVIEW] Could not read results '{path}': {e}")
+        return 0
+    by_test = group_reviews(reviews)
+    changed = sum(apply_reviews(e, by_test.get(e.get("test_id"), [])) for e in data["test_result_list"] if isinstance(e, dict))
+    if changed:
+        data["result_summary"] = summarize(data["test_result_list"])
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp, path)
+    return changed
+
+
+def _read_answer(entry):
+    from readchar import readchar
+    options = entry.get("options") or []
+    if entry.get("kind") == "choice":
+        LOGGER.result("  *0: There is no option that meets the requirement.")
+        for number, option in enumerate(options, start=1):
+            LOGGER.result(f"  *{number}: {option}")
+        LOGGER.prompt(f"Answer (0–{len(options)}, S to skip, Q to quit):")
+    else:
+        LOGGER.prompt("Answer (Y/N, S to skip, Q to quit):")
+    while True:
+        ch = readchar()
+        up = ch.upper()
+        if up in ("S", "Q"):
+            return up
+        if entry.get("kind") == "choice" and ch.isdigit() and int(ch) <= len(options):
+            return int(ch)
+        if entry.get("kind") != "choice" and up in ("Y", "N"):
+            return up == "Y"
+        LOGGER.warn(f"Invalid answer '{ch}'.")
+
+
+def run_review(path=REVIEW_QUEUE_PATH) -> int:
+    """Interactive batch review of the pending questions. Returns the number answered."""
+    queue = ReviewQueue(path)
+    pending = queue.pending()
+    if not pending:
+        LOGGER.result(f"[REVIEW] No pending questions in '{path}'.")
+        return 0
+    LOGGER.result(f"[REVIEW] {len(pending)} pending question(s) in '{path}'.")
+    answered = 0
+    for n, entry in enumerate(pending, start=1):
+        LOGGER.result(f"[REVIEW] ({n}/{len(pending)}) {entry.get('test_id')} on device '{entry.get('device_id')}', "
+                      f"asked {entry.get('asked_at')} (run {entry.get('run_id') or '-'})")
+        LOGGER.result(f"[REVIEW] Question: {entry.get('question')}")
+        for kind, ref in (entry.get("evidence") or {}).items():
+            LOGGER.result(f"[REVIEW]   {kind}: {ref}")
+        value = _read_answer(entry)
+        if value == "Q":
+            break
+        if value == "S":
+            continue
+        queue.answer(entry, value)
+        answered += 1
+    LOGGER.result(f"[REVIEW] Answered {answered}, {len(queue.pending())} still pending.")
+    return answered
@@ -112,14 +112,14 @@ def prompt_edit_config(path=None):
     LOGGER.result(f"[CONFIG] Current va={cfg.get('va')}")
     LOGGER.result(f"[CONFIG] App keys: {', '.join(sorted(apps.keys()))}")
 
-    va_in = input(f"va [{cfg.get('va')}]: ").strip()
+    va_in = LOGGER.input(f"va [{cfg.get('va')}]: ").strip()
     if va_in:
         cfg["va"] = va_in
         LOGGER.result(f"[CONFIG] Updated va={cfg['va']}")
 
     LOGGER.result("[CONFIG] Update apps: press Enter to keep.")
     for k in sorted(apps.keys()):
-        v_in = input(f"apps.{k} [{apps[k]}]: ").strip()
+        v_in = LOGGER.input(f"apps.{k} [{apps[k]}]: ").strip()
         if v_in:
             apps[k] = v_in
             LOGGER.result(f"[CONFIG] Updated apps.{k}={v_in}")
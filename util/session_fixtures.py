@@ -0,0 +1,108 @@
+"""
+Session fixtures: device preconditions shared by consecutive functional tests.
+A test declares what it relies on with @fixtures(...) (e.g. ("app_foreground", "youtube")); app names are config.apps keys
+and are resolved when the fixture is used. Only app_foreground is supported: it is the one precondition the runner acts on.
+Inside the test, FixtureManager.ensure_app_foreground() launches the app only when applications/get-state does not
+already report it in FOREGROUND.
+Execute_Functional_Tests uses the declarations to skip the post-test KEY_HOME when the next test needs the same app in foreground.
+Nothing is assumed from bookkeeping alone; every reuse is verified against the device.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Optional, Tuple
+
+import config
+from logger import LOGGER
+from util.dab_response import response_json
+
+APP_FOREGROUND = "app_foreground"
+
+DEFAULT_LAUNCH_WAIT = 10
+
+
+def fixtures(*specs: Tuple):
+    """Declare the session fixtures a functional test relies on."""
+    def deco(func):
+        func.session_fixtures = tuple(specs)
+        return func
+    return deco
+
+
+def declared_fixtures(func) -> Tuple:
+    return getattr(func, "session_fixtures", ()) or ()
+
+
+def resolve_app(app_key: str) -> str:
+    """config.apps key (e.g. 'youtube') → appId; unknown keys are taken as literal appIds."""
+    return config.apps.get(app_key, app_key)
+
+
+def _emit(logs, line, level="result"):
+    getattr(LOGGER, level)(line)
+    if logs is not None:
+        logs.append(line)
+
+
+class FixtureManager:
+    def __init__(self, tester):
+        self.tester = tester
+        self.reused = 0
+        self.established = 0
+
+    # ---- device queries ----
+    def __query(self, device_id, topic, payload):
+        rc = self.tester.execute_cmd(device_id, topic, payload, fresh=True)
+        resp = self.tester.dab_client.response() or ""
+        try:
+            return rc, response_json(resp) if resp else {}
+        except Exception:
+            return rc, {}
+
+    def app_state(self, device_id, app_id) -> str:
+        _, body = self.__query(device_id, "applications/get-state", json.dumps({"appId": app_id}))
+        return str(body.get("state", "")).upper() if isinstance(body, dict) else ""
+
+    # ---- fixtures ----
+    def ensure_app_foreground(self, device_id, app_id, logs=None, wait=DEFAULT_LAUNCH_WAIT) -> bool:
+        """
+        Make sure `app_id` is in FOREGROUND. Returns True when the app was already there
+        (no launch, no wait), False when it had to be launched.
+        """
+        state = self.app_state(device_id, app_id)
+        if state == "FOREGROUND":
+            self.reused += 1
+            _emit(logs, f"[FIXTURE] '{app_id}' already in FOREGROUND; reusing it (no launch).")
+            return True
+
+        payload = json.dumps({"appId": app_id})
+        _emit(logs, f"[FIXTURE] '{app_id}' state is '{state or 'UNKNOWN'}'; launching via applications/launch with payload: {payload}")
+        rc = self.tester.execute_cmd(device_id, "applications/launch", payload, fresh=True)
+        _emit(logs, f"[applications/launch] Response: {self.tester.dab_client.response()}", "info")
+        if rc != 0:
+            _emit(logs, f"[FIXTURE] applications/launch for '{app_id}' returned a non-200 status.", "warn")
+        _emit(logs, f"[WAIT] Allowing {wait}s for the app to launch and settle.", "info")
+        time.sleep(wait)
+        self.established += 1
+        return False
+
+    # ---- runner support ----
+    @staticmethod
+    def foreground_apps(func) -> frozenset:
+        return frozenset(resolve_app(spec[1]) for spec in declared_fixtures(func)
+                         if len(spec) >= 2 and spec[0] == APP_FOREGROUND)
+
+    def keep_foreground_for_next(self, current_func, next_func) -> Optional[str]:
+        """
+        The app both tests need in FOREGROUND, if any. The runner then skips KEY_HOME
+        between them; the next test still verifies state before reusing it.
+        """
+        if current_func is None or next_func is None:
+            return None
+        shared = self.foreground_apps(current_func) & self.foreground_apps(next_func)
+        return next(iter(sorted(shared)), None)
+
+    def summary(self) -> str:
+        return f"fixtures established={self.established}, reused={self.reused}"
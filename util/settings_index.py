@@ -0,0 +1,194 @@
+"""
+Compiled view of a system/settings/list response.
+The raw settings/list payload (JSON string or dict, optionally wrapped in {"settings": {...}}) is normalized once
+into a SettingsIndex: one SettingDescriptor per key with its kind, numeric range, option value set and a
+subset lookup for dict options (e.g. outputResolution {"width","height","frequency"}).
+Prechecks and payload adjustment in DabChecker then become dictionary lookups instead of re-parsing the list.
+The index never mutates the raw payload; EnforcementManager builds it in set_supported_settings().
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import combinations
+from typing import Any, Dict, Optional, Tuple
+
+META_KEYS = ("status", "statusText", "ts", "error")
+
+KIND_BOOL = "bool"
+KIND_RANGE = "range"
+KIND_OPTIONS = "options"
+KIND_DICT_OPTIONS = "dict_options"
+KIND_OBJECT = "object"
+KIND_UNKNOWN = "unknown"
+
+# The subset lookup holds 2^k entries per option with k keys; wider options use the linear scan
+SUBSET_LOOKUP_MAX_KEYS = 6
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _prefer_language(options):
+    if "en-US" in options:
+        return "en-US"
+    for o in options:
+        if isinstance(o, str) and (o.startswith("en-") or o == "en"):
+            return o
+    return options[0] if options else None
+
+
+class SettingDescriptor:
+    """One settings/list entry, classified once."""
+
+    __slots__ = ("key", "raw", "kind", "minimum", "maximum", "options",
+                 "_option_set", "_subset_lookup", "resolutions", "preferred_language")
+
+    def __init__(self, key, raw):
+        self.key = key
+        self.raw = raw
+        self.minimum = None
+        self.maximum = None
+        self.options = ()
+        self._option_set = None
+        self._subset_lookup = None
+        self.resolutions = ()
+        self.preferred_language = None
+
+        if isinstance(raw, bool):
+            self.kind = KIND_BOOL
+        elif isinstance(raw, dict) and {"min", "max"}.issubset(raw.keys()):
+            self.kind = KIND_RANGE
+            self.minimum, self.maximum = raw["min"], raw["max"]
+        elif isinstance(raw, list):
+            self.options = tuple(raw)
+            if raw and isinstance(raw[0], dict):
+                self.kind = KIND_DICT_OPTIONS
+                self._subset_lookup = self.__build_subset_lookup(self.options)
+                self.resolutions = tuple(
+                    (o.get("width"), o.get("height"), o.get("frequency"))
+                    for o in self.options
+                    if isinstance(o, dict) and "width" in o and "height" in o
+                )
+            else:
+                self.kind = KIND_OPTIONS
+                if all(_hashable(o) for o in self.options):
+                    self._option_set = frozenset(self.options)
+                if key.lower() == "language":
+                    self.preferred_language = _prefer_language([o for o in self.options if isinstance(o, str)])
+        elif isinstance(raw, dict):
+            self.kind = KIND_OBJECT
+        else:
+            self.kind = KIND_UNKNOWN
+
+    @staticmethod
+    def __build_subset_lookup(options):
+        # Every (key, value) subset of an option maps to the first option containing it,
+        # matching the order-sensitive linear scan this replaces.
+        lookup = {}
+        for opt in options:
+            if not isinstance(opt, dict):
+                continue
+            items = [(k, v) for k, v in opt.items() if _hashable(v)]
+            if len(items) != len(opt) or len(items) > SUBSET_LOOKUP_MAX_KEYS:
+                return None
+            for size in range(len(items) + 1):
+                for combo in combinations(items, size):
+                    lookup.setdefault(frozenset(combo), opt)
+        return lookup
+
+    @property
+    def supported(self):
+        """False only when the device advertises the key as unavailable."""
+        if self.kind == KIND_BOOL:
+            return self.raw is True
+        if self.kind in (KIND_OPTIONS, KIND_DICT_OPTIONS):
+            return bool(self.options)
+        return True
+
+    def in_range(self, value):
+        return isinstance(value, (int, float)) and self.minimum <= value <= self.maximum
+
+    def midpoint(self):
+        mn, mx = self.minimum, self.maximum
+        if isinstance(mn, int) and isinstance(mx, int):
+            return (mn + mx) // 2
+        return (float(mn) + float(mx)) / 2.0
+
+    def has_option(self, value):
+        if self._option_set is not None and _hashable(value):
+            return value in self._option_set
+        return value in self.options
+
+    def match_option(self, wanted):
+        """First dict option whose entries include all of `wanted`, or None."""
+        if not isinstance(wanted, dict):
+            return None
+        if self._subset_lookup is not None and all(_hashable(v) for v in wanted.values()):
+            return self._subset_lookup.get(frozenset(wanted.items()))
+        for opt in self.options:
+            if isinstance(opt, dict) and all(opt.get(k) == v for k, v in wanted.items()):
+                return opt
+        return None
+
+    def preview(self, n=3):
+        if self.kind == KIND_DICT_OPTIONS:
+            return [{k: d.get(k) for k in list(d.keys())[:3]} for d in self.options[:n]]
+        return list(self.options[:n])
+
+
+class SettingsIndex:
+    """Read-only per-key index over a settings/list response."""
+
+    def __init__(self, supported=None):
+        self.settings_map = self.normalize(supported)
+        self._descriptors: Dict[str, SettingDescriptor] = {
+            key: SettingDescriptor(key, desc) for key, desc in self.settings_map.items()
+        }
+
+    @staticmethod
+    def normalize(supported) -> Dict[str, Any]:
+        """Return the bare {key: descriptor} map (shallow copy, meta keys removed)."""
+        try:
+            if isinstance(supported, str):
+                supported = json.loads(supported)
+        except Exception:
+            return {}
+        if not isinstance(supported, dict):
+            return {}
+        settings_map = supported.get("settings", supported)
+        if not isinstance(settings_map, dict):
+            return {}
+        return {k: v for k, v in settings_map.items() if k not in META_KEYS}
+
+    def __bool__(self):
+        return bool(self._descriptors)
+
+    def __len__(self):
+        return len(self._descriptors)
+
+    def __contains__(self, key):
+        return key in self._descriptors
+
+    def get(self, key) -> Optional[SettingDescriptor]:
+        return self._descriptors.get(key)
+
+    def keys(self):
+        return self._descriptors.keys()
+
+    def sample_keys(self, n=3):
+        return list(self._descriptors.keys())[:n]
+
+    def range_of(self, key) -> Optional[Tuple[Any, Any]]:
+        d = self._descriptors.get(key)
+        if d is None or d.kind != KIND_RANGE:
+            return None
+        return d.minimum, d.maximum
+
+
+EMPTY_SETTINGS_INDEX = SettingsIndex(None)
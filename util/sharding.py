@@ -0,0 +1,209 @@
+"""
+Deterministic suite sharding for farms of identical devices (--shard i/N, --merge-shards).
+Test durations are learned per test id into ./test_result/durations.json as an exponentially weighted moving average
+of the wall time of each run. shard_tests() splits the selected cases with the LPT rule: cases sorted by estimated
+duration (longest first, ties by test id) are assigned one by one to the least loaded shard (ties by shard number).
+Every shard computes the same assignment from the same durations file, and runs its cases in suite order.
+The split only reads the durations as loaded at process start (DurationStore.baseline), so later suites of the
+same run are split exactly like the first one. A sharded run never rewrites durations.json (a shard starting later
+would read different numbers): its observations go to its results file as "shard_durations_ms" and
+merge_shard_results() folds them into durations.json once all shards are done.
+Tests without history are estimated from the median of known ones, scaled up for reboot/reset style tests.
+merge_shard_results() joins per-shard results files into one file with the same layout as write_test_result_json().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from logger import LOGGER
+from util.phase_timer import summarize as summarize_phases
+from util.rerun import load_results, summarize
+from util.test_scheduler import DISRUPTIVE_NAME_RE, DISRUPTIVE_TOPICS
+
+DURATIONS_PATH = "./test_result/durations.json"
+EWMA_ALPHA = 0.3
+
+DEFAULT_TEST_MS = 2000
+DEFAULT_FUNCTIONAL_MS = 30000
+DEFAULT_DISRUPTIVE_MS = 180000
+
+
+def parse_shard(spec) -> Tuple[int, int]:
+    """'i/N' (1-based) → (i, N)."""
+    try:
+        index, count = (int(p) for p in str(spec).split("/", 1))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}'. Use i/N, e.g. 2/8.")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}'. Expected 1 <= i <= N.")
+    return index, count
+
+
+def shard_output_path(suite_name, index, count) -> str:
+    return f"./test_result/{suite_name}.shard-{index}-of-{count}.json"
+
+
+def _estimate(durations: Dict[str, float], test_id, topic, name, functional, fallback) -> float:
+    known = durations.get(test_id)
+    if known is not None:
+        return known
+    base = fallback if fallback is not None else (DEFAULT_FUNCTIONAL_MS if functional else DEFAULT_TEST_MS)
+    if topic in DISRUPTIVE_TOPICS or DISRUPTIVE_NAME_RE.search(str(name)):
+        return max(base, DEFAULT_DISRUPTIVE_MS)
+    return base
+
+
+def _median(durations: Dict[str, float]):
+    return statistics.median(durations.values()) if durations else None
+
+
+class DurationStore:
+    def __init__(self, path=DURATIONS_PATH):
+        self.path = path
+        self.sharded = False  # set by record_per_shard(): observations stay out of durations.json
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._observed = set()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._ms: Dict[str, float] = {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+        except FileNotFoundError:
+            self._ms = {}
+        except Exception as e:
+            LOGGER.warn(f"Ignoring unreadable durations file '{path}': {e}")
+            self._ms = {}
+        # Frozen at load: shard splits never see observations made during the run
+        self.baseline: Dict[str, float] = dict(self._ms)
+
+    def __contains__(self, test_id):
+        return test_id in self._ms
+
+    def observe(self, test_id, duration_ms):
+        if not test_id or duration_ms is None:
+            return
+        with self._lock:
+            prev = self._ms.get(test_id)
+            value = float(duration_ms) if prev is None else EWMA_ALPHA * float(duration_ms) + (1 - EWMA_ALPHA) * prev
+            self._ms[test_id] = round(value, 1)
+            self._observed.add(test_id)
+            self._dirty = True
+
+    def estimate(self, test_id, topic="", name="", functional=False, fallback=None) -> float:
+        if fallback is None:
+            fallback = self.median()
+        return _estimate(self._ms, test_id, topic, name, functional, fallback)
+
+    def median(self):
+        return _median(self._ms)
+
+    def record_per_shard(self):
+        """Keep this run's observations out of durations.json; they are written with the shard's results."""
+        self.sharded = True
+
+    def observed(self, test_ids) -> Dict[str, float]:
+        """Current durations of the given tests that were observed in this run."""
+        with self._lock:
+            return {t: self._ms[t] for t in sorted(self._observed) if t in test_ids}
+
+    def merge(self, durations: Dict[str, float]):
+        """Take durations computed by shards (already averaged against the same baseline)."""
+        with self._lock:
+            for test_id, ms in durations.items():
+                if isinstance(ms, (int, float)):
+                    self._ms[test_id] = round(float(ms), 1)
+                    self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or self.sharded:
+                return
+            data = dict(sorted(self._ms.items()))
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            LOGGER.warn(f"Could not save test durations to '{self.path}': {e}")
+
+
+def shard_tests(test_cases: Sequence, index: int, count: int, describe: Callable, store: DurationStore) -> list:
+    """
+    Cases of shard `index` (1-based) out of `count`, in suite order.
+    `describe(case)` returns (test_id, topic, name, is_functional) for a case.
+    Only the store's baseline (durations as loaded at start) is used, so every suite of every shard splits alike.
+    """
+    if count <= 1:
+        return list(test_cases)
+    durations = store.baseline
+    median = _median(durations)
+    weighted = []
+    for pos, case in enumerate(test_cases):
+        test_id, topic, name, functional = describe(case)
+        cost = _estimate(durations, test_id, topic, name, functional, median)
+        weighted.append((cost, test_id or "", pos))
+
+    loads = [0.0] * count
+    owner: Dict[int, int] = {}
+    for cost, _tid, pos in sorted(weighted, key=lambda w: (-w[0], w[1], w[2])):
+        shard = min(range(count), key=lambda s: (loads[s], s))
+        loads[shard] += cost
+        owner[pos] = shard
+
+    picked = [case for pos, case in enumerate(test_cases) if owner[pos] == index - 1]
+    LOGGER.info(f"Shard {index}/{count}: {len(picked)} of {len(test_cases)} tests, "
+                f"estimated {int(loads[index - 1] / 1000)}s (shard loads: {[int(l / 1000) for l in loads]}s).")
+    return picked
+
+
+def merge_shard_results(paths: Sequence[str], output_path: str, order: Sequence[str] = (),
+                        durations_path: str = DURATIONS_PATH) -> str:
+    """
+    Combine per-shard results files into one. Entries follow `order` (suite test ids) when given,
+    otherwise shard file order; the summary is recomputed over the merged list.
+    The shards' "shard_durations_ms" are written to `durations_path` for the next split.
+    """
+    shards = [load_results(p) for p in paths]
+    if not shards:
+        raise ValueError("No shard results to merge.")
+    suites = {s.get("suite_name") for s in shards}
+    if len(suites) > 1:
+        raise ValueError(f"Shard results come from different suites: {sorted(map(str, suites))}")
+
+    entries: List[dict] = [e for s in shards for e in s.get("test_result_list", [])]
+    if order:
+        rank: Dict[str, int] = {}
+        for pos, test_id in enumerate(order):
+            rank.setdefault(test_id, pos)
+        entries = sorted(entries, key=lambda e: rank.get(e.get("test_id"), len(rank)))  # stable
+
+    observed: Dict[str, float] = {}
+    for s in shards:
+        observed.update(s.get("shard_durations_ms") or {})
+    if observed:
+        store = DurationStore(durations_path)
+        store.merge(observed)
+        store.save()
+        LOGGER.info(f"Updated {len(observed)} test duration(s) in {durations_path} from the shards.")
+
+    first = shards[0]
+    merged = {
+        "test_version": first.get("test_version"),
+        "suite_name": first.get("suite_name"),
+        "device_info": first.get("device_info", {}),
+        "result_summary": summarize(entries),
+        "phase_summary_ms": summarize_phases(entries),
+        "test_result_list": entries,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(merged, indent=4))
+    return os.path.abspath(output_path)
@@ -0,0 +1,131 @@
+"""
+Compiled test cases.
+Suite modules declare tests as tuples:
+  conformance: (topic, body|lambda, validator, expected, title[, version[, is_negative]])
+  functional:  (topic, "functional", func, title[, version[, is_negative]])
+compile_suite() turns them once into immutable TestCase objects: the shape, topic and callables are validated,
+the test id is computed, and static bodies (str/dict/list/None) are serialized up front so only lambdas are
+evaluated per run. Both runners consume TestCase objects; invalid tuples compile to a TestCase with `error` set
+so they are still reported as SKIPPED. A TestCase also indexes like its source tuple, so helpers written
+against tuples (scheduler, reboot batching, session fixtures) keep working.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Iterable, List, Optional
+
+
+class TestCase:
+    __slots__ = ("source", "suite", "index", "test_id", "topic", "title", "version", "is_negative",
+                 "functional", "func", "expected", "body", "error")
+
+    def __init__(self, source, suite="", index=0, test_id="", topic=None, title=None, version="2.0",
+                 is_negative=False, functional=False, func=None, expected=0, body="{}", error=None):
+        for name, value in zip(self.__slots__, (source, suite, index, test_id, topic, title, version,
+                                                is_negative, functional, func, expected, body, error)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TestCase is immutable (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TestCase is immutable (cannot delete '{name}')")
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    # Tuple view of the declaration
+    def __len__(self):
+        return len(self.source) if isinstance(self.source, tuple) else 0
+
+    def __getitem__(self, key):
+        return as_tuple(self)[key]
+
+    def __iter__(self):
+        return iter(as_tuple(self))
+
+    def __repr__(self):
+        state = "" if self.valid else f", error={self.error!r}"
+        return f"TestCase({self.test_id!r}, suite={self.suite!r}, topic={self.topic!r}{state})"
+
+
+def as_tuple(test_case) -> tuple:
+    """The declared tuple of a TestCase (tuples are returned unchanged)."""
+    if isinstance(test_case, TestCase):
+        return test_case.source if isinstance(test_case.source, tuple) else ()
+    return test_case
+
+
+def _static_body(body_spec):
+    """Serialize a non-callable body once, the same way resolve_body_or_raise() would."""
+    if callable(body_spec):
+        return body_spec
+    if isinstance(body_spec, (dict, list)):
+        return json.dumps(body_spec)
+    if body_spec is None:
+        return "{}"
+    return str(body_spec)
+
+
+def _invalid(test_case, suite, index, reason) -> TestCase:
+    from dab_tester import to_test_id  # dab_tester imports this module
+    # Keep whatever identity the tuple has so the SKIPPED result is traceable
+    topic, title = "invalid/test", "InvalidTestCase"
+    if isinstance(test_case, tuple):
+        if len(test_case) >= 1 and isinstance(test_case[0], str) and test_case[0].strip():
+            topic = test_case[0].strip()
+        title_at = 3 if len(test_case) >= 2 and test_case[1] == "functional" else 4
+        if len(test_case) > title_at and isinstance(test_case[title_at], str) and test_case[title_at].strip():
+            title = test_case[title_at].strip()
+    return TestCase(test_case, suite, index, to_test_id(f"{topic}/{title}"), topic, title, error=reason)
+
+
+def compile_case(test_case, valid_topics: Optional[Iterable[str]] = None, suite="", index=0) -> TestCase:
+    """Validate one suite tuple and compile it. Never raises; problems are recorded in TestCase.error."""
+    if isinstance(test_case, TestCase):
+        return test_case
+    from dab_tester import to_test_id
+
+    if isinstance(test_case, tuple) and len(test_case) >= 3:
+        if test_case[1] == "functional" and callable(test_case[2]):
+            topic = test_case[0]
+            title = test_case[3] if len(test_case) > 3 else "FunctionalTest"
+            version = str(test_case[4]) if len(test_case) > 4 else "2.0"
+            is_negative = bool(test_case[5]) if len(test_case) > 5 else False
+            if not isinstance(title, str) or not title.strip():
+                title = f"{topic}/functional"
+            return TestCase(test_case, suite, index, to_test_id(f"{topic}/{title}"), topic, title, version,
+                            is_negative, functional=True, func=test_case[2])
+
+    if not isinstance(test_case, tuple):
+        return _invalid(test_case, suite, index, "Test case is not a tuple")
+    if len(test_case) not in (5, 6, 7):
+        return _invalid(test_case, suite, index, f"Expected 5, 6, or 7 elements, got {len(test_case)}")
+
+    topic, body_spec, func, expected, title = test_case[:5]
+    version = str(test_case[5]) if len(test_case) >= 6 else "2.0"
+    is_negative = bool(test_case[6]) if len(test_case) == 7 else False
+
+    if body_spec is not None and not (isinstance(body_spec, (str, dict, list)) or callable(body_spec)):
+        return _invalid(test_case, suite, index, "Body must be a string, dict/list, callable, or None")
+    if not isinstance(topic, str) or not topic.strip():
+        return _invalid(test_case, suite, index, "Invalid or empty topic")
+    if valid_topics is not None and topic not in valid_topics:
+        return _invalid(test_case, suite, index, f"Unknown or unsupported DAB topic: {topic}")
+    if not callable(func):
+        return _invalid(test_case, suite, index, "Validator function is not callable")
+    if not ((isinstance(expected, int) and expected >= 0) or (isinstance(expected, str) and expected.strip())):
+        return _invalid(test_case, suite, index, "Expected must be a non-negative int or non-empty string")
+    if not isinstance(title, str) or not title.strip():
+        return _invalid(test_case, suite, index, "Invalid or empty title")
+
+    return TestCase(test_case, suite, index, to_test_id(f"{topic}/{title}"), topic, title, version, is_negative,
+                    functional=False, func=func, expected=expected, body=_static_body(body_spec))
+
+
+def compile_suite(test_cases, valid_topics: Optional[Iterable[str]] = None, suite="") -> List[TestCase]:
+    """Compile a suite's tuples (already compiled entries are kept as they are)."""
+    topics = frozenset(valid_topics) if valid_topics is not None else None
+    return [compile_case(case, topics, suite, index) for index, case in enumerate(test_cases)]
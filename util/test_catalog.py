@@ -0,0 +1,211 @@
+"""
+Indexed test catalog with lazy suite loading.
+The catalog maps every test id to its suite, topic, title, DAB version, negative flag and position in the suite list,
+and is cached in ./test_result/test_catalog.json together with a fingerprint (mtime + size) of the suite sources
+and a content digest of the runtime config (main.py rewrites it on every run). It is rebuilt only when one changes; otherwise --list and -c lookups are served without importing
+any suite module or connecting to the broker. Suite modules are imported only when their tests are about to run.
+Selectors for -c: an exact test id (O(1) dict lookup), a glob (Settings*, *Negative*) or a regex prefixed with 're:'.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import importlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from logger import LOGGER
+from util.test_case import TestCase, compile_suite
+
+CATALOG_PATH = "./test_result/test_catalog.json"
+CATALOG_FORMAT = 1
+
+# suite name → (module, attribute holding the test tuple list)
+SUITE_SOURCES = {
+    "conformance": ("conformance", "CONFORMANCE_TEST_CASE"),
+    "output_image": ("output_image", "OUTPUT_IMAGE_TEST_CASES"),
+    "netflix": ("netflix", "NETFLIX_TEST_CASES"),
+    "functional": ("functional", "FUNCTIONAL_TEST_CASE"),
+}
+
+# Besides the suite modules, ids and validity depend on these (titles may embed runtime config values)
+EXTRA_SOURCES = ("valid_dab_topics.json", "dab_tester.py", "config.py", "util/test_case.py", __file__)
+
+
+class CatalogEntry:
+    __slots__ = ("test_id", "suite", "topic", "title", "version", "is_negative", "index", "functional", "valid")
+
+    def __init__(self, test_id, suite, topic, title, version="2.0", is_negative=False, index=0, functional=False, valid=True):
+        self.test_id = test_id
+        self.suite = suite
+        self.topic = topic
+        self.title = title
+        self.version = version
+        self.is_negative = is_negative
+        self.index = index
+        self.functional = functional
+        self.valid = valid
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{k: d.get(k) for k in cls.__slots__})
+
+
+def _source_path(module_name) -> str:
+    return f"{module_name.replace('.', os.sep)}.py"
+
+
+def _fingerprint(paths: Iterable[str]) -> Dict[str, list]:
+    fp = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            fp[os.path.relpath(path)] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            fp[os.path.relpath(path)] = None
+    return fp
+
+
+def _digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _load_valid_topics():
+    try:
+        with open("valid_dab_topics.json", "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    except Exception:
+        return set()
+
+
+def load_suite(suite_name) -> list:
+    """Import a suite module on demand and return its test tuple list."""
+    module_name, attr = SUITE_SOURCES[suite_name]
+    # suite modules import dab_tester indirectly (through schema); load it first to keep the import order valid
+    importlib.import_module("dab_tester")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class TestCatalog:
+    def __init__(self, path=CATALOG_PATH, runtime_config=None):
+        self.path = path
+        self.runtime_config = runtime_config
+        self.entries: Dict[str, List[CatalogEntry]] = {}   # suite → entries in suite order
+        self._by_id: Dict[str, List[CatalogEntry]] = {}
+        self._loaded_suites: Dict[str, List[TestCase]] = {}
+        self._valid_topics = None
+
+    # ---- build / cache ----
+    def sources(self) -> List[str]:
+        return [_source_path(m) for m, _ in SUITE_SOURCES.values()] + list(EXTRA_SOURCES)
+
+    def load(self, rebuild=False) -> "TestCatalog":
+        fingerprint = _fingerprint(self.sources())
+        if self.runtime_config:
+            fingerprint["runtime_config"] = _digest(self.runtime_config)
+        if not rebuild:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("format") == CATALOG_FORMAT and cached.get("fingerprint") == fingerprint:
+                    self.__index({s: [CatalogEntry.from_dict(d) for d in items]
+                                  for s, items in cached.get("suites", {}).items()})
+                    return self
+            except (OSError, ValueError, TypeError):
+                pass
+        LOGGER.info("Building the test catalog (suite sources changed or no cache).")
+        self.__index(self.__build())
+        self.__save(fingerprint)
+        return self
+
+    def __build(self) -> Dict[str, List[CatalogEntry]]:
+        return {suite: [CatalogEntry(c.test_id, suite, c.topic, c.title, c.version, c.is_negative, c.index,
+                                     c.functional, c.valid) for c in self.suite_cases(suite)]
+                for suite in SUITE_SOURCES}
+
+    def __save(self, fingerprint):
+        data = {
+            "format": CATALOG_FORMAT,
+            "fingerprint": fingerprint,
+            "suites": {s: [e.to_dict() for e in items] for s, items in self.entries.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            LOGGER.warn(f"Could not cache the test catalog at '{self.path}': {e}")
+
+    def __index(self, suites):
+        self.entries = suites
+        self._by_id = {}
+        for items in suites.values():
+            for e in items:
+                if e.test_id:
+                    self._by_id.setdefault(e.test_id, []).append(e)
+
+    # ---- queries ----
+    def suite_names(self) -> List[str]:
+        return list(self.entries)
+
+    def count(self, suite) -> int:
+        return len(self.entries.get(suite, ()))
+
+    def ids(self, suite) -> List[str]:
+        return [e.test_id for e in self.entries.get(suite, ()) if e.valid]
+
+    def get(self, test_id) -> List[CatalogEntry]:
+        return self._by_id.get(test_id, [])
+
+    def select(self, selectors: Sequence[str], suites: Optional[Iterable[str]] = None) -> List[CatalogEntry]:
+        """
+        Entries matching any selector, in suite order. Exact ids are dict lookups; globs
+        (*, ?, [..]) and 're:<pattern>' regexes are matched against the ids of the given suites.
+        """
+        allowed = set(suites) if suites is not None else set(self.entries)
+        exact, patterns = set(), []
+        for sel in selectors:
+            sel = sel.strip()
+            if not sel:
+                continue
+            if sel.startswith("re:"):
+                patterns.append(re.compile(sel[3:]).search)
+            elif any(ch in sel for ch in "*?["):
+                patterns.append(re.compile(fnmatch.translate(sel)).match)
+            else:
+                exact.add(sel)
+
+        picked = {id(e): e for sel in exact for e in self.get(sel) if e.suite in allowed and e.valid}
+        if patterns:
+            for suite in allowed:
+                for e in self.entries.get(suite, ()):
+                    if e.valid and id(e) not in picked and any(matches(e.test_id) for matches in patterns):
+                        picked[id(e)] = e
+        order = {s: n for n, s in enumerate(self.entries)}
+        return sorted(picked.values(), key=lambda e: (order.get(e.suite, 0), e.index))
+
+    # ---- lazy suite access ----
+    def suite_cases(self, suite) -> List[TestCase]:
+        """Compiled test cases of a suite; the suite is imported and compiled on first use only."""
+        cases = self._loaded_suites.get(suite)
+        if cases is None:
+            if self._valid_topics is None:
+                self._valid_topics = _load_valid_topics()
+            cases = self._loaded_suites[suite] = compile_suite(load_suite(suite), self._valid_topics, suite)
+        return cases
+
+    def cases_for(self, entries: Iterable[CatalogEntry]) -> List[TestCase]:
+        """Compiled test cases for catalog entries (imports only the suites involved)."""
+        return [self.suite_cases(e.suite)[e.index] for e in entries]
@@ -0,0 +1,228 @@
+"""
+Cost-aware ordering of suite test cases (opt-in via --schedule cost).
+Each case is reduced to a small profile: topic, app it drives (appId in a static body, or a declared
+app_foreground fixture), settings key it writes, and whether it is disruptive (restart, reset, power mode, setup skip).
+The scheduler keeps three kinds of ordering edges:
+  - explicit topic rules for request/validator cases (operations/list first, key/list before key-press,
+    settings/list before set/get, start before stop for logs and telemetry, install before uninstall,
+    launch before get-state/exit);
+  - original relative order among cases that share an app, a settings key, or (when the body is built lazily
+    and cannot be inspected) the same topic family;
+  - disruptive cases keep their relative order and run after everything else that does not depend on them.
+Among ready cases it greedily picks the cheapest transition from the current device state (app switch, settings
+key change), falling back to original list order on ties, so an unconstrained list comes out unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from logger import LOGGER
+from util.test_case import as_tuple
+
+APP_SWITCH_COST = 10
+SETTING_SWITCH_COST = 2
+DISRUPTIVE_COST = 1000
+
+FIRST_TOPICS = frozenset({"operations/list"})
+
+ORDER_RULES = frozenset({
+    ("input/key/list", "input/key-press"),
+    ("input/key/list", "input/long-key-press"),
+    ("system/settings/list", "system/settings/set"),
+    ("system/settings/list", "system/settings/get"),
+    ("voice/list", "voice/set"),
+    ("voice/list", "voice/send-text"),
+    ("voice/list", "voice/send-audio"),
+    ("system/logs/start-collection", "system/logs/stop-collection"),
+    ("device-telemetry/start", "device-telemetry/stop"),
+    ("app-telemetry/start", "app-telemetry/stop"),
+    ("applications/install", "applications/uninstall"),
+    ("applications/install-from-app-store", "applications/uninstall"),
+    ("applications/launch", "applications/get-state"),
+    ("applications/launch", "applications/exit"),
+})
+
+DISRUPTIVE_TOPICS = frozenset({
+    "system/restart",
+    "system/power-mode/set",
+    "system/setup/skip",
+    "system/network-reset",
+    "system/factory-reset",
+})
+DISRUPTIVE_NAME_RE = re.compile(r"reboot|restart|factory.?reset|network.?reset|standby", re.IGNORECASE)
+
+
+class CaseProfile:
+    __slots__ = ("index", "case", "topic", "name", "app", "setting", "disruptive", "opaque", "functional")
+
+    def __init__(self, index, case, topic, name, app=None, setting=None, disruptive=False, opaque=False, functional=False):
+        self.index = index
+        self.case = case
+        self.topic = topic
+        self.name = name
+        self.app = app
+        self.setting = setting
+        self.disruptive = disruptive
+        self.opaque = opaque
+        self.functional = functional
+
+
+def _parse_body(body):
+    if isinstance(body, dict):
+        return body
+    if isinstance(body, str):
+        try:
+            parsed = json.loads(body or "{}")
+            return parsed if isinstance(parsed, dict) else None
+        except Exception:
+            return None
+    return None  # callables are resolved at run time; never evaluate them here
+
+
+def profile_case(index, case) -> CaseProfile:
+    declared = as_tuple(case)
+    topic = declared[0] if isinstance(declared, tuple) and declared and isinstance(declared[0], str) else ""
+    if len(case) > 1 and case[1] == "functional":
+        # (topic, "functional", func, name, version, is_negative)
+        from util.session_fixtures import APP_FOREGROUND, SETTING, declared_fixtures, resolve_app
+        func = case[2] if len(case) > 2 else None
+        name = case[3] if len(case) > 3 else ""
+        app = setting = None
+        for spec in declared_fixtures(func):
+            if spec and spec[0] == APP_FOREGROUND and len(spec) > 1:
+                app = resolve_app(spec[1])
+            elif spec and spec[0] == SETTING and len(spec) > 1:
+                setting = spec[1]
+        disruptive = topic in DISRUPTIVE_TOPICS or bool(DISRUPTIVE_NAME_RE.search(str(name)))
+        return CaseProfile(index, case, topic, str(name), app, setting, disruptive, opaque=False, functional=True)
+
+    # (topic, body|lambda, validator, expected, title, ...)
+    name = case[4] if len(case) > 4 else ""
+    body = _parse_body(case[1] if len(case) > 1 else None)
+    app = setting = None
+    if body is not None:
+        app_id = body.get("appId")
+        app = app_id if isinstance(app_id, str) else None
+        if topic == "system/settings/set" and len(body) == 1:
+            setting = next(iter(body))
+    disruptive = topic in DISRUPTIVE_TOPICS
+    return CaseProfile(index, case, topic, str(name), app, setting, disruptive, opaque=body is None)
+
+
+def _family(topic):
+    return topic.split("/", 1)[0]
+
+
+def _build_edges(profiles: Sequence[CaseProfile]) -> Dict[int, Set[int]]:
+    succ: Dict[int, Set[int]] = {p.index: set() for p in profiles}
+
+    def add(a, b):
+        if a != b:
+            succ[a].add(b)
+
+    # 1) explicit topic rules (independent of list order). Functional cases are
+    #    self-contained scenarios whose topic is only a label, so rules skip them.
+    by_topic: Dict[str, List[int]] = {}
+    for p in profiles:
+        if not p.functional:
+            by_topic.setdefault(p.topic, []).append(p.index)
+    for a in by_topic.get("operations/list", ()):
+        for q in profiles:
+            if q.topic not in FIRST_TOPICS and not q.functional:
+                add(a, q.index)
+    for before, after in ORDER_RULES:
+        for a in by_topic.get(before, ()):
+            for b in by_topic.get(after, ()):
+                add(a, b)
+
+    # 2) keep original relative order inside each shared-resource chain
+    chains: Dict[Tuple[str, str], List[CaseProfile]] = {}
+    for p in profiles:
+        if p.app:
+            chains.setdefault(("app", p.app), []).append(p)
+        if p.setting:
+            chains.setdefault(("setting", p.setting), []).append(p)
+        if p.opaque:
+            chains.setdefault(("family", _family(p.topic)), []).append(p)
+        if p.disruptive:
+            chains.setdefault(("disruptive", ""), []).append(p)
+    for members in chains.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if not (a.functional or b.functional) and (b.topic, a.topic) in ORDER_RULES:
+                    continue  # an explicit rule says the opposite; the rule wins
+                add(a.index, b.index)
+    return succ
+
+
+def _transition_cost(p: CaseProfile, app: Optional[str], setting: Optional[str]) -> int:
+    if p.disruptive:
+        return DISRUPTIVE_COST
+    cost = 0
+    if p.app and p.app != app:
+        cost += APP_SWITCH_COST
+    if p.setting and p.setting != setting:
+        cost += SETTING_SWITCH_COST
+    return cost
+
+
+def estimate_cost(profiles: Sequence[CaseProfile]) -> int:
+    app = setting = None
+    total = 0
+    for p in profiles:
+        total += _transition_cost(p, app, setting)
+        if p.disruptive:
+            app = setting = None
+        else:
+            app = p.app or app
+            setting = p.setting or setting
+    return total
+
+
+def schedule_tests(test_cases: Sequence, suite_name: str = "") -> list:
+    """Return `test_cases` in a cost-minimizing order that honours the ordering constraints."""
+    profiles = [profile_case(i, c) for i, c in enumerate(test_cases)]
+    if len(profiles) < 2:
+        return list(test_cases)
+
+    succ = _build_edges(profiles)
+    indegree = {p.index: 0 for p in profiles}
+    for targets in succ.values():
+        for t in targets:
+            indegree[t] += 1
+
+    by_index = {p.index: p for p in profiles}
+    remaining = set(by_index)
+    ready = {i for i, d in indegree.items() if d == 0}
+    order: List[CaseProfile] = []
+    app = setting = None
+
+    while remaining:
+        if not ready:
+            # Conflicting constraints (cycle) → release the earliest remaining case
+            ready = {min(remaining)}
+        pick = min(ready, key=lambda i: (_transition_cost(by_index[i], app, setting), i))
+        ready.discard(pick)
+        remaining.discard(pick)
+        p = by_index[pick]
+        order.append(p)
+        if p.disruptive:
+            app = setting = None
+        else:
+            app = p.app or app
+            setting = p.setting or setting
+        for t in succ[pick]:
+            indegree[t] -= 1
+            if indegree[t] == 0 and t in remaining:
+                ready.add(t)
+
+    before, after = estimate_cost(profiles), estimate_cost(order)
+    moved = sum(1 for pos, p in enumerate(order) if p.index != pos)
+    LOGGER.info(
+        f"Scheduler: {suite_name or 'suite'} reordered {moved} of {len(order)} tests; "
+        f"estimated transition cost {before} → {after}."
+    )
+    return [p.case for p in order]
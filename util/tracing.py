@@ -0,0 +1,215 @@
+"""
+Timeline of a run in Chrome trace event format (--trace out.json).
+The file loads in chrome://tracing, https://ui.perfetto.dev and other viewers of that format. Each thread of
+the harness gets its own track:
+  test      one span per test (test id, outcome)
+  phase     the PhaseTimer phases of the test (util/phase_timer.py): preflight, precheck, request, validator...
+  request   every execute_cmd through the request pipeline (TraceInterceptor); "cached" when no MQTT was sent
+  mqtt      the publish → response wait in DabClient.request on the runner thread, and the response callback
+            on the MQTT network thread, linked by a flow arrow carrying the same id
+  sleep     time.sleep calls made by the harness (file:line of the caller)
+  prompt    manual checks (question, answer)
+Nothing is recorded unless the tracer is started: spans cost one attribute check when tracing is off.
+Events are kept in memory (at most MAX_EVENTS; later ones are counted as dropped) and written at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+from logger import LOGGER
+from util.request_pipeline import Interceptor
+
+MAX_EVENTS = 1_000_000
+ARG_CHARS = 200  # string arguments are clipped (request bodies, questions)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_real_sleep = time.sleep
+
+
+def _clip(value):
+    if isinstance(value, str) and len(value) > ARG_CHARS:
+        return value[:ARG_CHARS] + "..."
+    return value
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer, self.name, self.cat, self.args = tracer, name, cat, args
+
+    def set(self, name=None, **args):
+        if name:
+            self.name = name
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = self.tracer.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.cat, self.start, **self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, name=None, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self.dropped = 0
+        self.last_id = 0
+        self._ids = itertools.count(1)
+        self._threads = {}
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter()
+        self._started_at = None
+
+    # ---------- recording ----------
+    def now_us(self) -> float:
+        return (time.perf_counter() - self._t0) * 1e6
+
+    def next_id(self) -> int:
+        self.last_id = next(self._ids)
+        return self.last_id
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def _add(self, event):
+        if len(self.events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        event["pid"] = self._pid
+        event["tid"] = self._tid()
+        self.events.append(event)
+
+    def span(self, name, cat="runner", **args):
+        """Context manager recording a complete event; `.set(name=..., **args)` adds details before it ends."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, cat, start_us, end_us=None, **args):
+        if not self.enabled:
+            return
+        end_us = self.now_us() if end_us is None else end_us
+        self._add({"name": name, "cat": cat, "ph": "X", "ts": round(start_us, 1),
+                   "dur": round(max(0.0, end_us - start_us), 1),
+                   "args": {k: _clip(v) for k, v in args.items()}})
+
+    def instant(self, name, cat="runner", **args):
+        if self.enabled:
+            self._add({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": round(self.now_us(), 1),
+                       "args": {k: _clip(v) for k, v in args.items()}})
+
+    def flow(self, flow_id, start: bool, name="mqtt", cat="mqtt"):
+        """Arrow between two spans: call with start=True inside the first and start=False inside the second."""
+        if self.enabled:
+            event = {"name": name, "cat": cat, "ph": "s" if start else "f", "id": flow_id,
+                     "ts": round(self.now_us(), 1)}
+            if not start:
+                event["bp"] = "e"
+            self._add(event)
+
+    # ---------- lifecycle ----------
+    def start(self, path):
+        self.path = path
+        self.enabled = True
+        self._started_at = datetime.datetime.now().isoformat(timespec="milliseconds")
+        _install_sleep_hook()
+        atexit.register(self.save)
+
+    def save(self):
+        if not self.path:
+            return None
+        meta = [{"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": "dab-compliance"}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in list(self._threads.items())]
+        data = {
+            "traceEvents": meta + list(self.events),
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": self._started_at, "dropped_events": self.dropped},
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            LOGGER.error(f"Could not write the trace to '{self.path}'. Reason: {e}")
+            return None
+        LOGGER.result(f"Trace with {len(self.events)} events written to {os.path.abspath(self.path)}"
+                      + (f" ({self.dropped} dropped)" if self.dropped else "") + ".")
+        return os.path.abspath(self.path)
+
+
+# Shared singleton
+TRACER = Tracer()
+
+
+def _traced_sleep(seconds):
+    caller = sys._getframe(1).f_code.co_filename
+    if not TRACER.enabled or not caller.startswith(_ROOT):
+        return _real_sleep(seconds)
+    line = sys._getframe(1).f_lineno
+    with TRACER.span("sleep", "sleep", seconds=seconds, at=f"{os.path.relpath(caller, _ROOT)}:{line}"):
+        _real_sleep(seconds)
+
+
+def _install_sleep_hook():
+    # Modules that did `from time import sleep` hold their own reference: rebind those too
+    time.sleep = _traced_sleep
+    for module in list(sys.modules.values()):
+        if getattr(module, "sleep", None) is _real_sleep:
+            try:
+                module.sleep = _traced_sleep
+            except (AttributeError, TypeError):
+                pass
+
+
+class TraceInterceptor(Interceptor):
+    """One `request` span per execute_cmd; cached=True when the pipeline answered without an MQTT request."""
+
+    name = "trace"
+    priority = 5  # outermost: the span covers every other interceptor
+
+    def handle(self, ctx, call_next):
+        if not TRACER.enabled:
+            return call_next(ctx)
+        sent_before = TRACER.last_id
+        with TRACER.span(ctx.topic, "request", device=ctx.device_id, body=ctx.body,
+                         fresh=bool(ctx.options.get("fresh"))) as span:
+            code = call_next(ctx)
+            span.set(code=code, cached=TRACER.last_id == sent_before)
+        return code
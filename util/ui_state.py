@@ -0,0 +1,128 @@
+"""
+Foreground / UI state tracking for the post-test Home reset.
+UiStateTracker is a request pipeline interceptor that watches outgoing requests and marks a device "dirty"
+when a request can move the UI away from Home (launches, key presses, content/open, voice commands, restarts...).
+Queries leave the UI where it is, and so do settings writes that only touch NEUTRAL_SETTINGS (audio routing and
+volume); any other settings/set (screensaver, high contrast, language...) may change what is on screen.
+A KEY_HOME press marks the device clean again.
+DabTester.return_to_home_after_test() consults the tracker: a clean device needs no reset, and after KEY_HOME
+the apps launched since the last reset are polled with applications/get-state until none reports FOREGROUND.
+Devices start dirty (unknown state), so the first test of a run always resets. The tracker cannot see what an
+operator or the device does on its own, so functional tests and tests that asked a manual question always reset.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from util.request_pipeline import Interceptor
+
+# Requests that never navigate the UI
+UI_NEUTRAL = frozenset({
+    "operations/list",
+    "applications/list",
+    "applications/get-state",
+    "input/key/list",
+    "device/info",
+    "version",
+    "health-check/get",
+    "output/image",
+    "system/settings/list",
+    "system/settings/get",
+    "system/power-mode/get",
+    "voice/list",
+    "voice/set",
+    "content/search",
+    "content/recommendations",
+    "device-telemetry/start",
+    "device-telemetry/stop",
+    "app-telemetry/start",
+    "app-telemetry/stop",
+    "system/logs/start-collection",
+    "system/logs/stop-collection",
+})
+
+# settings/set keys that cannot change the screen; any other key marks the device dirty
+NEUTRAL_SETTINGS = frozenset({"audioVolume", "mute", "audioOutputMode", "audioOutputSource", "cec"})
+
+LAUNCH_TOPICS = frozenset({"applications/launch", "applications/launch-with-content", "content/open"})
+RESET_TOPICS = frozenset({"system/restart", "system/power-mode/set", "system/setup/skip"})
+
+
+def _parse(body):
+    if isinstance(body, dict):
+        return body
+    try:
+        parsed = json.loads(body or "{}")
+        return parsed if isinstance(parsed, dict) else {}
+    except Exception:
+        return {}
+
+
+class DeviceUiState:
+    __slots__ = ("dirty", "launched_apps")
+
+    def __init__(self):
+        self.dirty = True
+        self.launched_apps = set()
+
+
+class UiStateTracker(Interceptor):
+    name = "ui-state"
+    priority = 40
+
+    def __init__(self, enabled=True):
+        super().__init__(enabled)
+        self._devices = {}
+        self._lock = threading.Lock()
+
+    def state(self, device_id) -> DeviceUiState:
+        st = self._devices.get(device_id)
+        if st is None:
+            with self._lock:
+                st = self._devices.setdefault(device_id, DeviceUiState())
+        return st
+
+    def is_dirty(self, device_id) -> bool:
+        return self.state(device_id).dirty
+
+    def launched_apps(self, device_id):
+        return sorted(self.state(device_id).launched_apps)
+
+    def mark_dirty(self, device_id):
+        self.state(device_id).dirty = True
+
+    def mark_home(self, device_id):
+        st = self.state(device_id)
+        st.dirty = False
+        st.launched_apps.clear()
+
+    def handle(self, ctx, call_next):
+        topic = ctx.topic
+        if topic in UI_NEUTRAL:
+            return call_next(ctx)
+
+        st = self.state(ctx.device_id)
+        if topic == "system/settings/set":
+            body = _parse(ctx.body)
+            if body and NEUTRAL_SETTINGS.issuperset(body):
+                return call_next(ctx)
+        elif topic in ("input/key-press", "input/long-key-press"):
+            if topic == "input/key-press" and _parse(ctx.body).get("keyCode") == "KEY_HOME":
+                code = call_next(ctx)
+                if code == 0:
+                    # Home reached; apps launched before are no longer in front
+                    st.dirty = False
+                    st.launched_apps.clear()
+                return code
+        elif topic in LAUNCH_TOPICS:
+            app_id = _parse(ctx.body).get("appId")
+            if isinstance(app_id, str) and app_id:
+                st.launched_apps.add(app_id)
+        elif topic in RESET_TOPICS:
+            st.launched_apps.clear()
+
+        # Anything not known to be neutral may have changed the screen
+        st.dirty = True
+        return call_next(ctx)
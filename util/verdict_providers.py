@@ -0,0 +1,324 @@
+"""
+Verdict providers for the manual checks (YesNoQuestion, yes_or_no, select_input).
+A check builds a VerdictRequest and the active chain asks its providers in order until one answers:
+  interactive            ask at the console (the call site's own readchar prompt); always answers
+  answers:<file.json>    pre-answered questions, see AnswerFileProvider
+  screenshot             capture output/image (or use the image the check already has) and run the screen
+                         checks registered for the question; util/visual_verdict.py provides the built-in ones
+  deferred[:y|n]         capture evidence, queue the question for --review and continue with a provisional
+                         answer (default y); see util/review_queue.py
+The chain comes from --verdict (or "verdict" in the runtime config), e.g. --verdict answers:nightly.json,deferred.
+Without an interactive provider the run never blocks: a question nobody answers is recorded as 'N' (choice 0).
+Readiness prompts that are repeated until the operator answers Y (functional_helpers.wait_for_yes) only repeat
+console answers; an N from any other provider raises VerdictUnavailableError and the test ends SKIPPED.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import re
+import threading
+from typing import Callable, List, Sequence
+
+from logger import LOGGER
+from util.review_queue import REVIEW_QUEUE_PATH, ReviewQueue, capture_screenshot
+from util.tracing import TRACER
+
+DEFAULT_SPEC = "interactive"
+
+YES_NO = "yes_no"
+CHOICE = "choice"
+
+_YES = {"y", "yes", "true", "1", "pass"}
+_NO = {"n", "no", "false", "0", "fail"}
+
+
+class VerdictUnavailableError(RuntimeError):
+    """A check needs an operator to act (and then answer Y), but the verdict chain answered N without one."""
+
+    def __init__(self, question):
+        super().__init__(f"'{question}' was answered N without an operator at the console; "
+                         f"this check needs someone to act on it (add 'interactive' to --verdict).")
+        self.question = question
+
+
+class VerdictRequest:
+    __slots__ = ("kind", "question", "options", "test_id", "device_id", "result", "emit", "console", "image")
+
+    def __init__(self, kind, question, options=(), result=None, emit=None, console=None, image=None):
+        self.kind = kind
+        self.question = question or ""
+        self.options = list(options or ())
+        self.result = result
+        self.test_id = getattr(result, "test_id", "") or ""
+        self.device_id = getattr(result, "device_id", "") or ""
+        self.emit = emit or LOGGER.result
+        self.console = console
+        self.image = image  # PNG bytes the check is about, if the call site already has them
+
+    def normalize(self, answer):
+        """bool for yes/no, option number (0 = none fits) for choices; None if the answer does not fit."""
+        if answer is None:
+            return None
+        if self.kind == YES_NO:
+            if isinstance(answer, bool):
+                return answer
+            text = str(answer).strip().lower()
+            return True if text in _YES else False if text in _NO else None
+        if isinstance(answer, bool):
+            return None
+        if isinstance(answer, int):
+            return answer if 0 <= answer <= len(self.options) else None
+        text = str(answer).strip()
+        if text.isdigit():
+            return self.normalize(int(text))
+        for number, option in enumerate(self.options, start=1):
+            if text.lower() == str(option).lower():
+                return number
+        return None
+
+    def describe(self, answer) -> str:
+        if self.kind == YES_NO:
+            return "Y" if answer else "N"
+        return f"{answer}" + (f" ({self.options[answer - 1]})" if answer else " (no option fits)")
+
+
+class VerdictProvider:
+    name = "provider"
+
+    def answer(self, request: VerdictRequest):
+        """Raw answer (bool/str/int) or None to let the next provider decide."""
+        return None
+
+
+class InteractiveProvider(VerdictProvider):
+    name = "interactive"
+
+    def answer(self, request):
+        return request.console() if request.console else None
+
+
+class AnswerFileProvider(VerdictProvider):
+    """
+    JSON answers keyed by test id, with "*" as the fallback for any test:
+      {"ApplicationsLaunchConformance": "y",                          every question of that test
+       "ScreensaverTimeoutPersistence": {"Did the screensaver activate on the device?": "y"},
+       "BrightnessRapidChange": ["y", "n", 2],                        answers in the order asked
+       "*": {"App exited?": "y", "select": 1}}                        "select" answers select_input
+    Question keys match case-insensitively; choices accept the option number or its text.
+    """
+    name = "answers"
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Answer file '{path}' must contain a JSON object.")
+        self.data = data
+        self._asked = {}
+        self._lock = threading.Lock()
+
+    def __lookup(self, entry, request):
+        if isinstance(entry, list):
+            with self._lock:
+                n = self._asked.get(request.test_id, 0)
+                self._asked[request.test_id] = n + 1
+            return entry[n] if n < len(entry) else None
+        if isinstance(entry, dict):
+            wanted = request.question.strip().lower()
+            for key, value in entry.items():
+                if str(key).strip().lower() == wanted:
+                    return value
+            if request.kind == CHOICE and "select" in entry:
+                return entry["select"]
+            return entry.get("*")
+        return entry
+
+    def answer(self, request):
+        for key in (request.test_id, "*"):
+            if key in self.data:
+                found = self.__lookup(self.data[key], request)
+                if found is not None:
+                    return found
+        return None
+
+
+# Screen checks: (compiled question pattern, check(png_bytes, request) -> answer or None)
+SCREEN_CHECKS: List[tuple] = []
+
+
+def register_screen_check(pattern, check: Callable):
+    """Answer questions matching `pattern` (regex, case-insensitive) from a fresh output/image screenshot."""
+    SCREEN_CHECKS.append((re.compile(pattern, re.IGNORECASE), check))
+
+
+class ScreenshotProvider(VerdictProvider):
+    name = "screenshot"
+
+    def __init__(self, tester=None, evidence_dir="./test_result/verdicts"):
+        self.tester = tester
+        self.evidence_dir = evidence_dir
+
+    def answer(self, request):
+        checks = [check for pattern, check in SCREEN_CHECKS if pattern.search(request.question)]
+        if not checks:
+            return None
+        png = request.image or capture_screenshot(self.tester, request.device_id)
+        if png is None:
+            return None
+        for check in checks:
+            try:
+                found = check(png, request)
+            except Exception as e:
+                LOGGER.warn(f"[VERDICT] Screen check {getattr(check, '__name__', check)} failed: {e}")
+                continue
+            if found is not None:
+                self.__save(png, request)
+                return found
+        return None
+
+    def __save(self, png, request):
+        try:
+            os.makedirs(self.evidence_dir, exist_ok=True)
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            path = os.path.join(self.evidence_dir, f"{request.test_id or 'test'}-{stamp}.png")
+            with open(path, "wb") as f:
+                f.write(png)
+            request.emit(f"[VERDICT] Screenshot evidence: {os.path.abspath(path)}")
+        except OSError as e:
+            LOGGER.warn(f"[VERDICT] Could not save screenshot evidence: {e}")
+
+
+class DeferredProvider(VerdictProvider):
+    """
+    Captures evidence, queues the question for --review (util/review_queue.py) and answers provisionally so
+    the run continues. The result is tagged with review_pending until a reviewer answers.
+    """
+    name = "deferred"
+
+    def __init__(self, provisional=True, queue_path=REVIEW_QUEUE_PATH, tester=None):
+        self.provisional = provisional
+        self.queue = ReviewQueue(queue_path)
+        self.tester = tester
+
+    def answer(self, request):
+        provisional = self.provisional if request.kind == YES_NO else (1 if self.provisional else 0)
+        try:
+            entry = self.queue.add(request, provisional, self.tester)
+        except OSError as e:
+            LOGGER.warn(f"[VERDICT] Could not queue '{request.question}' for review: {e}")
+            return None
+        if request.result is not None:
+            try:
+                pending = list(getattr(request.result, "review_pending", []) or [])
+                request.result.review_pending = pending + [entry["id"]]
+            except Exception:
+                pass
+        evidence = ", ".join(f"{k}={v}" for k, v in entry["evidence"].items() if not k.endswith("_at"))
+        request.emit(f"[VERDICT] Queued for review (id {entry['id']}){'; evidence: ' + evidence if evidence else ''}; "
+                     f"continuing with provisional answer.")
+        return provisional
+
+
+class VerdictChain:
+    def __init__(self, providers: Sequence[VerdictProvider]):
+        self.providers = list(providers)
+        self.last_answer_interactive = False  # whether the latest answer came from the console
+
+    @property
+    def interactive(self) -> bool:
+        return any(isinstance(p, InteractiveProvider) for p in self.providers)
+
+    def describe(self) -> str:
+        return ",".join(p.name for p in self.providers)
+
+    def resolve(self, request: VerdictRequest):
+        for provider in self.providers:
+            answer = request.normalize(provider.answer(request))
+            if answer is None:
+                continue
+            self.last_answer_interactive = isinstance(provider, InteractiveProvider)
+            if not isinstance(provider, InteractiveProvider):
+                request.emit(f"[VERDICT] {request.question or request.kind} → {request.describe(answer)} ({provider.name})")
+            return answer
+        fallback = False if request.kind == YES_NO else 0
+        self.last_answer_interactive = False
+        LOGGER.warn(f"[VERDICT] No provider answered '{request.question}' for {request.test_id or 'this test'}; "
+                    f"recording {request.describe(fallback)}.")
+        request.emit(f"[VERDICT] {request.question or request.kind} → {request.describe(fallback)} (unanswered)")
+        return fallback
+
+
+def parse_spec(spec, tester=None) -> VerdictChain:
+    """Build a chain from 'interactive', 'answers:<file>', 'screenshot', 'deferred[:y|n]' items."""
+    providers = []
+    for item in (s.strip() for s in str(spec or DEFAULT_SPEC).split(",")):
+        if not item:
+            continue
+        name, _, arg = item.partition(":")
+        name = name.lower()
+        if name == "interactive":
+            providers.append(InteractiveProvider())
+        elif name == "answers":
+            if not arg:
+                raise ValueError("answers needs a file: answers:<file.json>")
+            providers.append(AnswerFileProvider(arg))
+        elif name == "screenshot":
+            from util.visual_verdict import install as install_visual_checks
+            install_visual_checks()
+            providers.append(ScreenshotProvider(tester))
+        elif name == "deferred":
+            if arg and arg.lower() not in _YES | _NO:
+                raise ValueError(f"Invalid provisional answer '{arg}' for deferred (use y or n).")
+            providers.append(DeferredProvider(provisional=not arg or arg.lower() in _YES))
+        else:
+            raise ValueError(f"Unknown verdict provider '{name}'. Use interactive, answers:<file>, screenshot or deferred.")
+    return VerdictChain(providers or [InteractiveProvider()])
+
+
+_active = VerdictChain([InteractiveProvider()])
+
+
+def configure(spec, tester=None) -> VerdictChain:
+    global _active
+    _active = parse_spec(spec, tester)
+    return _active
+
+
+def bind_tester(tester):
+    """Give providers the DabTester they capture evidence through (the chain is configured before it connects)."""
+    for provider in _active.providers:
+        if isinstance(provider, (ScreenshotProvider, DeferredProvider)):
+            provider.tester = tester
+
+
+def active() -> VerdictChain:
+    return _active
+
+
+_asked = 0  # questions asked so far (the runner resets the UI after tests that asked one)
+
+
+def questions_asked() -> int:
+    return _asked
+
+
+def ask_yes_no(question, result=None, emit=None, console=None, image=None) -> bool:
+    global _asked
+    _asked += 1
+    with TRACER.span("yes/no", "prompt", question=question) as span:
+        answer = _active.resolve(VerdictRequest(YES_NO, question, result=result, emit=emit, console=console, image=image))
+        span.set(answer=answer)
+    return answer
+
+
+def ask_choice(question, options, result=None, emit=None, console=None) -> int:
+    global _asked
+    _asked += 1
+    with TRACER.span("choice", "prompt", question=question) as span:
+        answer = _active.resolve(VerdictRequest(CHOICE, question, options, result=result, emit=emit, console=console))
+        span.set(answer=answer)
+    return answer
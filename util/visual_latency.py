@@ -0,0 +1,135 @@
+"""
+Visual transition latency: how long the screen takes to react to an operation, not just the MQTT response time.
+measure_transition() captures a baseline output/image, runs the trigger (e.g. applications/launch, content/open,
+system/settings/set) and then captures frames back to back. Each frame is reduced to a grayscale thumbnail once
+(util/visual_verdict.py) and compared with the baseline and with the previous frame only, so the work per frame
+stays constant however long the burst runs:
+  time_to_first_change_ms  first frame whose mean difference from the baseline exceeds CHANGE_THRESHOLD
+  time_to_stable_ms        first frame of STABLE_FRAMES consecutive frames that differ from their predecessor
+                           by less than STABLE_THRESHOLD, after the first change
+Times are measured from sending the trigger to the midpoint of the capture request that saw the frame, so their
+resolution is one output/image round trip (reported as capture_interval_ms).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional
+
+from logger import LOGGER
+
+CHANGE_THRESHOLD = 3.0  # mean absolute difference on 0..255 gray levels
+STABLE_THRESHOLD = 1.0
+STABLE_FRAMES = 3
+DEFAULT_TIMEOUT_S = 10.0
+
+
+class TransitionTiming:
+    def __init__(self, label=""):
+        self.label = label
+        self.response_ms: Optional[float] = None
+        self.time_to_first_change_ms: Optional[float] = None
+        self.time_to_stable_ms: Optional[float] = None
+        self.frames = 0
+        self.capture_interval_ms: Optional[float] = None
+        self.timeline: List[tuple] = []  # (ms since trigger, diff vs baseline, diff vs previous frame)
+        self.error = ""
+
+    @property
+    def changed(self) -> bool:
+        return self.time_to_first_change_ms is not None
+
+    def summary(self) -> str:
+        if self.error:
+            return f"{self.label}: {self.error}"
+        fmt = lambda v: "-" if v is None else f"{v:.0f} ms"
+        return (f"{self.label}: response {fmt(self.response_ms)}, first change {fmt(self.time_to_first_change_ms)}, "
+                f"stable {fmt(self.time_to_stable_ms)} ({self.frames} frames, ~{fmt(self.capture_interval_ms)} apart)")
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "response_ms": self.response_ms,
+            "time_to_first_change_ms": self.time_to_first_change_ms,
+            "time_to_stable_ms": self.time_to_stable_ms,
+            "frames": self.frames,
+            "capture_interval_ms": self.capture_interval_ms,
+            "error": self.error,
+        }
+
+
+_frame_buffer = bytearray()  # frames are reduced to thumbnails right away, so one decode buffer serves them all
+
+
+def _frame(tester, device_id):
+    """(thumbnail, capture midpoint perf_counter) or (None, None)."""
+    from util.review_queue import capture_screenshot
+    from util.visual_verdict import Screen
+    sent = time.perf_counter()
+    png = capture_screenshot(tester, device_id, _frame_buffer)
+    seen = (sent + time.perf_counter()) / 2
+    if not png:
+        return None, None
+    return Screen.from_png(png).thumb, seen
+
+
+def measure_transition(tester, device_id, trigger: Callable[[], object], label="", timeout_s=DEFAULT_TIMEOUT_S,
+                       change_threshold=CHANGE_THRESHOLD, stable_threshold=STABLE_THRESHOLD,
+                       stable_frames=STABLE_FRAMES) -> TransitionTiming:
+    """
+    Run `trigger` (which sends the operation) inside a screenshot burst. Returns a TransitionTiming; `error` is
+    set when no frames could be captured (no output/image, numpy missing) and the caller should fall back.
+    """
+    timing = TransitionTiming(label)
+    try:
+        baseline, _ = _frame(tester, device_id)
+    except ImportError:
+        timing.error = "numpy is not installed"
+        return timing
+    except Exception as e:
+        timing.error = f"baseline capture failed: {e}"
+        return timing
+    if baseline is None:
+        timing.error = "output/image returned no screenshot"
+        return timing
+
+    start = time.perf_counter()
+    trigger()
+    timing.response_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    previous, still, still_since, last_seen = baseline, 0, None, None
+    intervals = []
+    while time.perf_counter() - start < timeout_s:
+        try:
+            thumb, seen = _frame(tester, device_id)
+        except Exception as e:
+            LOGGER.warn(f"[LATENCY] Frame capture failed: {e}")
+            break
+        if thumb is None:
+            break
+        at = round((seen - start) * 1000, 1)
+        if last_seen is not None:
+            intervals.append((seen - last_seen) * 1000)
+        last_seen = seen
+        from_base = float(abs(thumb - baseline).mean())
+        from_prev = float(abs(thumb - previous).mean())
+        previous = thumb
+        timing.frames += 1
+        timing.timeline.append((at, round(from_base, 2), round(from_prev, 2)))
+
+        if timing.time_to_first_change_ms is None:
+            if from_base > change_threshold:
+                timing.time_to_first_change_ms = at
+            continue
+        if from_prev < stable_threshold:
+            still += 1
+            still_since = still_since if still_since is not None else timing.timeline[-2][0]
+            if still >= stable_frames:
+                timing.time_to_stable_ms = still_since
+                break
+        else:
+            still, still_since = 0, None
+
+    if intervals:
+        timing.capture_interval_ms = round(sum(intervals) / len(intervals), 1)
+    return timing
@@ -0,0 +1,427 @@
+"""
+Automated visual verdicts for the screenshot verdict provider (--verdict screenshot,...).
+A screenshot taken at the verification point is reduced once to a grayscale thumbnail and compared with reference
+images from config/visual_refs/<device_id>/<name>.png (falling back to config/visual_refs/<name>.png) using a
+difference hash, an average hash and SSIM. A verdict is given only when the scores are clearly on one side;
+anything in between returns None so the next provider (usually a human) decides.
+
+Rules map questions to comparisons; config/visual_refs/rules.json entries come before the built-in ones:
+  {"question": "^App started", "not": "home"}                   screen differs from the home reference
+  {"question": "^App exited", "match": "home"}                  screen matches the home reference
+  {"question": "logo", "match": "{appId}_logo", "region": [0.0, 0.0, 0.3, 0.2]}
+                                                                crop (fractions of width/height) vs. reference
+  {"question": "shows the screenshot", "nonblank": true}        image is not a uniform/black frame
+'{appId}' and other keys are filled from the test's JSON request body. Capture references with --capture-ref.
+
+NumPy is imported lazily. PNGs are decoded with Pillow when it is installed, otherwise with the small decoder
+below (8/16-bit gray/RGB/RGBA/palette, non-interlaced); its Average/Paeth path is vectorized along anti-diagonals.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from logger import LOGGER
+
+REFS_DIR = os.path.join("config", "visual_refs")
+RULES_FILE = "rules.json"
+
+THUMB_SIZE = (160, 90)
+
+# Confidence thresholds
+SAME_SSIM, SAME_DHASH = 0.85, 12
+DIFF_SSIM, DIFF_DHASH = 0.50, 24
+BLANK_STDDEV = 4.0
+
+DEFAULT_RULES = [
+    {"question": r"^App started\b", "not": "home"},
+    {"question": r"^App exited\b", "match": "home"},
+    {"question": r"screensaver activate", "match": "screensaver"},
+    {"question": r"legible with high contrast", "match": "high_contrast"},
+    {"question": r"shows the screenshot", "nonblank": True},
+]
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _np():
+    import numpy
+    return numpy
+
+
+# -----------------------------
+# PNG decoding
+# -----------------------------
+def _unfilter_rows(np, filt, ftypes, bpp):
+    """Rows using only None/Sub/Up: each row is one vector operation."""
+    h, stride = filt.shape
+    out = np.empty_like(filt)
+    prev = np.zeros(stride, dtype=np.uint8)
+    for y in range(h):
+        line, f = filt[y], ftypes[y]
+        if f == 0:
+            cur = line
+        elif f == 1:
+            cur = np.cumsum(line.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+        else:
+            cur = line + prev
+        out[y] = cur
+        prev = out[y]
+    return out
+
+
+def _unfilter_wavefront(np, filt, ftypes, bpp):
+    """
+    Any filter mix. Byte group (r, x) depends on (r, x-1), (r-1, x) and (r-1, x-1), so every anti-diagonal
+    r + x = t only needs the two before it: H + W - 1 vector steps instead of H * W scalar ones.
+    """
+    h, stride = filt.shape
+    w = stride // bpp
+    f3 = filt.reshape(h, w, bpp).astype(np.int16)
+    rec = np.zeros((h + 1, w + 1, bpp), dtype=np.int16)  # 1-based with a zero border
+    ft_all = ftypes.astype(np.intp)
+    for t in range(h + w - 1):
+        rows = np.arange(max(0, t - w + 1), min(h - 1, t) + 1)
+        xs = t - rows
+        left, up, ul = rec[rows + 1, xs], rec[rows, xs + 1], rec[rows, xs]
+        ft = ft_all[rows][:, None]
+        p = left + up - ul
+        pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - ul)
+        paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, ul))
+        pred = np.choose(ft, (np.zeros_like(left), left, up, (left + up) >> 1, paeth))
+        rec[rows + 1, xs + 1] = (f3[rows, xs] + pred) & 0xFF
+    return rec[1:, 1:].reshape(h, stride).astype(np.uint8)
+
+
+def decode_png(data: bytes):
+    """PNG bytes → uint8 array (H, W, C) with C in 1..4."""
+    np = _np()
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as img:
+            return np.asarray(img.convert("RGBA" if "A" in img.getbands() else "RGB"))
+    except ImportError:
+        pass
+
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError("not a PNG (bad signature)")
+    pos, idat, palette, header = 8, [], None, None
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], "big")
+        kind, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body[:13])
+        elif kind == b"PLTE":
+            palette = np.frombuffer(body, dtype=np.uint8).reshape(-1, 3)
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    if header is None or not idat:
+        raise ValueError("PNG without IHDR/IDAT")
+    width, height, depth, color, _comp, _filter, interlace = header
+    if interlace:
+        raise ValueError("interlaced PNG is not supported")
+    if color not in _CHANNELS or depth not in (1, 2, 4, 8, 16) or (depth < 8 and color not in (0, 3)):
+        raise ValueError(f"unsupported PNG format (color type {color}, bit depth {depth})")
+
+    channels = _CHANNELS[color]
+    bits = width * channels * depth
+    stride = (bits + 7) // 8
+    bpp = max(1, channels * depth // 8)
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8)
+    if raw.size < height * (stride + 1):
+        raise ValueError("truncated PNG image data")
+    raw = raw[:height * (stride + 1)].reshape(height, stride + 1)
+    ftypes, filt = raw[:, 0], raw[:, 1:]
+    if ftypes.max(initial=0) > 4:
+        raise ValueError("invalid PNG filter type")
+    if (ftypes >= 3).any():
+        rows = _unfilter_wavefront(np, filt, ftypes, bpp)
+    else:
+        rows = _unfilter_rows(np, filt, ftypes, bpp)
+
+    if depth == 16:
+        px = rows.reshape(height, width, channels, 2)[..., 0]
+    elif depth == 8:
+        px = rows.reshape(height, width, channels)
+    else:
+        px = np.unpackbits(rows, axis=1)[:, :width * depth].reshape(height, width, depth)
+        px = (px * (1 << np.arange(depth - 1, -1, -1, dtype=np.uint8))).sum(axis=2).astype(np.uint8)
+        if color == 0:
+            px = px * (255 // ((1 << depth) - 1))
+        px = px[..., None]
+    if color == 3:
+        if palette is None:
+            raise ValueError("palette PNG without PLTE")
+        px = palette[np.minimum(px[..., 0], len(palette) - 1)]
+    return px
+
+
+# -----------------------------
+# Image measures
+# -----------------------------
+def to_gray(img):
+    np = _np()
+    if img.ndim == 2:
+        return img.astype(np.float32)
+    if img.shape[2] >= 3:
+        rgb = img[..., :3].astype(np.float32)
+        return rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+    return img[..., 0].astype(np.float32)
+
+
+def crop(gray, region):
+    """region = (x0, y0, x1, y1) as fractions of width/height."""
+    h, w = gray.shape
+    x0, y0, x1, y1 = region
+    return gray[int(y0 * h):max(int(y1 * h), int(y0 * h) + 1), int(x0 * w):max(int(x1 * w), int(x0 * w) + 1)]
+
+
+def resize_area(gray, size):
+    """Area-average downscale to (width, height); upscales fall back to nearest rows/columns."""
+    np = _np()
+    w, h = size
+    src_h, src_w = gray.shape
+    if src_h >= h and src_w >= w:
+        ys = np.linspace(0, src_h, h + 1).astype(int)[:-1]
+        xs = np.linspace(0, src_w, w + 1).astype(int)[:-1]
+        sums = np.add.reduceat(np.add.reduceat(gray, ys, axis=0), xs, axis=1)
+        counts = np.outer(np.diff(np.append(ys, src_h)), np.diff(np.append(xs, src_w)))
+        return sums / counts
+    yi = (np.arange(h) * src_h // h).clip(0, src_h - 1)
+    xi = (np.arange(w) * src_w // w).clip(0, src_w - 1)
+    return gray[yi][:, xi]
+
+
+def _bits(mask) -> int:
+    value = 0
+    for bit in mask.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def ahash(gray) -> int:
+    small = resize_area(gray, (8, 8))
+    return _bits(small > small.mean())
+
+
+def dhash(gray) -> int:
+    small = resize_area(gray, (9, 8))
+    return _bits(small[:, 1:] > small[:, :-1])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _box_mean(np, a, k):
+    ii = np.pad(a, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    return (ii[k:, k:] - ii[:-k, k:] - ii[k:, :-k] + ii[:-k, :-k]) / (k * k)
+
+
+def ssim(a, b, window=7) -> float:
+    """Mean SSIM of two equally sized grayscale images (uniform window, standard constants)."""
+    np = _np()
+    if a.shape != b.shape:
+        raise ValueError("ssim needs images of the same size")
+    k = min(window, a.shape[0], a.shape[1])
+    a, b = a.astype(np.float64), b.astype(np.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_a, mu_b = _box_mean(np, a, k), _box_mean(np, b, k)
+    var_a = _box_mean(np, a * a, k) - mu_a * mu_a
+    var_b = _box_mean(np, b * b, k) - mu_b * mu_b
+    cov = _box_mean(np, a * b, k) - mu_a * mu_b
+    s = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(s.mean())
+
+
+class Screen:
+    """A decoded screenshot reduced to what the comparisons need (computed once, lazily)."""
+
+    def __init__(self, gray):
+        self.gray = gray
+        self._thumb = None
+        self._hashes = None
+
+    @classmethod
+    def from_png(cls, data: bytes) -> "Screen":
+        return cls(to_gray(decode_png(data)))
+
+    def region(self, region) -> "Screen":
+        return Screen(crop(self.gray, region)) if region else self
+
+    @property
+    def thumb(self):
+        if self._thumb is None:
+            self._thumb = resize_area(self.gray, THUMB_SIZE)
+        return self._thumb
+
+    @property
+    def hashes(self) -> Tuple[int, int]:
+        if self._hashes is None:
+            self._hashes = (dhash(self.gray), ahash(self.gray))
+        return self._hashes
+
+    def compare(self, other: "Screen") -> Dict[str, float]:
+        return {
+            "ssim": round(ssim(self.thumb, other.thumb), 3),
+            "dhash": hamming(self.hashes[0], other.hashes[0]),
+            "ahash": hamming(self.hashes[1], other.hashes[1]),
+        }
+
+    def is_blank(self) -> bool:
+        return float(self.thumb.std()) < BLANK_STDDEV
+
+
+def same_screen(scores) -> Optional[bool]:
+    """True/False when confident, None when the scores are in between."""
+    if scores["ssim"] >= SAME_SSIM and scores["dhash"] <= SAME_DHASH:
+        return True
+    if scores["ssim"] <= DIFF_SSIM or scores["dhash"] >= DIFF_DHASH:
+        return False
+    return None
+
+
+# -----------------------------
+# References and rules
+# -----------------------------
+class ReferenceStore:
+    def __init__(self, root=REFS_DIR):
+        self.root = root
+        self._cache: Dict[str, Tuple[int, Screen]] = {}
+
+    def path_for(self, name, device_id=None, create=False) -> Optional[str]:
+        candidates = [os.path.join(self.root, device_id, f"{name}.png")] if device_id else []
+        candidates.append(os.path.join(self.root, f"{name}.png"))
+        if create:
+            return candidates[0]
+        return next((p for p in candidates if os.path.exists(p)), None)
+
+    def get(self, name, device_id=None) -> Optional[Screen]:
+        path = self.path_for(name, device_id)
+        if path is None:
+            return None
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                cached = self._cache[path] = (mtime, Screen.from_png(f.read()))
+        return cached[1]
+
+    def save(self, name, device_id, png: bytes) -> str:
+        path = self.path_for(name, device_id, create=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(png)
+        return os.path.abspath(path)
+
+
+def load_rules(root=REFS_DIR) -> List[dict]:
+    path = os.path.join(root, RULES_FILE)
+    rules = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rules = [r for r in json.load(f) if isinstance(r, dict) and r.get("question")]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        LOGGER.warn(f"[VISUAL] Ignoring unreadable rules file '{path}': {e}")
+    return rules + DEFAULT_RULES
+
+
+def _request_fields(request) -> Dict[str, str]:
+    try:
+        body = json.loads(getattr(request.result, "request", "") or "{}")
+        return {k: str(v) for k, v in body.items()} if isinstance(body, dict) else {}
+    except (TypeError, ValueError):
+        return {}
+
+
+class VisualRule:
+    def __init__(self, spec: dict, refs: ReferenceStore):
+        self.spec = spec
+        self.refs = refs
+        self.region = tuple(spec["region"]) if spec.get("region") else None
+
+    def __call__(self, png: bytes, request):
+        started = time.perf_counter()
+        screen = _decoded(png)
+        if screen is None:
+            return None
+        shot = screen.region(self.region)
+        if self.spec.get("nonblank"):
+            answer, detail = (not shot.is_blank()), f"stddev={float(shot.thumb.std()):.1f}"
+        else:
+            name = self.spec.get("match") or self.spec.get("not")
+            try:
+                name = name.format(**_request_fields(request))
+            except (KeyError, IndexError, ValueError):
+                return None
+            ref = self.refs.get(name, request.device_id)
+            if ref is None:
+                return None
+            if self.region and ref.gray.shape == screen.gray.shape:
+                ref = ref.region(self.region)  # a full screenshot as reference; otherwise it is the crop itself
+            scores = shot.compare(ref)
+            same = same_screen(scores)
+            if same is None:
+                LOGGER.info(f"[VISUAL] '{request.question}' vs '{name}': {scores} → not confident")
+                return None
+            answer = same if self.spec.get("match") else not same
+            detail = f"vs '{name}' ssim={scores['ssim']} dhash={scores['dhash']} ahash={scores['ahash']}"
+        elapsed = (time.perf_counter() - started) * 1000
+        request.emit(f"[VISUAL] {request.question} {detail} → {'Y' if answer else 'N'} ({elapsed:.0f} ms)")
+        return answer
+
+
+# (screenshot bytes, decoded Screen): holding the bytes keeps the identity check valid (ids of freed objects are reused)
+_last_png: Tuple[Optional[bytes], Optional[Screen]] = (None, None)
+_numpy_warned = False
+
+
+def _decoded(png: bytes) -> Optional[Screen]:
+    """Decode once per screenshot even when several rules look at it."""
+    global _last_png, _numpy_warned
+    if _last_png[0] is png and _last_png[1] is not None:
+        return _last_png[1]
+    try:
+        screen = Screen.from_png(png)
+    except ImportError:
+        if not _numpy_warned:
+            LOGGER.warn("[VISUAL] numpy is not installed; visual verdicts are disabled.")
+            _numpy_warned = True
+        return None
+    except Exception as e:
+        LOGGER.warn(f"[VISUAL] Could not decode the screenshot: {e}")
+        return None
+    # only immutable bytes are cached: a reused bytearray buffer can hold a different frame under the same object
+    _last_png = (png, screen) if isinstance(png, bytes) else (None, None)
+    return screen
+
+
+_installed = False
+
+
+def install(root=REFS_DIR):
+    """Register every rule as a screen check of the screenshot verdict provider (once)."""
+    global _installed
+    if _installed:
+        return
+    from util.verdict_providers import register_screen_check
+    refs = ReferenceStore(root)
+    for spec in load_rules(root):
+        try:
+            register_screen_check(spec["question"], VisualRule(spec, refs))
+        except re.error as e:
+            LOGGER.warn(f"[VISUAL] Ignoring rule with invalid question pattern {spec['question']!r}: {e}")
+    _installed = True